@@ -1,12 +1,16 @@
 import hashlib
 import os
 import secrets
+import threading
+from datetime import datetime, timedelta
 from functools import wraps
 
+import pika
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
-from broker.event_broker import EventBroker
+from broker.event_broker import LANE_BULK, LANE_INTERACTIVE, get_publisher_pool, lane_queue
+from broker.transport import require_shared_transport
 from common import crud
 from common.database import get_db, init_db
 
@@ -18,6 +22,8 @@ SESSIONS = {}
 
 # 큐 설정
 SYNC_QUEUE = os.getenv("EVERYTIME_QUEUE", "everytime_sync")
+# 발행한 동기화 요청을 '대기/처리 중'으로 간주하는 최대 시간 (컨슈머 실패 시 이후 재요청 허용)
+SYNC_PENDING_TTL_SEC = int(os.getenv("SYNC_PENDING_TTL_SEC", "600"))
 
 
 def hash_password(raw: str) -> str:
@@ -74,17 +80,68 @@ class LoginInterface:
 class APIGatewayInterface:
     def __init__(self, queue_name: str):
         self.queue_name = queue_name
+        # (학번, 시간표 URL) -> (마지막 동기화 요청 발행 시각, 레인) (인메모리)
+        self.pending_syncs = {}
+        self._pending_lock = threading.Lock()
 
-    def trigger_sync(self, student_id: str, timetable_url: str = None):
-        broker = EventBroker(queue_name=self.queue_name)
-        payload = {
-            "type": "sync_everytime",
-            "studentId": student_id,
-        }
+    def _sync_in_progress(self, student_id: str, published_at: datetime) -> bool:
+        """발행 이후 컨슈머가 아직 시간표를 저장하지 않았다면 대기/처리 중으로 본다"""
+        with get_db() as db:
+            user = crud.get_user_by_id(db, student_id=student_id)
+            last_synced_at = user.last_synced_at if user else None
+        return not (last_synced_at and last_synced_at >= published_at)
+
+    def _evict_expired(self, now: datetime):
+        """TTL이 지난 항목 제거 (컨슈머가 메시지를 잃어도 표가 무한히 쌓이지 않게). _pending_lock 안에서 호출"""
+        expired = [
+            k for k, (t, _) in self.pending_syncs.items() if now - t > timedelta(seconds=SYNC_PENDING_TTL_SEC)
+        ]
+        for key in expired:
+            del self.pending_syncs[key]
+
+    def trigger_sync(self, student_id: str, timetable_url: str = None, background: bool = False) -> str:
+        """
+        동기화 요청 발행. 같은 학생/시간표 URL 요청이 이미 큐에 있거나 처리 중이면 발행하지 않는다.
+        (URL이 바뀐 요청은 새 시간표이므로 병합하지 않음)
+        background=True(대시보드 주기적 재동기화)는 배치 레인, 사용자가 직접 누른 요청은 대화형 레인으로 보낸다.
+        배치 레인에 대기 중인 요청은 사용자 요청을 막지 않는다 (대화형 레인으로 새로 발행).
+        반환: "accepted" | "coalesced"
+        """
+        key = (student_id, timetable_url)
+        # 사용자가 직접 요청한 동기화는 대화형 레인 (배치 재동기화보다 먼저 처리)
+        lane = LANE_BULK if background else LANE_INTERACTIVE
+        now = datetime.now()
+        with self._pending_lock:
+            self._evict_expired(now)
+            previous = self.pending_syncs.get(key)
+            pending = previous
+            if pending is None or (pending[1] == LANE_BULK and lane == LANE_INTERACTIVE):
+                # 동시에 들어온 다른 요청이 중복 발행하지 않도록 먼저 표시
+                self.pending_syncs[key] = (now, lane)
+                pending = None
+
+        if pending is not None:
+            if self._sync_in_progress(student_id, pending[0]):
+                print(f" [Sync] {student_id} 동기화 대기/처리 중 -> 요청 병합")
+                return "coalesced"
+            # 이전 요청은 처리가 끝났으므로 이번 요청으로 교체
+            with self._pending_lock:
+                self.pending_syncs[key] = (now, lane)
+
+        payload = {"type": "sync_everytime", "studentId": student_id, "lane": lane}
         if timetable_url:
             payload["timetableUrl"] = timetable_url
-        broker.publish(payload)
-        broker.close()
+        try:
+            # 요청마다 연결을 새로 맺지 않고 프로세스 전역 발행 풀을 사용
+            get_publisher_pool().publish(lane_queue(self.queue_name, lane), payload)
+        except Exception:
+            with self._pending_lock:
+                if previous is None:
+                    self.pending_syncs.pop(key, None)
+                else:
+                    self.pending_syncs[key] = previous
+            raise
+        return "accepted"
 
     def get_recommendation(self, student_id: str):
         with get_db() as db:
@@ -147,8 +204,12 @@ def sync_everytime():
     student_id = request.student_id
     data = request.get_json(silent=True) or {}
     timetable_url = data.get("timetableUrl")
-    gateway_interface.trigger_sync(student_id, timetable_url)
-    return jsonify({"status": "accepted", "studentId": student_id})
+    background = bool(data.get("background"))
+    try:
+        status = gateway_interface.trigger_sync(student_id, timetable_url, background=background)
+    except pika.exceptions.AMQPError:
+        return jsonify({"error": "broker unavailable"}), 503
+    return jsonify({"status": status, "studentId": student_id})
 
 
 @app.route("/recommendations/<student_id>", methods=["GET"])
@@ -200,6 +261,8 @@ def programs():
 
 
 if __name__ == "__main__":
+    # 컨슈머와 다른 프로세스이므로 인메모리 전송으로는 요청을 넘길 수 없다 (consumer/local_stack.py 사용)
+    require_shared_transport("api-gateway")
     # 테이블이 없으면 생성
     init_db()
     port = int(os.getenv("PORT", "5000"))
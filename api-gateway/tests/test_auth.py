@@ -29,9 +29,10 @@ def test_sync_everytime_with_valid_token(monkeypatch):
 
     called = {}
 
-    def fake_trigger(student_id, timetable_url=None):
+    def fake_trigger(student_id, timetable_url=None, background=False):
         called["student_id"] = student_id
         called["timetable_url"] = timetable_url
+        return "accepted"
 
     monkeypatch.setattr(app_module.gateway_interface, "trigger_sync", fake_trigger)
 
@@ -39,6 +40,152 @@ def test_sync_everytime_with_valid_token(monkeypatch):
     assert resp.status_code == 200
     assert called["student_id"] == "111"
     assert called["timetable_url"] == "url"
+    assert resp.get_json()["status"] == "accepted"
+
+
+def test_sync_everytime_returns_503_when_broker_unavailable(monkeypatch):
+    client = app_module.app.test_client()
+    token = "t6"
+    app_module.SESSIONS[token] = "111"
+
+    def fake_trigger(student_id, timetable_url=None, background=False):
+        raise app_module.pika.exceptions.AMQPConnectionError("down")
+
+    monkeypatch.setattr(app_module.gateway_interface, "trigger_sync", fake_trigger)
+
+    resp = client.post("/sync/everytime", json={}, headers=_auth_header(token))
+    assert resp.status_code == 503
+
+
+class FakePool:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, queue_name, data):
+        self.published.append((queue_name, data))
+
+
+def test_sync_everytime_coalesces_while_previous_sync_pending(monkeypatch):
+    client = app_module.app.test_client()
+    token = "t7"
+    app_module.SESSIONS[token] = "111"
+    app_module.gateway_interface.pending_syncs.clear()
+
+    pool = FakePool()
+    monkeypatch.setattr(app_module, "get_publisher_pool", lambda: pool)
+    # 컨슈머가 아직 저장하지 않은 상태 (last_synced_at 없음)
+    monkeypatch.setattr(
+        app_module.crud,
+        "get_user_by_id",
+        lambda db, student_id: types.SimpleNamespace(student_id=student_id, last_synced_at=None),
+    )
+
+    first = client.post("/sync/everytime", json={}, headers=_auth_header(token))
+    second = client.post("/sync/everytime", json={}, headers=_auth_header(token))
+
+    assert first.get_json()["status"] == "accepted"
+    assert second.get_json()["status"] == "coalesced"
+    assert len(pool.published) == 1
+    assert pool.published[0][0] == "everytime_sync"
+    assert pool.published[0][1]["lane"] == "interactive"
+
+
+def test_sync_everytime_publishes_again_after_previous_sync_finished(monkeypatch):
+    client = app_module.app.test_client()
+    token = "t8"
+    app_module.SESSIONS[token] = "111"
+    app_module.gateway_interface.pending_syncs.clear()
+
+    pool = FakePool()
+    monkeypatch.setattr(app_module, "get_publisher_pool", lambda: pool)
+    # 컨슈머가 발행 이후 시간표 저장을 마친 상태
+    monkeypatch.setattr(
+        app_module.crud,
+        "get_user_by_id",
+        lambda db, student_id: types.SimpleNamespace(
+            student_id=student_id, last_synced_at=app_module.datetime.now() + app_module.timedelta(seconds=1)
+        ),
+    )
+
+    client.post("/sync/everytime", json={}, headers=_auth_header(token))
+    second = client.post("/sync/everytime", json={}, headers=_auth_header(token))
+
+    assert second.get_json()["status"] == "accepted"
+    assert len(pool.published) == 2
+
+
+def test_sync_everytime_with_new_url_is_not_coalesced(monkeypatch):
+    client = app_module.app.test_client()
+    token = "t10"
+    app_module.SESSIONS[token] = "111"
+    app_module.gateway_interface.pending_syncs.clear()
+
+    pool = FakePool()
+    monkeypatch.setattr(app_module, "get_publisher_pool", lambda: pool)
+    monkeypatch.setattr(
+        app_module.crud,
+        "get_user_by_id",
+        lambda db, student_id: types.SimpleNamespace(student_id=student_id, last_synced_at=None),
+    )
+
+    client.post("/sync/everytime", json={"timetableUrl": "old"}, headers=_auth_header(token))
+    second = client.post("/sync/everytime", json={"timetableUrl": "new"}, headers=_auth_header(token))
+
+    assert second.get_json()["status"] == "accepted"
+    assert [data["timetableUrl"] for _, data in pool.published] == ["old", "new"]
+
+
+def test_expired_pending_syncs_are_evicted(monkeypatch):
+    gateway = app_module.gateway_interface
+    gateway.pending_syncs.clear()
+    stale = app_module.datetime.now() - app_module.timedelta(seconds=app_module.SYNC_PENDING_TTL_SEC + 1)
+    gateway.pending_syncs[("222", None)] = (stale, "interactive")
+
+    monkeypatch.setattr(app_module, "get_publisher_pool", lambda: FakePool())
+
+    assert gateway.trigger_sync("111") == "accepted"
+    assert ("222", None) not in gateway.pending_syncs
+
+
+def test_background_sync_goes_to_bulk_lane(monkeypatch):
+    client = app_module.app.test_client()
+    token = "t9"
+    app_module.SESSIONS[token] = "111"
+    app_module.gateway_interface.pending_syncs.clear()
+
+    pool = FakePool()
+    monkeypatch.setattr(app_module, "get_publisher_pool", lambda: pool)
+
+    resp = client.post("/sync/everytime", json={"background": True}, headers=_auth_header(token))
+
+    assert resp.get_json()["status"] == "accepted"
+    assert pool.published[0][0] == "everytime_sync.bulk"
+    assert pool.published[0][1]["lane"] == "bulk"
+
+
+def test_interactive_sync_is_not_coalesced_into_pending_bulk_sync(monkeypatch):
+    client = app_module.app.test_client()
+    token = "t11"
+    app_module.SESSIONS[token] = "111"
+    app_module.gateway_interface.pending_syncs.clear()
+
+    pool = FakePool()
+    monkeypatch.setattr(app_module, "get_publisher_pool", lambda: pool)
+    monkeypatch.setattr(
+        app_module.crud,
+        "get_user_by_id",
+        lambda db, student_id: types.SimpleNamespace(student_id=student_id, last_synced_at=None),
+    )
+
+    background = client.post("/sync/everytime", json={"background": True}, headers=_auth_header(token))
+    manual = client.post("/sync/everytime", json={}, headers=_auth_header(token))
+    # 대화형 요청이 대기 중이면 이후 배치 요청은 병합된다
+    again = client.post("/sync/everytime", json={"background": True}, headers=_auth_header(token))
+
+    assert background.get_json()["status"] == "accepted"
+    assert manual.get_json()["status"] == "accepted"
+    assert again.get_json()["status"] == "coalesced"
+    assert [queue_name for queue_name, _ in pool.published] == ["everytime_sync.bulk", "everytime_sync"]
 
 
 def test_recommendations_forbidden_when_student_mismatch():
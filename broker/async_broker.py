@@ -0,0 +1,177 @@
+import asyncio
+import functools
+import os
+
+from broker import codec
+from broker.event_broker import (
+    CONFIRM_TIMEOUT_SEC,
+    CONFIRM_WINDOW,
+    PUBLISH_ACK,
+    PUBLISH_ERROR,
+    PUBLISH_NACK,
+    PUBLISH_TIMEOUT,
+)
+
+try:
+    import aio_pika
+except ImportError:  # aio-pika가 없는 서비스는 동기 EventBroker만 사용
+    aio_pika = None
+
+# consume 시 동시에 처리할 최대 메시지 수 (prefetch와 동일하게 맞춤)
+CONSUME_CONCURRENCY = int(os.getenv("BROKER_CONSUME_CONCURRENCY", "8"))
+
+
+async def declare_with_dlq(channel, queue_name, dlq_name=None):
+    """
+    동기 버전(_declare_with_dlq)과 같은 옵션으로 DLQ와 주 큐를 선언하고 주 큐를 반환.
+    선언 옵션이 다르면 RabbitMQ가 PRECONDITION_FAILED를 내므로 반드시 일치시킨다.
+    """
+    dlq_name = dlq_name or f"{queue_name}.dlq"
+    await channel.declare_queue(dlq_name, durable=True)
+    return await channel.declare_queue(
+        queue_name,
+        durable=True,
+        arguments={
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": dlq_name,
+        },
+    )
+
+
+class AsyncEventBroker:
+    """
+    asyncio 기반 브로커 (aio-pika).
+    - 발행 채널은 publisher confirm 모드이며, publish_many는 윈도우 단위로 확인을 동시에 기다린다.
+    - consume은 prefetch = 동시 처리 수로 맞추고 세마포어로 진행 중인 핸들러 수를 제한한다.
+    - connect_robust를 사용하므로 연결이 끊겨도 채널/소비자가 자동 복구된다.
+    """
+
+    def __init__(self, host=None):
+        if aio_pika is None:
+            raise RuntimeError("aio-pika가 설치되어 있지 않습니다. (pip install aio-pika)")
+        self.mq_host = host or os.getenv('RABBITMQ_HOST', 'localhost')
+        self.connection = None
+        self._channel = None
+        self._declared = set()
+        self._connect_lock = None
+
+    async def connect(self):
+        # asyncio.Lock은 실행 중인 루프 안에서 생성 (파이썬 3.9 호환)
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.connection is None or self.connection.is_closed:
+                self.connection = await aio_pika.connect_robust(host=self.mq_host)
+                self._channel = await self.connection.channel(publisher_confirms=True)
+                self._declared = set()
+                print(f" [AsyncBroker] RabbitMQ({self.mq_host}) 연결 성공!")
+        return self.connection
+
+    async def _ensure_declared(self, queue_name):
+        if queue_name not in self._declared:
+            await declare_with_dlq(self._channel, queue_name)
+            self._declared.add(queue_name)
+
+    def _message(self, data, content_type=None):
+        body, meta = codec.encode(data, content_type)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return aio_pika.Message(
+            body=body,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            **meta,
+        )
+
+    async def publish(self, queue_name, data, timeout=None, content_type=None):
+        """메시지 한 건 발행. 브로커 확인까지 기다리며 거부/시간초과 시 예외 발생"""
+        await self.connect()
+        await self._ensure_declared(queue_name)
+        await self._channel.default_exchange.publish(
+            self._message(data, content_type),
+            routing_key=queue_name,
+            timeout=CONFIRM_TIMEOUT_SEC if timeout is None else timeout,
+        )
+
+    async def publish_many(self, queue_name, messages, window=None, timeout=None, content_type=None):
+        """
+        window개씩 동시에 발행하고 확인을 모아서 기다린다.
+        반환값은 동기 버전과 같은 메시지별 결과(PUBLISH_*) 리스트.
+        """
+        content_type = content_type or codec.BULK_CONTENT_TYPE
+        await self.connect()
+        await self._ensure_declared(queue_name)
+        window = window or CONFIRM_WINDOW
+        timeout = CONFIRM_TIMEOUT_SEC if timeout is None else timeout
+        exchange = self._channel.default_exchange
+
+        outcomes = []
+        for start in range(0, len(messages), window):
+            results = await asyncio.gather(
+                *[
+                    exchange.publish(self._message(m, content_type), routing_key=queue_name, timeout=timeout)
+                    for m in messages[start:start + window]
+                ],
+                return_exceptions=True,
+            )
+            outcomes += [_publish_outcome(r) for r in results]
+        print(f" [>>>] Batch Published: {queue_name} {outcomes.count(PUBLISH_ACK)}/{len(outcomes)} 확인")
+        return outcomes
+
+    async def consume(self, queue_name, handler, dlq_name=None, concurrency=None):
+        """
+        handler(payload, message)를 최대 concurrency개까지 동시에 실행하며 소비한다.
+        - 정상 반환 시 ack, 예외 발생 시 nack(requeue=False) → DLQ
+        - 코루틴 함수가 아니면 기본 스레드 풀에서 실행 (Selenium 등 블로킹 작업용)
+        취소(CancelledError)될 때까지 반환하지 않는다.
+        """
+        await self.connect()
+        concurrency = concurrency or CONSUME_CONCURRENCY
+        channel = await self.connection.channel()
+        await channel.set_qos(prefetch_count=concurrency)
+        queue = await declare_with_dlq(channel, queue_name, dlq_name)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        in_flight = set()
+        print(f" [AsyncBroker] {queue_name} 소비 시작 (동시 처리 {concurrency})")
+        try:
+            async with queue.iterator() as messages:
+                async for message in messages:
+                    await semaphore.acquire()
+                    task = asyncio.ensure_future(_dispatch(handler, message, semaphore))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+        finally:
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def close(self):
+        if self.connection is not None and not self.connection.is_closed:
+            await self.connection.close()
+
+
+def _publish_outcome(result):
+    if not isinstance(result, BaseException):
+        return PUBLISH_ACK
+    if aio_pika is not None and isinstance(result, aio_pika.exceptions.DeliveryError):
+        return PUBLISH_NACK
+    if isinstance(result, asyncio.TimeoutError):
+        return PUBLISH_TIMEOUT
+    return PUBLISH_ERROR
+
+
+async def _dispatch(handler, message, semaphore):
+    try:
+        # aio-pika 메시지는 content_type/content_encoding 속성을 그대로 가진다
+        payload = codec.decode(message.body, message)
+        if asyncio.iscoroutinefunction(handler):
+            await handler(payload, message)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(handler, payload, message))
+    except Exception as e:
+        print(f" [Error] async handle: {e}")
+        await message.nack(requeue=False)
+    else:
+        await message.ack()
+    finally:
+        semaphore.release()
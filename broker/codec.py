@@ -0,0 +1,82 @@
+"""
+메시지 봉투(envelope) 인코딩/디코딩
+- content_type     : application/json (기본) 또는 application/msgpack
+- content_encoding : 페이로드가 COMPRESS_THRESHOLD 바이트를 넘으면 zlib 압축("deflate")
+- headers          : {"x-envelope-version": ENVELOPE_VERSION}
+수신 측은 메시지 속성의 content_type/content_encoding을 보고 디코딩하며,
+속성이 없는 (이전 버전) 메시지는 JSON으로 처리한다.
+"""
+import json
+import os
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # msgpack이 없으면 JSON으로 발행
+    msgpack = None
+
+ENVELOPE_VERSION = 1
+ENVELOPE_VERSION_HEADER = "x-envelope-version"
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+ENCODING_DEFLATE = "deflate"
+
+# 일반 발행 / 일괄 발행(publish_many) 기본 포맷
+DEFAULT_CONTENT_TYPE = os.getenv("BROKER_CONTENT_TYPE", CONTENT_TYPE_JSON)
+BULK_CONTENT_TYPE = os.getenv("BROKER_BULK_CONTENT_TYPE", CONTENT_TYPE_MSGPACK)
+# 이 크기(바이트)를 넘는 본문은 압축 (0이면 압축 안 함)
+COMPRESS_THRESHOLD = int(os.getenv("BROKER_COMPRESS_THRESHOLD", "8192"))
+
+
+def encode(data, content_type=None, compress_threshold=None):
+    """
+    data(dict) -> (body, meta)
+    meta는 메시지 속성에 그대로 넣을 content_type/content_encoding/headers 딕셔너리.
+    압축하지 않은 JSON 본문은 기존과 같은 문자열로 반환한다.
+    """
+    content_type = content_type or DEFAULT_CONTENT_TYPE
+    if content_type == CONTENT_TYPE_MSGPACK and msgpack is None:
+        content_type = CONTENT_TYPE_JSON
+
+    if content_type == CONTENT_TYPE_MSGPACK:
+        body = msgpack.packb(data, use_bin_type=True)
+    elif content_type == CONTENT_TYPE_JSON:
+        # 한글 깨짐 방지 ensure_ascii=False
+        body = json.dumps(data, ensure_ascii=False)
+    else:
+        raise ValueError(f"지원하지 않는 content_type: {content_type}")
+
+    meta = {
+        "content_type": content_type,
+        "headers": {ENVELOPE_VERSION_HEADER: ENVELOPE_VERSION},
+    }
+
+    threshold = COMPRESS_THRESHOLD if compress_threshold is None else compress_threshold
+    raw = body.encode("utf-8") if isinstance(body, str) else body
+    if threshold and len(raw) > threshold:
+        body = zlib.compress(raw)
+        meta["content_encoding"] = ENCODING_DEFLATE
+    return body, meta
+
+
+def decode(body, properties=None):
+    """
+    메시지 본문 -> dict
+    properties는 pika BasicProperties 또는 aio-pika 메시지처럼 content_type/content_encoding 속성을 가진 객체.
+    """
+    content_type = getattr(properties, "content_type", None) or CONTENT_TYPE_JSON
+    content_encoding = getattr(properties, "content_encoding", None)
+
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if content_encoding == ENCODING_DEFLATE:
+        body = zlib.decompress(body)
+    elif content_encoding:
+        raise ValueError(f"지원하지 않는 content_encoding: {content_encoding}")
+
+    if content_type == CONTENT_TYPE_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack 메시지를 받았지만 msgpack이 설치되어 있지 않습니다.")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body.decode("utf-8"))
@@ -1,8 +1,137 @@
 import pika
-import json
 import os
+import threading
 import time
 
+from broker import codec, transport
+
+# 발행 풀에서 유지할 최대 연결(채널) 수
+BROKER_POOL_SIZE = int(os.getenv("BROKER_POOL_SIZE", "4"))
+# 풀이 가득 찼을 때 다른 스레드가 연결을 반납하기를 기다리는 최대 시간
+BROKER_POOL_ACQUIRE_TIMEOUT_SEC = float(os.getenv("BROKER_POOL_ACQUIRE_TIMEOUT", "10"))
+# 일괄 발행 시 제한 시간을 함께 적용할 메시지 수(윈도우) / 윈도우당 최대 발행 시간
+CONFIRM_WINDOW = int(os.getenv("BROKER_CONFIRM_WINDOW", "200"))
+CONFIRM_TIMEOUT_SEC = float(os.getenv("BROKER_CONFIRM_TIMEOUT", "30"))
+# 확인 대기 중 I/O 처리 간격 (제한 시간을 이 간격으로 확인)
+_CONFIRM_POLL_SEC = 0.01
+
+# publish_many 메시지별 결과 값
+PUBLISH_ACK = "ack"          # 브로커가 저장 확인
+PUBLISH_NACK = "nack"        # 브로커가 거부
+PUBLISH_TIMEOUT = "timeout"  # 제한 시간 내 확인을 받지 못함
+PUBLISH_ERROR = "error"      # 연결 오류로 전송 여부를 알 수 없음
+
+# 우선순위 레인: 대화형 요청은 원래 큐, 배치/백그라운드 작업은 "<queue>.bulk" 큐로 보낸다.
+# (기존 큐를 x-max-priority로 다시 선언하면 PRECONDITION_FAILED가 나므로 큐를 분리)
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+
+
+def lane_queue(queue_name, lane=None):
+    """레인에 해당하는 큐 이름 (bulk가 아니면 원래 큐)"""
+    return f"{queue_name}.{LANE_BULK}" if lane == LANE_BULK else queue_name
+
+
+def _open_connection(host):
+    # BROKER_TRANSPORT=memory 이면 프로세스 내부 큐 사용
+    return transport.connect(host)
+
+
+def _declare_with_dlq(channel, queue_name):
+    """주 큐와 DLQ를 소비자와 동일한 옵션으로 선언"""
+    dlq_name = f"{queue_name}.dlq"
+    channel.queue_declare(queue=dlq_name, durable=True)
+    channel.queue_declare(
+        queue=queue_name,
+        durable=True,
+        arguments={
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": dlq_name,
+        },
+    )
+
+
+class _ConfirmChannel:
+    """
+    publisher confirm 전용 채널.
+    BlockingChannel.confirm_delivery()를 쓰면 basic_publish마다 확인을 기다려 메시지당 왕복이 생기므로,
+    하위 채널(_impl)에 confirm 콜백을 걸고 윈도우를 연속 발행한 뒤 delivery tag별 ack/nack을 한꺼번에 모은다.
+    제한 시간(윈도우마다 새로 시작)은 확인을 기다리는 동안 적용되며, 그때까지 확인이 없는 메시지는
+    PUBLISH_TIMEOUT으로 돌려준다 (호출자가 재발행, 늦게 도착한 확인은 무시).
+    """
+
+    def __init__(self, connection, timeout=CONFIRM_TIMEOUT_SEC):
+        self.connection = connection
+        self.channel = connection.channel()
+        self._impl = self.channel._impl
+        self._next_tag = 1
+        self._pending = {}  # delivery_tag -> 윈도우 내 인덱스
+        self._outcomes = []
+
+        selected = []
+        self._impl.confirm_delivery(ack_nack_callback=self._on_confirm, callback=selected.append)
+        self._wait(lambda: selected, time.monotonic() + timeout)
+        if not selected:
+            raise pika.exceptions.AMQPChannelError("Confirm.SelectOk 응답 없음")
+
+    def _on_confirm(self, frame):
+        method = frame.method
+        result = PUBLISH_ACK if isinstance(method, pika.spec.Basic.Ack) else PUBLISH_NACK
+        if method.multiple:
+            tags = [tag for tag in self._pending if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag]
+        for tag in tags:
+            idx = self._pending.pop(tag, None)
+            if idx is not None:
+                self._outcomes[idx] = result
+
+    def _wait(self, done, deadline):
+        """done()이 참이 되거나 deadline(time.monotonic 기준)이 지날 때까지 I/O 처리"""
+        while not done():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self.connection.process_data_events(time_limit=min(remaining, _CONFIRM_POLL_SEC))
+
+    def publish_window(self, queue_name, encoded, timeout=CONFIRM_TIMEOUT_SEC):
+        """인코딩된 (body, meta) 목록을 연속 발행한 뒤 확인을 모아서 기다리고 메시지별 결과를 반환"""
+        deadline = time.monotonic() + timeout
+        self._outcomes = [PUBLISH_TIMEOUT] * len(encoded)
+        self._pending = {}
+        for idx, (body, meta) in enumerate(encoded):
+            self._impl.basic_publish(
+                exchange='',
+                routing_key=queue_name,
+                body=body,
+                properties=pika.BasicProperties(delivery_mode=2, **meta),
+            )
+            self._pending[self._next_tag] = idx
+            self._next_tag += 1
+
+        self._wait(lambda: not self._pending, deadline)
+        # 시간 초과 후 늦게 도착한 확인은 무시
+        self._pending = {}
+        return self._outcomes
+
+
+def _publish_windows(confirm, queue_name, messages, window, timeout, content_type=None):
+    """
+    메시지를 window개씩 나눠 발행. 연결 오류 이후 메시지는 PUBLISH_ERROR로 표시
+    일괄 발행은 기본적으로 바이너리 포맷(codec.BULK_CONTENT_TYPE)을 사용한다.
+    """
+    encoded = [codec.encode(m, content_type or codec.BULK_CONTENT_TYPE) for m in messages]
+    outcomes = []
+    for start in range(0, len(encoded), window):
+        try:
+            outcomes += confirm.publish_window(queue_name, encoded[start:start + window], timeout)
+        except pika.exceptions.AMQPError as e:
+            print(f" [Error] 일괄 발행 중 연결 오류 ({start}/{len(encoded)}): {e!r}")
+            outcomes += [PUBLISH_ERROR] * (len(encoded) - start)
+            break
+    return outcomes
+
+
 class EventBroker:
     def __init__(self, queue_name='weinjeon_updates'):
         """
@@ -13,6 +142,7 @@ class EventBroker:
         self.queue_name = queue_name
         self.connection = None
         self.channel = None
+        self._confirm = None
         self._connect()
 
     def _connect(self):
@@ -22,34 +152,23 @@ class EventBroker:
         """
         while True:
             try:
-                self.connection = pika.BlockingConnection(
-                    pika.ConnectionParameters(host=self.mq_host)
-                )
+                self.connection = _open_connection(self.mq_host)
                 self.channel = self.connection.channel()
                 # DLQ 포함 동일 설정으로 선언 (소비자와 선언 옵션 일치해야 함)
-                dlq_name = f"{self.queue_name}.dlq"
-                self.channel.queue_declare(queue=dlq_name, durable=True)
-                self.channel.queue_declare(
-                    queue=self.queue_name,
-                    durable=True,
-                    arguments={
-                        "x-dead-letter-exchange": "",
-                        "x-dead-letter-routing-key": dlq_name,
-                    },
-                )
+                _declare_with_dlq(self.channel, self.queue_name)
                 print(f" [Broker] RabbitMQ({self.mq_host}) 연결 성공!")
                 return
-            except pika.exceptions.AMQPConnectionError:
+            except Exception:
                 print(f" [Broker] 연결 실패. 5초 후 재시도합니다... ({self.mq_host})")
                 time.sleep(5)
 
-    def publish(self, data):
+    def publish(self, data, content_type=None):
         """
-        데이터를 JSON으로 변환하여 발행 (Publish)
+        데이터를 봉투 포맷(기본 JSON)으로 변환하여 발행 (Publish)
         """
         try:
-            # 딕셔너리 -> JSON 문자열 변환 (한글 깨짐 방지 ensure_ascii=False)
-            message_body = json.dumps(data, ensure_ascii=False)
+            # 딕셔너리 -> 본문 + content_type/압축 헤더
+            message_body, meta = codec.encode(data, content_type)
             
             self.channel.basic_publish(
                 exchange='',
@@ -57,6 +176,7 @@ class EventBroker:
                 body=message_body,
                 properties=pika.BasicProperties(
                     delivery_mode=2,  # 메시지를 디스크에 영구 저장 (안전성 확보)
+                    **meta,
                 )
             )
             print(f" [>>>] Event Published: {data.get('title', 'No Title')}")
@@ -65,6 +185,211 @@ class EventBroker:
             print(f" [Error] 메시지 전송 실패: {e}")
             # 연결이 끊어졌을 경우 재연결 로직을 여기에 추가할 수도 있음
 
+    def publish_many(self, messages, window=None, timeout=None, content_type=None):
+        """
+        publisher confirm 모드로 여러 메시지를 일괄 발행.
+        window개씩 나눠 윈도우마다 제한 시간 안에 확인받으며 보내고, 메시지별 결과(PUBLISH_*) 리스트를 반환한다.
+        """
+        if self._confirm is None:
+            self._confirm = _ConfirmChannel(self.connection)
+        outcomes = _publish_windows(
+            self._confirm,
+            self.queue_name,
+            messages,
+            window or CONFIRM_WINDOW,
+            CONFIRM_TIMEOUT_SEC if timeout is None else timeout,
+            content_type,
+        )
+        print(f" [>>>] Batch Published: {outcomes.count(PUBLISH_ACK)}/{len(outcomes)} 확인")
+        return outcomes
+
     def close(self):
         if self.connection and not self.connection.is_closed:
             self.connection.close()
+
+
+class _PooledChannel:
+    """풀에 보관되는 연결 + 채널 + 이미 선언한 큐 목록"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.channel = connection.channel()
+        self.declared = set()
+        self.confirm = None
+
+    def close(self):
+        try:
+            if not self.connection.is_closed:
+                self.connection.close()
+        except Exception:
+            pass
+
+
+class PoolExhaustedError(pika.exceptions.AMQPConnectionError):
+    """제한 시간 안에 발행 풀에서 연결을 빌리지 못함 (호출자는 일반 연결 오류처럼 처리)"""
+
+
+class PublisherPool:
+    """
+    프로세스 전역에서 공유하는 발행용 연결 풀.
+    - pika BlockingConnection은 스레드 안전하지 않으므로 채널은 한 번에 한 스레드만 빌려 쓴다.
+      (Flask 개발 서버처럼 요청마다 스레드가 새로 생겨도 연결은 풀에서 재사용된다)
+    - 큐 선언은 연결마다 한 번만 수행하고, 이후 발행은 basic_publish 한 번으로 끝난다.
+    - 연결이 끊겨 있으면 폐기 후 새 연결로 한 번 더 시도한다.
+    - 발행 중 어떤 예외든 나면 그 연결은 반납하지 않고 폐기한다 (상태를 알 수 없는 채널 재사용 방지).
+    """
+
+    def __init__(self, host=None, max_size=None, acquire_timeout=None):
+        self.mq_host = host or os.getenv('RABBITMQ_HOST', 'localhost')
+        self.max_size = max_size or BROKER_POOL_SIZE
+        self.acquire_timeout = BROKER_POOL_ACQUIRE_TIMEOUT_SEC if acquire_timeout is None else acquire_timeout
+        self._idle = []  # 최근 반납한 연결부터 재사용 (LIFO)
+        # 반납/폐기 때마다 notify: 기다리던 스레드는 깨어나 유휴 연결을 가져가거나 빈 자리에 새로 연결한다
+        self._cond = threading.Condition()
+        self._size = 0
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._cond:
+                # 풀이 가득 찼으면 다른 스레드가 반납하거나 폐기할 때까지 대기
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"발행 풀 연결 {self.max_size}개가 {self.acquire_timeout}초 동안 반납되지 않음"
+                        )
+                    self._cond.wait(remaining)
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    self._size += 1
+
+            if pooled is None:
+                try:
+                    return _PooledChannel(_open_connection(self.mq_host))
+                except Exception:
+                    self._free_slot()
+                    raise
+            if self._is_alive(pooled):
+                return pooled
+            self._discard(pooled)
+
+    @staticmethod
+    def _is_alive(pooled):
+        if pooled.connection.is_closed:
+            return False
+        try:
+            # 쉬는 동안 쌓인 하트비트/종료 프레임 처리 (끊긴 연결을 미리 걸러냄)
+            pooled.connection.process_data_events(time_limit=0)
+            return not pooled.connection.is_closed
+        except pika.exceptions.AMQPError:
+            return False
+
+    def _release(self, pooled):
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def _free_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _discard(self, pooled):
+        pooled.close()
+        self._free_slot()
+
+    def publish(self, queue_name, data, content_type=None):
+        """
+        데이터를 봉투 포맷(기본 JSON)으로 변환하여 발행. 연결 오류 시 새 연결로 한 번 재시도하고,
+        그래도 실패하면 예외를 호출자에게 전달한다.
+        """
+        message_body, meta = codec.encode(data, content_type)
+        last_error = None
+        for _ in range(2):
+            pooled = self._acquire()
+            published = False
+            try:
+                if queue_name not in pooled.declared:
+                    _declare_with_dlq(pooled.channel, queue_name)
+                    pooled.declared.add(queue_name)
+                pooled.channel.basic_publish(
+                    exchange='',
+                    routing_key=queue_name,
+                    body=message_body,
+                    properties=pika.BasicProperties(delivery_mode=2, **meta),
+                )
+                published = True
+            except pika.exceptions.AMQPError as e:
+                print(f" [Broker] 발행 실패, 재연결합니다: {e!r}")
+                last_error = e
+                continue
+            finally:
+                if published:
+                    self._release(pooled)
+                else:
+                    self._discard(pooled)
+            print(f" [>>>] Event Published: {queue_name}")
+            return
+        raise last_error
+
+    def publish_many(self, queue_name, messages, window=None, timeout=None, content_type=None):
+        """
+        publisher confirm 모드로 여러 메시지를 일괄 발행하고 메시지별 결과(PUBLISH_*)를 반환.
+        연결 오류로 끝난 경우 해당 연결은 폐기되며, PUBLISH_ERROR/TIMEOUT 메시지는 호출자가 재발행한다.
+        """
+        pooled = self._acquire()
+        try:
+            if queue_name not in pooled.declared:
+                _declare_with_dlq(pooled.channel, queue_name)
+                pooled.declared.add(queue_name)
+            if pooled.confirm is None:
+                pooled.confirm = _ConfirmChannel(pooled.connection)
+        except pika.exceptions.AMQPError as e:
+            print(f" [Broker] 일괄 발행 준비 실패: {e!r}")
+            self._discard(pooled)
+            return [PUBLISH_ERROR] * len(messages)
+        except BaseException:
+            self._discard(pooled)
+            raise
+
+        try:
+            outcomes = _publish_windows(
+                pooled.confirm,
+                queue_name,
+                messages,
+                window or CONFIRM_WINDOW,
+                CONFIRM_TIMEOUT_SEC if timeout is None else timeout,
+                content_type,
+            )
+        except BaseException:
+            self._discard(pooled)
+            raise
+        if PUBLISH_ERROR in outcomes:
+            self._discard(pooled)
+        else:
+            self._release(pooled)
+        print(f" [>>>] Batch Published: {queue_name} {outcomes.count(PUBLISH_ACK)}/{len(outcomes)} 확인")
+        return outcomes
+
+    def close(self):
+        """풀에 남아 있는 연결을 모두 닫는다."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_publisher_pool(host=None):
+    """호스트별 프로세스 전역 발행 풀 반환 (최초 호출 시 생성)"""
+    host = host or os.getenv('RABBITMQ_HOST', 'localhost')
+    with _pools_lock:
+        pool = _pools.get(host)
+        if pool is None:
+            pool = PublisherPool(host=host)
+            _pools[host] = pool
+        return pool
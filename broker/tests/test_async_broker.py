@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+
+aio_pika = pytest.importorskip("aio_pika")
+
+from broker import codec  # noqa: E402
+from broker.async_broker import AsyncEventBroker  # noqa: E402
+from broker.event_broker import PUBLISH_ACK, PUBLISH_NACK, PUBLISH_TIMEOUT  # noqa: E402
+
+
+class FakeExchange:
+    def __init__(self, results=None):
+        self.results = list(results or [])
+        self.published = []
+
+    async def publish(self, message, routing_key, timeout=None):
+        self.published.append((routing_key, codec.decode(message.body, message)))
+        result = self.results.pop(0) if self.results else None
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+class FakeQueueIterator:
+    def __init__(self, messages):
+        self._messages = list(messages)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._messages:
+            raise StopAsyncIteration
+        return self._messages.pop(0)
+
+
+class FakeQueue:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def iterator(self):
+        return FakeQueueIterator(self.messages)
+
+
+class FakeChannel:
+    def __init__(self, exchange=None, messages=()):
+        self.default_exchange = exchange or FakeExchange()
+        self.declared = []
+        self.prefetch = None
+        self.messages = messages
+
+    async def declare_queue(self, name, durable=False, arguments=None):
+        self.declared.append({"queue": name, "durable": durable, "arguments": arguments or {}})
+        return FakeQueue(self.messages)
+
+    async def set_qos(self, prefetch_count):
+        self.prefetch = prefetch_count
+
+
+class FakeConnection:
+    def __init__(self, channel):
+        self._channel = channel
+        self.is_closed = False
+
+    async def channel(self, publisher_confirms=False):
+        return self._channel
+
+
+class FakeMessage:
+    def __init__(self, payload):
+        self.body = json.dumps(payload).encode("utf-8")
+        self.acked = False
+        self.nacked = False
+
+    async def ack(self):
+        self.acked = True
+
+    async def nack(self, requeue=True):
+        self.nacked = True
+
+
+def _broker(channel):
+    broker = AsyncEventBroker(host="mq")
+    broker.connection = FakeConnection(channel)
+    broker._channel = channel
+    return broker
+
+
+def test_publish_many_declares_once_and_maps_outcomes():
+    nack = aio_pika.exceptions.DeliveryError(None, None)
+    exchange = FakeExchange(results=[None, nack, asyncio.TimeoutError()])
+    channel = FakeChannel(exchange)
+    broker = _broker(channel)
+
+    outcomes = asyncio.run(broker.publish_many("bulk", [{"n": 1}, {"n": 2}, {"n": 3}], window=2))
+
+    assert outcomes == [PUBLISH_ACK, PUBLISH_NACK, PUBLISH_TIMEOUT]
+    assert [d["queue"] for d in channel.declared] == ["bulk.dlq", "bulk"]
+    main_decl = channel.declared[1]
+    assert main_decl["arguments"]["x-dead-letter-routing-key"] == "bulk.dlq"
+    assert [p[1]["n"] for p in exchange.published] == [1, 2, 3]
+
+
+def test_consume_limits_in_flight_handlers_and_acks():
+    messages = [FakeMessage({"n": i}) for i in range(6)] + [FakeMessage({"fail": True})]
+    channel = FakeChannel(messages=list(messages))
+    broker = _broker(channel)
+    state = {"running": 0, "peak": 0}
+
+    async def handler(payload, message):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        if payload.get("fail"):
+            raise ValueError("boom")
+
+    asyncio.run(broker.consume("jobs", handler, concurrency=2))
+
+    assert channel.prefetch == 2
+    assert state["peak"] == 2
+    assert all(m.acked for m in messages[:-1])
+    assert messages[-1].nacked and not messages[-1].acked
+
+
+def test_consume_runs_blocking_handler_in_executor():
+    messages = [FakeMessage({"n": 1})]
+    channel = FakeChannel(messages=list(messages))
+    broker = _broker(channel)
+    seen = []
+
+    def handler(payload, message):
+        seen.append(payload["n"])
+
+    asyncio.run(broker.consume("jobs", handler, concurrency=1))
+
+    assert seen == [1]
+    assert messages[0].acked
@@ -0,0 +1,58 @@
+import json
+import types
+
+import pytest
+
+from broker import codec
+
+
+def _props(meta):
+    return types.SimpleNamespace(**meta)
+
+
+def test_json_envelope_keeps_plain_json_body():
+    body, meta = codec.encode({"title": "안녕"}, codec.CONTENT_TYPE_JSON)
+
+    assert body == '{"title": "안녕"}'
+    assert meta["content_type"] == codec.CONTENT_TYPE_JSON
+    assert meta["headers"][codec.ENVELOPE_VERSION_HEADER] == codec.ENVELOPE_VERSION
+    assert "content_encoding" not in meta
+    assert codec.decode(body.encode("utf-8"), _props(meta)) == {"title": "안녕"}
+
+
+def test_decode_without_properties_falls_back_to_json():
+    body = json.dumps({"studentId": "111"}).encode("utf-8")
+    assert codec.decode(body, None) == {"studentId": "111"}
+    assert codec.decode(body, types.SimpleNamespace(content_type=None, content_encoding=None)) == {"studentId": "111"}
+
+
+def test_large_payload_is_compressed_and_round_trips():
+    data = {"items": ["같은 내용 반복"] * 500}
+    body, meta = codec.encode(data, codec.CONTENT_TYPE_JSON, compress_threshold=100)
+
+    assert meta["content_encoding"] == codec.ENCODING_DEFLATE
+    assert len(body) < len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+    assert codec.decode(body, _props(meta)) == data
+
+
+def test_msgpack_envelope_round_trips():
+    pytest.importorskip("msgpack")
+    data = {"studentId": "111", "n": 3, "ok": True}
+    body, meta = codec.encode(data, codec.CONTENT_TYPE_MSGPACK)
+
+    assert isinstance(body, bytes)
+    assert meta["content_type"] == codec.CONTENT_TYPE_MSGPACK
+    assert codec.decode(body, _props(meta)) == data
+
+
+def test_msgpack_request_falls_back_to_json_without_msgpack(monkeypatch):
+    monkeypatch.setattr(codec, "msgpack", None)
+    body, meta = codec.encode({"n": 1}, codec.CONTENT_TYPE_MSGPACK)
+
+    assert meta["content_type"] == codec.CONTENT_TYPE_JSON
+    assert codec.decode(body, _props(meta)) == {"n": 1}
+
+
+def test_unknown_content_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        codec.decode(b"{}", types.SimpleNamespace(content_type=None, content_encoding="br"))
@@ -1,6 +1,24 @@
+import threading
+import time
 from unittest import mock
 
-from broker.event_broker import EventBroker
+import pika
+import pytest
+
+from broker import codec
+from broker.event_broker import (
+    LANE_BULK,
+    LANE_INTERACTIVE,
+    PUBLISH_ACK,
+    PUBLISH_ERROR,
+    PUBLISH_NACK,
+    PUBLISH_TIMEOUT,
+    EventBroker,
+    PoolExhaustedError,
+    PublisherPool,
+    get_publisher_pool,
+    lane_queue,
+)
 
 
 class FakeChannel:
@@ -90,3 +108,277 @@ def test_event_broker_reconnects_on_failure(monkeypatch):
     broker = EventBroker(queue_name="retryq")
     assert calls["count"] == 2
     assert broker.channel is fake_channel
+
+
+class PoolFakeConnection(FakeConnection):
+    def __init__(self, channel):
+        super().__init__(channel)
+        self.events_processed = 0
+
+    def process_data_events(self, time_limit=None):
+        self.events_processed += 1
+
+
+def test_publisher_pool_reuses_connection_and_declares_once():
+    fake_channel = FakeChannel()
+    fake_conn = PoolFakeConnection(fake_channel)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=fake_conn) as factory:
+        pool = PublisherPool(host="mq")
+        pool.publish("pool_queue", {"n": 1})
+        pool.publish("pool_queue", {"n": 2})
+
+    assert factory.call_count == 1
+    assert [d["queue"] for d in fake_channel.declared] == ["pool_queue.dlq", "pool_queue"]
+    assert len(fake_channel.published) == 2
+
+
+def test_publisher_pool_reconnects_when_publish_fails():
+    class BrokenChannel(FakeChannel):
+        def basic_publish(self, *args, **kwargs):
+            raise pika.exceptions.StreamLostError("lost")
+
+    broken_conn = PoolFakeConnection(BrokenChannel())
+    good_channel = FakeChannel()
+    good_conn = PoolFakeConnection(good_channel)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", side_effect=[broken_conn, good_conn]):
+        pool = PublisherPool(host="mq")
+        pool.publish("q", {"n": 1})
+
+    assert broken_conn.is_closed is True
+    assert len(good_channel.published) == 1
+    # 새 연결에서는 큐를 다시 선언해야 한다.
+    assert "q" in {d["queue"] for d in good_channel.declared}
+
+
+def test_publisher_pool_skips_closed_idle_connection():
+    first = PoolFakeConnection(FakeChannel())
+    second_channel = FakeChannel()
+    second = PoolFakeConnection(second_channel)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", side_effect=[first, second]):
+        pool = PublisherPool(host="mq")
+        pool.publish("q", {"n": 1})
+        first.is_closed = True
+        pool.publish("q", {"n": 2})
+
+    assert len(second_channel.published) == 1
+
+
+def test_get_publisher_pool_is_process_wide():
+    assert get_publisher_pool("host-a") is get_publisher_pool("host-a")
+    assert get_publisher_pool("host-a") is not get_publisher_pool("host-b")
+
+
+class FakeConfirmImpl:
+    """
+    confirm 모드 하위 채널 흉내: 발행은 버퍼에만 쌓이고 확인은 process_data_events 때 한꺼번에 온다.
+    nack_tags에 든 태그는 거부, drop_tags는 확인을 보내지 않음, multiple=True면 마지막 태그로 한 번에 확인
+    """
+
+    def __init__(self, nack_tags=(), drop_tags=(), multiple=False):
+        self.nack_tags = set(nack_tags)
+        self.drop_tags = set(drop_tags)
+        self.multiple = multiple
+        self.published = []
+        self.ack_nack_callback = None
+        self.select_callback = None
+        self.unconfirmed = []
+        self.flushed_batches = []  # 확인을 보낼 때마다 그 사이에 발행된 메시지 수
+
+    def confirm_delivery(self, ack_nack_callback, callback=None):
+        self.ack_nack_callback = ack_nack_callback
+        self.select_callback = callback
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        self.published.append(body)
+        self.unconfirmed.append(len(self.published))
+
+    def _confirm(self, method_cls, tag, multiple=False):
+        self.ack_nack_callback(pika.frame.Method(1, method_cls(delivery_tag=tag, multiple=multiple)))
+
+    def flush(self):
+        if self.select_callback:
+            self.select_callback(pika.frame.Method(1, pika.spec.Confirm.SelectOk()))
+            self.select_callback = None
+        if not self.unconfirmed:
+            return
+        self.flushed_batches.append(len(self.unconfirmed))
+        if self.multiple:
+            self._confirm(pika.spec.Basic.Ack, self.unconfirmed[-1], multiple=True)
+        else:
+            for tag in self.unconfirmed:
+                if tag in self.drop_tags:
+                    continue
+                self._confirm(pika.spec.Basic.Nack if tag in self.nack_tags else pika.spec.Basic.Ack, tag)
+        self.unconfirmed = []
+
+
+class ConfirmFakeChannel(FakeChannel):
+    def __init__(self, impl):
+        super().__init__()
+        self._impl = impl
+
+
+class ConfirmFakeConnection(PoolFakeConnection):
+    def __init__(self, impl):
+        super().__init__(ConfirmFakeChannel(impl))
+        self.impl = impl
+
+    def process_data_events(self, time_limit=None):
+        super().process_data_events(time_limit)
+        self.impl.flush()
+
+
+def test_event_broker_publish_many_returns_per_message_outcomes():
+    impl = FakeConfirmImpl(nack_tags={2})
+    fake_conn = ConfirmFakeConnection(impl)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=fake_conn):
+        broker = EventBroker(queue_name="bulk")
+        outcomes = broker.publish_many([{"n": i} for i in range(3)])
+
+    assert outcomes == [PUBLISH_ACK, PUBLISH_NACK, PUBLISH_ACK]
+    assert len(impl.published) == 3
+
+
+def test_publish_many_pipelines_each_window_before_waiting_for_confirms():
+    impl = FakeConfirmImpl()
+    fake_conn = ConfirmFakeConnection(impl)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=fake_conn):
+        pool = PublisherPool(host="mq")
+        outcomes = pool.publish_many("bulk", [{"n": i} for i in range(10)], window=5)
+
+    assert outcomes == [PUBLISH_ACK] * 10
+    # 메시지 10개지만 확인은 윈도우(5개)마다 한 번에 도착하고, 확인 대기도 윈도우 수만큼(+ select-ok 1번)
+    assert impl.flushed_batches == [5, 5]
+    assert fake_conn.events_processed == 3
+
+
+def test_publish_many_resolves_multiple_ack_by_delivery_tag():
+    impl = FakeConfirmImpl(multiple=True)
+    fake_conn = ConfirmFakeConnection(impl)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=fake_conn):
+        pool = PublisherPool(host="mq")
+        first = pool.publish_many("bulk", [{"n": i} for i in range(3)])
+        second = pool.publish_many("bulk", [{"n": i} for i in range(2)])
+
+    # delivery tag는 연결 단위로 이어지므로 두 번째 일괄 발행은 태그 4, 5를 확인받는다
+    assert first == [PUBLISH_ACK] * 3
+    assert second == [PUBLISH_ACK] * 2
+
+
+def test_publish_many_marks_unconfirmed_messages_as_timeout_at_the_deadline():
+    impl = FakeConfirmImpl(drop_tags={1})
+    fake_conn = ConfirmFakeConnection(impl)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=fake_conn):
+        pool = PublisherPool(host="mq")
+        started = time.monotonic()
+        outcomes = pool.publish_many("bulk", [{"n": 1}, {"n": 2}], timeout=0.05)
+        elapsed = time.monotonic() - started
+
+    assert outcomes == [PUBLISH_TIMEOUT, PUBLISH_ACK]
+    assert elapsed < 1
+
+
+def test_publish_many_zero_timeout_is_not_replaced_by_default():
+    impl = FakeConfirmImpl()
+    fake_conn = ConfirmFakeConnection(impl)
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=fake_conn):
+        pool = PublisherPool(host="mq")
+        pool.publish_many("bulk", [{"n": 0}])
+        waits = fake_conn.events_processed
+        outcomes = pool.publish_many("bulk", [{"n": 1}], timeout=0)
+
+    # 제한 시간 0이면 확인을 기다리지 않는다 (기본 30초로 바뀌지 않음)
+    assert outcomes == [PUBLISH_TIMEOUT]
+    assert fake_conn.events_processed == waits + 1  # 체크아웃 점검만
+
+
+def test_publish_many_marks_remaining_messages_as_error_on_connection_loss():
+    class LosingImpl(FakeConfirmImpl):
+        def basic_publish(self, exchange, routing_key, body, properties=None):
+            if len(self.published) == 2:
+                raise pika.exceptions.StreamLostError("lost")
+            super().basic_publish(exchange, routing_key, body, properties)
+
+    fake_conn = ConfirmFakeConnection(LosingImpl())
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=fake_conn):
+        pool = PublisherPool(host="mq")
+        outcomes = pool.publish_many("bulk", [{"n": i} for i in range(4)], window=2)
+
+    assert outcomes == [PUBLISH_ACK, PUBLISH_ACK, PUBLISH_ERROR, PUBLISH_ERROR]
+    assert fake_conn.is_closed is True
+
+
+def test_lane_queue_routes_bulk_to_separate_queue():
+    assert lane_queue("everytime_sync") == "everytime_sync"
+    assert lane_queue("everytime_sync", LANE_INTERACTIVE) == "everytime_sync"
+    assert lane_queue("everytime_sync", LANE_BULK) == "everytime_sync.bulk"
+
+
+def test_publisher_pool_discards_connection_on_unexpected_error():
+    class ExplodingChannel(FakeChannel):
+        def basic_publish(self, *args, **kwargs):
+            raise RuntimeError("boom")
+
+    conn = PoolFakeConnection(ExplodingChannel())
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=conn):
+        pool = PublisherPool(host="mq", max_size=1)
+        with pytest.raises(RuntimeError):
+            pool.publish("q", {"n": 1})
+
+    assert conn.is_closed is True
+    assert pool._size == 0
+    assert pool._idle == []
+
+
+def test_publisher_pool_acquire_times_out_when_exhausted():
+    conn = PoolFakeConnection(FakeChannel())
+    with mock.patch("broker.event_broker.pika.BlockingConnection", return_value=conn):
+        pool = PublisherPool(host="mq", max_size=1, acquire_timeout=0.05)
+        leased = pool._acquire()
+        with pytest.raises(PoolExhaustedError):
+            pool.publish("q", {"n": 1})
+        pool._release(leased)
+        pool.publish("q", {"n": 2})
+
+
+def test_publisher_pool_waiter_creates_new_connection_when_holder_discards():
+    holding = threading.Event()
+
+    class BrokenChannel(FakeChannel):
+        def basic_publish(self, *args, **kwargs):
+            holding.set()
+            time.sleep(0.05)
+            raise pika.exceptions.StreamLostError("lost")
+
+    waiter_channel = FakeChannel()
+
+    def connect(*args, **kwargs):
+        # holder 스레드가 여는 연결은 항상 발행에 실패한다
+        if threading.current_thread().name == "holder":
+            return PoolFakeConnection(BrokenChannel())
+        return PoolFakeConnection(waiter_channel)
+
+    results = {}
+
+    def run(name, data):
+        try:
+            pool.publish("q", data)
+            results[name] = "ok"
+        except Exception as e:
+            results[name] = e
+
+    with mock.patch("broker.event_broker.pika.BlockingConnection", side_effect=connect):
+        pool = PublisherPool(host="mq", max_size=1, acquire_timeout=2)
+        holder = threading.Thread(target=run, args=("holder", {"n": 1}), name="holder")
+        holder.start()
+        holding.wait(1)
+        started = time.monotonic()
+        waiter = threading.Thread(target=run, args=("waiter", {"n": 2}), name="waiter")
+        waiter.start()
+        holder.join(3)
+        waiter.join(3)
+
+    # holder가 두 번 모두 실패해 연결을 폐기하면 대기하던 스레드가 깨어나 새 연결을 만든다 (제한 시간까지 기다리지 않음)
+    assert results["waiter"] == "ok"
+    assert time.monotonic() - started < 1
+    assert {"n": 2} in [codec.decode(p["body"], p["properties"]) for p in waiter_channel.published]
@@ -0,0 +1,172 @@
+import threading
+
+import pika
+import pytest
+
+from broker import transport
+from broker.event_broker import PUBLISH_ACK, EventBroker, PublisherPool
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    monkeypatch.setenv("BROKER_TRANSPORT", "memory")
+    broker = transport.get_memory_broker()
+    broker.purge_all()
+    yield broker
+    broker.purge_all()
+
+
+def _consume_all(conn, queue_name, handler, prefetch=0):
+    ch = conn.channel()
+    ch.basic_qos(prefetch_count=prefetch)
+    ch.basic_consume(queue=queue_name, on_message_callback=handler)
+    return ch
+
+
+def test_connect_selects_transport_from_env(memory, monkeypatch):
+    assert isinstance(transport.connect("unused"), transport.InMemoryConnection)
+
+    monkeypatch.setenv("BROKER_TRANSPORT", "kafka")
+    with pytest.raises(ValueError):
+        transport.connect("unused")
+
+
+def test_event_broker_publishes_through_memory_transport(memory):
+    broker = EventBroker(queue_name="mem_q")
+    broker.publish({"title": "안녕"})
+
+    assert memory.message_count("mem_q") == 1
+    assert memory.message_count("mem_q.dlq") == 0
+
+    received = []
+    conn = transport.connect("unused")
+    _consume_all(conn, "mem_q", lambda ch, method, props, body: (received.append(body), ch.basic_ack(method.delivery_tag)))
+    conn.process_data_events(time_limit=0)
+
+    assert received == ['{"title": "안녕"}'.encode("utf-8")]
+    assert memory.message_count("mem_q") == 0
+
+
+def test_redeclare_with_different_arguments_is_rejected(memory):
+    EventBroker(queue_name="strict_q")
+    ch = transport.connect("unused").channel()
+    with pytest.raises(pika.exceptions.ChannelClosedByBroker):
+        ch.queue_declare(queue="strict_q", durable=True)
+
+
+def test_nack_without_requeue_routes_to_dlq_and_requeue_redelivers(memory):
+    pool = PublisherPool(host="unused")
+    pool.publish("work", {"n": 1})
+    pool.publish("work", {"n": 2})
+
+    seen = []
+
+    def handler(ch, method, props, body):
+        seen.append((body, method.redelivered))
+        if len(seen) == 1:
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        elif len(seen) == 2:
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        else:
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    conn = transport.connect("unused")
+    _consume_all(conn, "work", handler, prefetch=1)
+    for _ in range(3):
+        conn.process_data_events(time_limit=0)
+
+    assert seen[0] == (b'{"n": 1}', False)
+    assert seen[1] == (b'{"n": 1}', True)
+    assert seen[2] == (b'{"n": 2}', False)
+    assert memory.message_count("work.dlq") == 1
+
+
+def test_prefetch_limits_unacked_deliveries(memory):
+    pool = PublisherPool(host="unused")
+    for i in range(5):
+        pool.publish("pf", {"n": i})
+
+    held = []
+    conn = transport.connect("unused")
+    ch = _consume_all(conn, "pf", lambda ch, method, props, body: held.append(method.delivery_tag), prefetch=2)
+    conn.process_data_events(time_limit=0)
+    conn.process_data_events(time_limit=0)
+    assert len(held) == 2
+
+    ch.basic_ack(delivery_tag=held[-1], multiple=True)
+    conn.process_data_events(time_limit=0)
+    assert len(held) == 4
+
+
+def test_closing_connection_requeues_unacked(memory):
+    PublisherPool(host="unused").publish("cq", {"n": 1})
+
+    conn = transport.connect("unused")
+    _consume_all(conn, "cq", lambda *args: None)
+    conn.process_data_events(time_limit=0)
+    assert memory.message_count("cq") == 0
+
+    conn.close()
+    assert memory.message_count("cq") == 1
+
+
+def test_publish_many_is_confirmed_on_memory_transport(memory):
+    outcomes = PublisherPool(host="unused").publish_many("bulk", [{"n": i} for i in range(7)], window=3)
+    assert outcomes == [PUBLISH_ACK] * 7
+    assert memory.message_count("bulk") == 7
+
+
+def test_ack_from_another_thread_via_add_callback_threadsafe(memory):
+    PublisherPool(host="unused").publish("tq", {"n": 1})
+    done = threading.Event()
+
+    def handler(ch, method, props, body):
+        def work():
+            ch.connection.add_callback_threadsafe(lambda: ch.basic_ack(delivery_tag=method.delivery_tag))
+            done.set()
+
+        threading.Thread(target=work).start()
+
+    conn = transport.connect("unused")
+    ch = _consume_all(conn, "tq", handler, prefetch=1)
+    conn.process_data_events(time_limit=0)
+    assert done.wait(1)
+    conn.process_data_events(time_limit=1)
+    assert ch._unacked == {}
+
+
+def test_sleep_inside_callback_does_not_dispatch_nested_deliveries(memory):
+    pool = PublisherPool(host="unused")
+    pool.publish("nest", {"n": 1})
+    pool.publish("nest", {"n": 2})
+
+    depth = {"now": 0, "max": 0}
+
+    def handler(ch, method, props, body):
+        depth["now"] += 1
+        depth["max"] = max(depth["max"], depth["now"])
+        ch.connection.sleep(0.01)
+        depth["now"] -= 1
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    conn = transport.connect("unused")
+    _consume_all(conn, "nest", handler)
+    conn.process_data_events(time_limit=0)
+    conn.process_data_events(time_limit=0)
+
+    assert depth["max"] == 1
+    assert memory.message_count("nest") == 0
+
+
+def test_publish_to_named_exchange_raises_channel_error(memory):
+    ch = transport.connect("unused").channel()
+    with pytest.raises(pika.exceptions.AMQPChannelError):
+        ch.basic_publish(exchange="amq.topic", routing_key="q", body=b"x")
+
+
+def test_separate_process_entry_points_refuse_memory_transport(memory, monkeypatch):
+    with pytest.raises(RuntimeError):
+        transport.require_shared_transport("consumer")
+
+    monkeypatch.setenv("BROKER_TRANSPORT", "rabbitmq")
+    transport.require_shared_transport("consumer")
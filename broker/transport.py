@@ -0,0 +1,379 @@
+"""
+브로커 전송 계층 선택
+- BROKER_TRANSPORT=rabbitmq (기본): pika.BlockingConnection
+- BROKER_TRANSPORT=memory: 프로세스 내부 큐 (RabbitMQ 없이 로컬 벤치마크/테스트용)
+
+인메모리 구현은 이 저장소가 쓰는 pika BlockingConnection/BlockingChannel API 부분집합
+(queue_declare, basic_publish, basic_qos, basic_consume, start_consuming, basic_ack/nack,
+process_data_events, add_callback_threadsafe, confirm 모드)을 그대로 흉내 내므로
+EventBroker, PublisherPool, consumer/messaging, 핸들러 코드를 수정 없이 돌릴 수 있다.
+같은 프로세스 안의 연결끼리만 메시지를 주고받으므로, 게이트웨이와 컨슈머는 consumer/local_stack.py로
+한 프로세스에서 함께 실행해야 한다 (각자의 main은 require_shared_transport로 memory 모드를 거부).
+"""
+import collections
+import itertools
+import os
+import threading
+import time
+
+import pika
+
+TRANSPORT_RABBITMQ = "rabbitmq"
+TRANSPORT_MEMORY = "memory"
+
+
+def transport_name():
+    return os.getenv("BROKER_TRANSPORT", TRANSPORT_RABBITMQ).strip().lower()
+
+
+def connect(host):
+    """BROKER_TRANSPORT 설정에 맞는 blocking 연결 생성"""
+    name = transport_name()
+    if name == TRANSPORT_MEMORY:
+        return InMemoryConnection(get_memory_broker())
+    if name != TRANSPORT_RABBITMQ:
+        raise ValueError(f"알 수 없는 BROKER_TRANSPORT: {name}")
+    return pika.BlockingConnection(pika.ConnectionParameters(host=host))
+
+
+def require_shared_transport(component):
+    """
+    프로세스 사이에서 메시지를 주고받아야 하는 실행 진입점에서 호출.
+    memory 전송이면 다른 프로세스가 메시지를 받을 수 없으므로 RuntimeError.
+    """
+    if transport_name() == TRANSPORT_MEMORY:
+        raise RuntimeError(
+            f"BROKER_TRANSPORT=memory는 프로세스 내부 큐라 {component}을(를) 따로 실행할 수 없습니다. "
+            "게이트웨이와 컨슈머를 한 프로세스에서 띄우는 consumer/local_stack.py를 사용하세요."
+        )
+
+
+class _Message:
+    __slots__ = ("body", "properties", "routing_key", "redelivered")
+
+    def __init__(self, body, properties, routing_key):
+        self.body = body
+        self.properties = properties
+        self.routing_key = routing_key
+        self.redelivered = False
+
+
+class _Queue:
+    def __init__(self, name, durable, arguments):
+        self.name = name
+        self.durable = durable
+        self.arguments = dict(arguments or {})
+        self.messages = collections.deque()
+
+
+class InMemoryBroker:
+    """프로세스 전역 큐 저장소. 모든 상태 변경은 self.lock 아래에서 수행"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.queues = {}
+
+    def declare(self, name, durable, arguments):
+        with self.lock:
+            q = self.queues.get(name)
+            if q is None:
+                self.queues[name] = _Queue(name, durable, arguments)
+                return
+            # RabbitMQ와 같이 기존 큐와 선언 옵션이 다르면 거부
+            if q.durable != durable or q.arguments != dict(arguments or {}):
+                raise pika.exceptions.ChannelClosedByBroker(
+                    406, f"PRECONDITION_FAILED - inequivalent arg for queue '{name}'"
+                )
+
+    def enqueue(self, routing_key, message, front=False):
+        """self.lock을 잡은 상태에서 호출. 큐가 없으면 RabbitMQ처럼 조용히 버림"""
+        q = self.queues.get(routing_key)
+        if q is None:
+            return False
+        if front:
+            q.messages.appendleft(message)
+        else:
+            q.messages.append(message)
+        self.changed.notify_all()
+        return True
+
+    def dead_letter(self, queue_name, message):
+        """self.lock을 잡은 상태에서 호출. x-dead-letter-routing-key가 있으면 그쪽으로 이동"""
+        q = self.queues.get(queue_name)
+        target = q.arguments.get("x-dead-letter-routing-key") if q else None
+        if target:
+            self.enqueue(target, _Message(message.body, message.properties, target))
+
+    def message_count(self, name):
+        with self.lock:
+            q = self.queues.get(name)
+            return len(q.messages) if q else 0
+
+    def purge_all(self):
+        with self.lock:
+            self.queues.clear()
+
+
+_memory_broker = InMemoryBroker()
+
+
+def get_memory_broker():
+    return _memory_broker
+
+
+class _Consumer:
+    def __init__(self, tag, queue, callback, auto_ack, prefetch):
+        self.tag = tag
+        self.queue = queue
+        self.callback = callback
+        self.auto_ack = auto_ack
+        self.prefetch = prefetch
+        self.unacked = 0
+
+    def can_take(self):
+        return self.auto_ack or not self.prefetch or self.unacked < self.prefetch
+
+
+class InMemoryChannel:
+    _tags = itertools.count(1)
+
+    def __init__(self, connection, channel_number):
+        self.connection = connection
+        self.channel_number = channel_number
+        self.broker = connection.broker
+        self.is_closed = False
+        self._prefetch = 0
+        self._consumers = []
+        self._unacked = {}  # delivery_tag -> (consumer, queue_name, message)
+        self._next_delivery_tag = 1
+        self._confirm_callback = None
+        self._publish_seq = 0
+        self._consuming = False
+
+    @property
+    def is_open(self):
+        return not self.is_closed
+
+    @property
+    def _impl(self):
+        # 일괄 발행(_ConfirmChannel)이 하위 채널 API로 confirm 콜백을 걸므로 자기 자신을 노출
+        return self
+
+    def queue_declare(self, queue, durable=False, arguments=None, **kwargs):
+        self.broker.declare(queue, durable, arguments)
+
+    def confirm_delivery(self, ack_nack_callback=None, callback=None):
+        # 인메모리 발행은 즉시 저장되므로 모든 메시지를 ack로 확인 (다음 process_data_events에서 전달)
+        self._confirm_callback = ack_nack_callback
+        if callback:
+            self.connection._post(callback, pika.frame.Method(self.channel_number, pika.spec.Confirm.SelectOk()))
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        if exchange:
+            # exchange_declare가 없으므로 RabbitMQ에서 선언하지 않은 exchange로 보낸 것과 같이 채널 오류
+            raise pika.exceptions.ChannelClosedByBroker(404, f"NOT_FOUND - no exchange '{exchange}' in vhost '/'")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        with self.broker.lock:
+            self.broker.enqueue(routing_key, _Message(body, properties or pika.BasicProperties(), routing_key))
+        if self._confirm_callback:
+            self._publish_seq += 1
+            ack = pika.spec.Basic.Ack(delivery_tag=self._publish_seq)
+            self.connection._post(self._confirm_callback, pika.frame.Method(self.channel_number, ack))
+
+    def basic_qos(self, prefetch_size=0, prefetch_count=0, global_qos=False):
+        self._prefetch = prefetch_count
+
+    def basic_consume(self, queue, on_message_callback, auto_ack=False, exclusive=False, consumer_tag=None, arguments=None):
+        tag = consumer_tag or f"ctag{self.channel_number}.{next(self._tags)}"
+        self._consumers.append(_Consumer(tag, queue, on_message_callback, auto_ack, self._prefetch))
+        return tag
+
+    def basic_cancel(self, consumer_tag):
+        self._consumers = [c for c in self._consumers if c.tag != consumer_tag]
+
+    def _settle(self, delivery_tag, multiple):
+        if multiple:
+            tags = [t for t in self._unacked if t <= delivery_tag]
+        else:
+            tags = [delivery_tag] if delivery_tag in self._unacked else []
+        settled = []
+        for tag in tags:
+            consumer, queue_name, message = self._unacked.pop(tag)
+            consumer.unacked -= 1
+            settled.append((queue_name, message))
+        return settled
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        with self.broker.lock:
+            self._settle(delivery_tag, multiple)
+            self.broker.changed.notify_all()
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        with self.broker.lock:
+            for queue_name, message in self._settle(delivery_tag, multiple):
+                if requeue:
+                    message.redelivered = True
+                    self.broker.enqueue(queue_name, message, front=True)
+                else:
+                    self.broker.dead_letter(queue_name, message)
+            self.broker.changed.notify_all()
+
+    def basic_reject(self, delivery_tag, requeue=True):
+        self.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+
+    def _take_deliveries(self):
+        """self.broker.lock을 잡은 상태에서 호출. prefetch 한도 내에서 전달할 메시지를 꺼냄"""
+        deliveries = []
+        for consumer in self._consumers:
+            q = self.broker.queues.get(consumer.queue)
+            while q is not None and q.messages and consumer.can_take():
+                message = q.messages.popleft()
+                tag = self._next_delivery_tag
+                self._next_delivery_tag += 1
+                if not consumer.auto_ack:
+                    consumer.unacked += 1
+                    self._unacked[tag] = (consumer, consumer.queue, message)
+                method = pika.spec.Basic.Deliver(
+                    consumer_tag=consumer.tag,
+                    delivery_tag=tag,
+                    redelivered=message.redelivered,
+                    exchange="",
+                    routing_key=consumer.queue,
+                )
+                deliveries.append((consumer.callback, method, message))
+        return deliveries
+
+    def _has_ready(self):
+        """self.broker.lock을 잡은 상태에서 호출"""
+        for consumer in self._consumers:
+            q = self.broker.queues.get(consumer.queue)
+            if q is not None and q.messages and consumer.can_take():
+                return True
+        return False
+
+    def _dispatch(self):
+        with self.broker.lock:
+            deliveries = self._take_deliveries()
+        for callback, method, message in deliveries:
+            self.connection._callback_depth += 1
+            try:
+                callback(self, method, message.properties, message.body)
+            finally:
+                self.connection._callback_depth -= 1
+        return bool(deliveries)
+
+    def start_consuming(self):
+        self._consuming = True
+        while self._consuming and not self.is_closed and self._consumers:
+            self.connection.process_data_events(time_limit=1)
+
+    def stop_consuming(self, consumer_tag=None):
+        self._consuming = False
+
+    def _requeue_unacked(self):
+        """self.broker.lock을 잡은 상태에서 호출. 닫힌 채널의 미확인 메시지는 큐로 되돌림"""
+        for tag in sorted(self._unacked, reverse=True):
+            _, queue_name, message = self._unacked.pop(tag)
+            message.redelivered = True
+            self.broker.enqueue(queue_name, message, front=True)
+
+    def close(self):
+        with self.broker.lock:
+            self._requeue_unacked()
+        self._consumers = []
+        self.is_closed = True
+
+
+class InMemoryConnection:
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_closed = False
+        self._channels = []
+        # (callback, arg) — 스레드 간 전달은 broker.lock으로 보호
+        self._events = collections.deque()  # confirm 응답 등 하위 채널 이벤트 (항상 처리)
+        self._user_events = collections.deque()  # add_callback_threadsafe 콜백
+        # pika와 같이 소비 콜백 안에서 호출된 process_data_events는 사용자 콜백을 중첩 실행하지 않음
+        self._callback_depth = 0
+
+    @property
+    def is_open(self):
+        return not self.is_closed
+
+    def channel(self, channel_number=None):
+        if self.is_closed:
+            raise pika.exceptions.ConnectionWrongStateError("Connection is closed")
+        ch = InMemoryChannel(self, channel_number or len(self._channels) + 1)
+        self._channels.append(ch)
+        return ch
+
+    def _post(self, callback, arg, user=False):
+        with self.broker.lock:
+            (self._user_events if user else self._events).append((callback, arg))
+            self.broker.changed.notify_all()
+
+    def add_callback_threadsafe(self, callback):
+        if self.is_closed:
+            raise pika.exceptions.ConnectionWrongStateError("Connection is closed")
+        self._post(lambda _: callback(), None, user=True)
+
+    def _run_events(self, events):
+        ran = False
+        while True:
+            with self.broker.lock:
+                if not events:
+                    return ran
+                callback, arg = events.popleft()
+            callback(arg)
+            ran = True
+
+    def _has_pending(self, nested):
+        """self.broker.lock을 잡은 상태에서 호출"""
+        if self._events:
+            return True
+        if nested:
+            return False
+        return bool(self._user_events) or any(ch._has_ready() for ch in self._channels if not ch.is_closed)
+
+    def process_data_events(self, time_limit=0):
+        """대기 중인 콜백/메시지를 처리. 처리할 것이 없으면 최대 time_limit초 대기 (None이면 무한)"""
+        if self.is_closed:
+            raise pika.exceptions.ConnectionWrongStateError("Connection is closed")
+        nested = self._callback_depth > 0
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        while True:
+            worked = self._run_events(self._events)
+            if not nested:
+                worked = self._run_events(self._user_events) or worked
+                for ch in list(self._channels):
+                    if not ch.is_closed:
+                        worked = ch._dispatch() or worked
+            if worked:
+                return
+            with self.broker.lock:
+                if self._has_pending(nested):
+                    continue
+                if deadline is None:
+                    self.broker.changed.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self.broker.changed.wait(remaining)
+
+    def sleep(self, duration):
+        deadline = time.monotonic() + duration
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self.process_data_events(time_limit=remaining)
+
+    def close(self):
+        if self.is_closed:
+            return
+        for ch in self._channels:
+            if not ch.is_closed:
+                ch.close()
+        self.is_closed = True
@@ -0,0 +1,9 @@
+"""
+에브리타임 동기화 동시 처리 수 기본값
+컨슈머 워커 수(EVERYTIME_WORKERS)를 한 곳에서 정하고,
+동시 브라우저 상한(EVERYTIME_MAX_BROWSERS) / 브라우저 풀(BROWSER_POOL_SIZE) / HTTP 연결 풀(EVERYTIME_HTTP_POOL_SIZE)은
+따로 지정하지 않으면 이 값을 따른다.
+"""
+import os
+
+EVERYTIME_WORKERS = max(1, int(os.getenv("EVERYTIME_WORKERS", str(min(4, os.cpu_count() or 1)))))
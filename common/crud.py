@@ -1,10 +1,15 @@
+import hashlib
+import json
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 # 같은 폴더 내의 models 모듈 임포트
-from .models import Program, Recommendation, TimeTable, User
+from .models import Program, ProgramSchedule, Recommendation, TimeTable, User, UserTimetableMask
+from .schedule import parse_run_period
+from .timeslots import mask_from_bytes, mask_to_bytes, schedule_mask, timetable_mask
 
 
 # ---------------------------------------------------------
@@ -52,12 +57,47 @@ def get_user_by_id(db: Session, student_id: str):
 # ---------------------------------------------------------
 # 2. 시간표 (TimeTable) 관련 - 에브리타임 크롤러용
 # ---------------------------------------------------------
-def save_timetables(db: Session, student_id: str, timetable_data: List[Dict]):
+def timetable_hash(timetable_data: List[Dict]) -> str:
+    """시간표 내용 해시 (항목 순서와 무관하도록 정규화 후 sha256)"""
+    normalized = sorted(
+        (
+            item["day"],
+            item["start_time"],
+            item["end_time"],
+            item.get("subject_name") or "",
+            item.get("classroom") or "",
+        )
+        for item in timetable_data
+    )
+    return hashlib.sha256(json.dumps(normalized, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def save_timetables(
+    db: Session,
+    student_id: str,
+    timetable_data: List[Dict],
+    skip_if_unchanged: bool = False,
+    record_hash: bool = True,
+):
     """
     기존 시간표를 삭제하고 새로운 시간표 리스트를 저장 (Transaction)
     timetable_data 예시: [{'day': 'Mon', 'start_time': '09:00', ...}, ...]
+    skip_if_unchanged=True이면 저장된 내용 해시와 같을 때 last_synced_at만 갱신하고 False를 반환한다.
+    record_hash=False이면 내용 해시를 비워 두고(다음 동기화는 항상 변경으로 봄),
+    후속 처리(추천 재계산 요청)가 끝난 뒤 set_timetable_hash로 기록한다.
     """
+    content_hash = timetable_hash(timetable_data)
+    stored_hash = content_hash if record_hash else None
     try:
+        mask_row = db.query(UserTimetableMask).filter(UserTimetableMask.student_id == student_id).first()
+        user = db.query(User).filter(User.student_id == student_id).first()
+
+        if skip_if_unchanged and mask_row and mask_row.timetable_hash == content_hash:
+            if user:
+                user.last_synced_at = datetime.now()
+            db.commit()
+            return False
+
         # 1. 기존 시간표 삭제
         db.query(TimeTable).filter(TimeTable.student_id == student_id).delete()
 
@@ -73,8 +113,23 @@ def save_timetables(db: Session, student_id: str, timetable_data: List[Dict]):
             )
             db.add(tt)
 
-        # 3. 유저 동기화 시간 업데이트
-        user = db.query(User).filter(User.student_id == student_id).first()
+        # 3. 주간 비트마스크/내용 해시 갱신 (추천 계산 시 충돌 검사, 다음 동기화 비교용)
+        mask = mask_to_bytes(timetable_mask(timetable_data))
+        if mask_row:
+            mask_row.mask = mask
+            mask_row.timetable_hash = stored_hash
+            mask_row.updated_at = datetime.now()
+        else:
+            db.add(
+                UserTimetableMask(
+                    student_id=student_id,
+                    mask=mask,
+                    timetable_hash=stored_hash,
+                    updated_at=datetime.now(),
+                )
+            )
+
+        # 4. 유저 동기화 시간 업데이트
         if user:
             user.last_synced_at = datetime.now()
 
@@ -86,20 +141,86 @@ def save_timetables(db: Session, student_id: str, timetable_data: List[Dict]):
         raise e
 
 
+def set_timetable_hash(db: Session, student_id: str, timetable_data: List[Dict]):
+    """저장된 시간표의 내용 해시 기록 (save_timetables(record_hash=False) 이후 후속 처리가 성공했을 때)"""
+    mask_row = db.query(UserTimetableMask).filter(UserTimetableMask.student_id == student_id).first()
+    if not mask_row:
+        return False
+    mask_row.timetable_hash = timetable_hash(timetable_data)
+    db.commit()
+    return True
+
+
+def touch_last_synced(db: Session, student_id: str):
+    """
+    시간표는 그대로 두고 last_synced_at만 현재 시각으로 갱신 (빈 크롤링/처리 실패/중복 요청으로 끝난 동기화).
+    게이트웨이는 last_synced_at이 발행 시각을 넘으면 동기화가 끝난 것으로 보고 다음 요청을 받는다.
+    """
+    user = db.query(User).filter(User.student_id == student_id).first()
+    if not user:
+        return False
+    user.last_synced_at = datetime.now()
+    db.commit()
+    return True
+
+
 def get_timetables(db: Session, student_id: str):
     """특정 학생의 시간표 조회"""
     return db.query(TimeTable).filter(TimeTable.student_id == student_id).all()
 
 
+def get_timetable_mask(db: Session, student_id: str):
+    """학생 시간표 비트마스크(int) 조회, 저장된 마스크가 없으면 None"""
+    row = db.query(UserTimetableMask.mask).filter(UserTimetableMask.student_id == student_id).first()
+    return mask_from_bytes(row[0]) if row else None
+
+
+def get_timetable_masks_for_students(db: Session, student_ids: List[str]) -> Dict[str, int]:
+    """여러 학생의 시간표 비트마스크를 한 번에 조회 (마스크가 없는 학생은 결과에서 빠짐)"""
+    if not student_ids:
+        return {}
+    rows = (
+        db.query(UserTimetableMask.student_id, UserTimetableMask.mask)
+        .filter(UserTimetableMask.student_id.in_(student_ids))
+        .all()
+    )
+    return {sid: mask_from_bytes(mask) for sid, mask in rows}
+
+
+def get_student_ids_with_timetables(db: Session, after_student_id: str = None, limit: int = 500):
+    """시간표가 있는 학번을 학번 순으로 limit개 조회 (after_student_id 다음부터, keyset 페이지네이션)"""
+    query = db.query(TimeTable.student_id).distinct()
+    if after_student_id is not None:
+        query = query.filter(TimeTable.student_id > after_student_id)
+    rows = query.order_by(TimeTable.student_id).limit(limit).all()
+    return [r[0] for r in rows]
+
+
+def get_timetables_for_students(db: Session, student_ids: List[str]) -> Dict[str, List[TimeTable]]:
+    """여러 학생의 시간표를 한 번에 조회해 학번별로 묶어 반환"""
+    grouped = {sid: [] for sid in student_ids}
+    if not student_ids:
+        return grouped
+    rows = db.query(TimeTable).filter(TimeTable.student_id.in_(student_ids)).all()
+    for tt in rows:
+        grouped[tt.student_id].append(tt)
+    return grouped
+
+
 # ---------------------------------------------------------
 # 3. 비교과 프로그램 (Program) 관련 - 위인전 크롤러용
 # ---------------------------------------------------------
 def save_programs(db: Session, program_data: List[Dict]):
-    """전체 비교과 프로그램 목록 갱신"""
+    """
+    전체 비교과 프로그램 목록 갱신
+    item["schedule"]가 없으면 run_time_text를 여기서 파싱해 일정(ProgramSchedule)을 함께 저장한다.
+    """
     # KST 기준 타임스탬프
     now_kst = datetime.utcnow() + timedelta(hours=9)
     try:
         # 전체 삭제 후 재삽입 (단순 동기화 전략)
+        # 벌크 delete는 ORM cascade를 타지 않으므로 일정부터 지운다
+        db.query(ProgramSchedule).delete()
         db.query(Program).delete()
 
         for item in program_data:
@@ -115,6 +236,13 @@ def save_programs(db: Session, program_data: List[Dict]):
                 detail_url=item.get("detail_url"),
                 updated_at=now_kst,
             )
+            schedule = item.get("schedule") or parse_run_period(item.get("run_time_text"))
+            if schedule:
+                mask = schedule_mask(schedule)
+                prog.schedule = ProgramSchedule(
+                    **schedule,
+                    session_mask=mask_to_bytes(mask) if mask is not None else None,
+                )
             db.add(prog)
 
         db.commit()
@@ -130,6 +258,15 @@ def get_all_programs(db: Session):
     return db.query(Program).all()
 
 
+def get_programs_version(db: Session):
+    """
+    프로그램 목록 버전 (최신 updated_at, 행 수)
+    save_programs가 전체를 다시 쓰므로 목록이 갱신되면 이 값이 바뀐다.
+    """
+    latest, count = db.query(func.max(Program.updated_at), func.count(Program.id)).one()
+    return latest, count
+
+
 # ---------------------------------------------------------
 # 4. 추천 결과 (Recommendation) 관련 - Consumer/Gateway용
 # ---------------------------------------------------------
@@ -166,6 +303,44 @@ def save_recommendation(db: Session, student_id: str, results: List[Dict]):
         raise e
 
 
+def save_recommendations_bulk(db: Session, results_by_student: Dict[str, List[Dict]]):
+    """
+    여러 학생의 추천 결과를 한 트랜잭션으로 저장 (기존 행 일괄 조회 후 갱신/추가)
+    """
+    if not results_by_student:
+        return 0
+    now_dt = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(
+        timezone(timedelta(hours=9))
+    ).replace(tzinfo=None)
+    try:
+        existing = {
+            rec.student_id: rec
+            for rec in db.query(Recommendation)
+            .filter(Recommendation.student_id.in_(list(results_by_student)))
+            .all()
+        }
+        for student_id, results in results_by_student.items():
+            rec = existing.get(student_id)
+            if rec:
+                rec.result_json = results
+                rec.updated_at = now_dt
+            else:
+                db.add(
+                    Recommendation(
+                        student_id=student_id,
+                        result_json=results,
+                        created_at=now_dt,
+                        updated_at=now_dt,
+                    )
+                )
+        db.commit()
+        return len(results_by_student)
+    except Exception as e:
+        db.rollback()
+        print(f"[CRUD Error] save_recommendations_bulk: {e}")
+        raise e
+
+
 def get_recommendation(db: Session, student_id: str):
     """학생의 추천 결과 조회(API Gateway)"""
     return (
@@ -1,10 +1,21 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+)
 from sqlalchemy.orm import relationship
 
 # database.py에서 Base를 가져옵니다.
 from .database import Base
+from .timeslots import MASK_BYTES
 
 
 # ---------------------------------------------------------
@@ -27,6 +38,12 @@ class User(Base):
         uselist=False,
         cascade="all, delete-orphan",
     )
+    timetable_mask = relationship(
+        "UserTimetableMask",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     def __repr__(self):
         return f"<User {self.student_id} ({self.name})>"
@@ -49,6 +66,25 @@ class TimeTable(Base):
     user = relationship("User", back_populates="timetables")
 
 
+# ---------------------------------------------------------
+# 2-1. 주간 시간표 비트마스크 (UserTimetableMask)
+# ---------------------------------------------------------
+class UserTimetableMask(Base):
+    """학생 시간표 요약: common.timeslots 형식 비트마스크 + 내용 해시 (save_timetables 때 갱신)"""
+
+    __tablename__ = "user_timetable_masks"
+
+    student_id = Column(
+        String(20), ForeignKey("users.student_id", ondelete="CASCADE"), primary_key=True
+    )
+    mask = Column(LargeBinary(MASK_BYTES), nullable=False)
+    # 정규화한 시간표 내용의 sha256 (같으면 다시 저장/추천하지 않음)
+    timetable_hash = Column(String(64), nullable=True)
+    updated_at = Column(DateTime, default=datetime.now)
+
+    user = relationship("User", back_populates="timetable_mask")
+
+
 # ---------------------------------------------------------
 # 3. 위인전 비교과 프로그램 (Program)
 # ---------------------------------------------------------
@@ -67,10 +103,40 @@ class Program(Base):
     detail_url = Column(String(500))
     updated_at = Column(DateTime, default=datetime.now)
 
+    # 운영 기간을 수집 시점에 파싱해 둔 일정 (파싱 불가면 없음)
+    schedule = relationship(
+        "ProgramSchedule",
+        back_populates="program",
+        uselist=False,
+        lazy="joined",
+        cascade="all, delete-orphan",
+    )
+
     def __repr__(self):
         return f"<Program {self.title} ({self.topic})>"
 
 
+# ---------------------------------------------------------
+# 3-1. 프로그램 운영 일정 (ProgramSchedule)
+# ---------------------------------------------------------
+class ProgramSchedule(Base):
+    __tablename__ = "program_schedules"
+
+    program_id = Column(
+        Integer, ForeignKey("programs.id", ondelete="CASCADE"), primary_key=True
+    )
+    session_date = Column(Date, nullable=False)
+    session_end_date = Column(Date, nullable=False)
+    weekday = Column(Integer, nullable=False)  # 0=월 ~ 6=일 (session_date 기준)
+    start_min = Column(Integer, nullable=False)  # 00:00부터의 분
+    end_min = Column(Integer, nullable=False)
+    multi_day = Column(Boolean, nullable=False, default=False)
+    # common.timeslots 형식 주간 마스크 (multi_day면 없음)
+    session_mask = Column(LargeBinary(MASK_BYTES), nullable=True)
+
+    program = relationship("Program", back_populates="schedule")
+
+
 # ---------------------------------------------------------
 # 4. 추천 결과 (Recommendation)
 # ---------------------------------------------------------
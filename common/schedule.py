@@ -0,0 +1,45 @@
+"""
+위인전 운영 기간(run_period) 문자열 파싱
+프로듀서가 수집 시점에 한 번 파싱해 program_schedules 테이블에 저장하고,
+컨슈머는 저장된 값이 없을 때만 같은 함수로 다시 파싱한다.
+"""
+import re
+from datetime import date
+
+# date.weekday() 순서 (0=월)
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+_DATETIME_PATTERN = re.compile(r"(\d{4})\.(\d{2})\.(\d{2})\s+(\d{1,2}):(\d{2})")
+
+
+def parse_run_period(run_time_text):
+    """
+    운영 기간 문자열 -> 구조화된 일정 dict
+    예: '2025.09.01 14:00 ~ 2025.09.01 16:00'
+        -> {'session_date': date(2025, 9, 1), 'session_end_date': date(2025, 9, 1),
+            'weekday': 0, 'start_min': 840, 'end_min': 960, 'multi_day': False}
+    시작/종료 일시를 모두 찾지 못하면 None
+    """
+    if not run_time_text:
+        return None
+
+    matches = _DATETIME_PATTERN.findall(run_time_text)
+    if len(matches) < 2:
+        return None
+
+    try:
+        (start_date, start_min), (end_date, end_min) = (
+            (date(int(y), int(mo), int(d)), int(h) * 60 + int(mi)) for y, mo, d, h, mi in matches[:2]
+        )
+    except ValueError as e:
+        print(f" [Error] 날짜 파싱 실패 ({run_time_text}): {e}")
+        return None
+
+    return {
+        "session_date": start_date,
+        "session_end_date": end_date,
+        "weekday": start_date.weekday(),
+        "start_min": start_min,
+        "end_min": end_min,
+        "multi_day": start_date != end_date,
+    }
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from common import crud, models
+from common.database import Base
+from common.timeslots import timetable_mask
+
+TIMETABLE = [
+    {"day": "월", "start_time": "09:00", "end_time": "10:15", "subject_name": "자료구조", "classroom": "공학관 101"},
+    {"day": "수", "start_time": "13:00", "end_time": "14:15", "subject_name": "글쓰기", "classroom": ""},
+]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(models.User(student_id="202011111", name="테스트", password_hash="x"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_unchanged_timetable_is_skipped_and_mask_is_stored(db):
+    assert crud.save_timetables(db, "202011111", TIMETABLE, skip_if_unchanged=True) is True
+    # 항목 순서가 달라도 같은 시간표
+    assert crud.save_timetables(db, "202011111", list(reversed(TIMETABLE)), skip_if_unchanged=True) is False
+
+    assert crud.get_timetable_mask(db, "202011111") == timetable_mask(TIMETABLE)
+    changed = TIMETABLE[:1]
+    assert crud.save_timetables(db, "202011111", changed, skip_if_unchanged=True) is True
+    assert len(crud.get_timetables(db, "202011111")) == 1
+
+
+def test_hash_recorded_only_after_follow_up_succeeds(db):
+    # 해시 없이 저장(추천 재계산 요청 전) -> 같은 내용으로 다시 동기화해도 건너뛰지 않는다
+    assert crud.save_timetables(db, "202011111", TIMETABLE, skip_if_unchanged=True, record_hash=False) is True
+    assert crud.save_timetables(db, "202011111", TIMETABLE, skip_if_unchanged=True, record_hash=False) is True
+
+    assert crud.set_timetable_hash(db, "202011111", TIMETABLE)
+    assert crud.save_timetables(db, "202011111", TIMETABLE, skip_if_unchanged=True, record_hash=False) is False
+
+
+def test_touch_last_synced_updates_only_sync_time(db):
+    assert crud.save_timetables(db, "202011111", TIMETABLE) is True
+    before = crud.get_user_by_id(db, "202011111").last_synced_at
+
+    assert crud.touch_last_synced(db, "202011111") is True
+    assert crud.get_user_by_id(db, "202011111").last_synced_at >= before
+    assert len(crud.get_timetables(db, "202011111")) == len(TIMETABLE)
+    assert crud.touch_last_synced(db, "없는학번") is False
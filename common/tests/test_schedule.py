@@ -0,0 +1,65 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from common import crud, models
+from common.database import Base
+from common.schedule import parse_run_period
+from common.timeslots import mask_from_bytes, range_mask
+
+
+def test_parse_run_period_same_day():
+    assert parse_run_period("운영 : 2025.09.01 14:00 ~ 2025.09.01 16:30") == {
+        "session_date": date(2025, 9, 1),
+        "session_end_date": date(2025, 9, 1),
+        "weekday": 0,
+        "start_min": 840,
+        "end_min": 990,
+        "multi_day": False,
+    }
+
+
+def test_parse_run_period_multi_day_and_invalid_inputs():
+    schedule = parse_run_period("2025.09.05 9:00 ~ 2025.09.06 18:00")
+    assert schedule["weekday"] == 4 and schedule["start_min"] == 540 and schedule["multi_day"] is True
+
+    assert parse_run_period(None) is None
+    assert parse_run_period("운영 : 상시") is None
+    assert parse_run_period("2025.09.01 14:00") is None  # 종료 일시 없음
+    assert parse_run_period("2025.02.30 14:00 ~ 2025.02.30 16:00") is None  # 없는 날짜
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_save_programs_stores_parsed_schedule(db):
+    crud.save_programs(
+        db,
+        [
+            {"title": "특강", "run_time_text": "운영 : 2025.09.02 10:00 ~ 2025.09.02 12:00",
+             "apply_end": datetime(2025, 9, 1)},
+            {"title": "캠프", "run_time_text": "2025.09.05 09:00 ~ 2025.09.06 18:00"},
+            {"title": "상시", "run_time_text": "운영 : 상시"},
+        ],
+    )
+
+    programs = {p.title: p for p in crud.get_all_programs(db)}
+    lecture = programs["특강"].schedule
+    assert (lecture.session_date, lecture.weekday, lecture.start_min, lecture.end_min) == (date(2025, 9, 2), 1, 600, 720)
+    assert mask_from_bytes(lecture.session_mask) == range_mask(1, 600, 720)
+
+    camp = programs["캠프"].schedule
+    assert camp.multi_day is True and camp.session_mask is None
+    assert programs["상시"].schedule is None
+
+    # 전체 재저장 시 이전 일정도 함께 지워진다
+    crud.save_programs(db, [{"title": "특강", "run_time_text": "2025.09.03 10:00 ~ 2025.09.03 11:00"}])
+    assert db.query(models.ProgramSchedule).count() == 1
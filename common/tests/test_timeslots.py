@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+from common.timeslots import (
+    MASK_BITS,
+    MASK_BYTES,
+    SLOTS_PER_DAY,
+    mask_from_bytes,
+    mask_to_bytes,
+    overlaps,
+    range_mask,
+    schedule_mask,
+    slot_range,
+    timetable_mask,
+)
+
+
+def test_slot_range_rounds_partial_slots_outward():
+    assert slot_range(0, 600, 720) == (120, 144)
+    # 10:02 ~ 10:58 -> 10:00 ~ 11:00 슬롯 전체
+    assert slot_range(0, 602, 658) == (120, 132)
+    assert slot_range(2, 0, 24 * 60) == (2 * SLOTS_PER_DAY, 3 * SLOTS_PER_DAY)
+    assert slot_range(6, 23 * 60, 23 * 60 + 59)[1] == MASK_BITS
+    assert slot_range(0, 600, 600) is None
+    assert slot_range(None, 600, 720) is None
+    assert slot_range(7, 600, 720) is None
+
+
+def test_adjacent_ranges_do_not_overlap_but_shared_slots_do():
+    morning = range_mask(0, 9 * 60, 10 * 60 + 15)
+    assert not overlaps(morning, range_mask(0, 10 * 60 + 15, 12 * 60))
+    assert overlaps(morning, range_mask(0, 10 * 60 + 14, 12 * 60))
+    assert not overlaps(morning, range_mask(1, 9 * 60, 10 * 60 + 15))  # 다른 요일
+    assert range_mask(0, 600, 600) == 0
+
+
+def test_timetable_mask_accepts_dicts_and_objects_and_skips_bad_entries():
+    entries = [
+        {"day": "월", "start_time": "09:00", "end_time": "10:15"},
+        SimpleNamespace(day="수", start_time="13:00", end_time="14:15"),
+        {"day": "월", "start_time": "", "end_time": "10:00"},
+        {"day": "토요일", "start_time": "09:00", "end_time": "10:00"},
+    ]
+    assert timetable_mask(entries) == range_mask(0, 540, 615) | range_mask(2, 780, 855)
+    assert timetable_mask([]) == 0
+
+
+def test_schedule_mask_and_bytes_round_trip():
+    schedule = {"weekday": 4, "start_min": 840, "end_min": 960, "multi_day": False}
+    mask = schedule_mask(schedule)
+    assert mask == range_mask(4, 840, 960)
+    assert schedule_mask({**schedule, "multi_day": True}) is None
+    assert schedule_mask(None) is None
+
+    data = mask_to_bytes(mask)
+    assert len(data) == MASK_BYTES
+    assert mask_from_bytes(data) == mask
+    assert mask_from_bytes(None) is None
+    full = (1 << MASK_BITS) - 1
+    assert mask_from_bytes(mask_to_bytes(full)) == full
@@ -0,0 +1,92 @@
+"""
+주간 시간 슬롯 비트마스크
+한 주를 SLOT_MINUTES 단위 슬롯(7일 × 288칸 = 2016비트)으로 나누고,
+수업/프로그램이 차지하는 슬롯의 비트를 1로 세운 파이썬 int로 표현한다.
+  bit index = weekday * SLOTS_PER_DAY + (분 // SLOT_MINUTES)   (weekday 0=월)
+두 일정이 겹치는지는 (mask_a & mask_b) != 0 한 번으로 판단한다.
+DB에는 MASK_BYTES 길이의 little-endian bytes로 저장한다.
+"""
+from .schedule import WEEKDAYS
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+MASK_BITS = 7 * SLOTS_PER_DAY
+MASK_BYTES = (MASK_BITS + 7) // 8
+
+_DAY_INDEX = {day: idx for idx, day in enumerate(WEEKDAYS)}
+
+
+def _parse_minutes(time_str):
+    """'14:00' -> 840, 파싱 실패 시 None"""
+    try:
+        h, m = map(int, time_str.split(":"))
+        return h * 60 + m
+    except Exception:
+        return None
+
+
+def slot_range(weekday, start_min, end_min):
+    """
+    weekday(0=월)의 [start_min, end_min) 구간이 걸치는 슬롯 비트 범위 [first, last)
+    슬롯 일부만 걸쳐도 해당 슬롯 전체를 차지한 것으로 본다. 빈 구간이면 None
+    """
+    if weekday is None or not 0 <= weekday < 7:
+        return None
+    start_min = max(0, start_min)
+    end_min = min(24 * 60, end_min)
+    if end_min <= start_min:
+        return None
+    base = weekday * SLOTS_PER_DAY
+    return base + start_min // SLOT_MINUTES, base - (-end_min // SLOT_MINUTES)  # 종료는 올림
+
+
+def range_mask(weekday, start_min, end_min):
+    """weekday(0=월)의 [start_min, end_min) 구간 마스크 (slot_range 범위의 비트를 세움)"""
+    bits = slot_range(weekday, start_min, end_min)
+    if bits is None:
+        return 0
+    first, last = bits
+    return ((1 << (last - first)) - 1) << first
+
+
+def timetable_mask(entries):
+    """
+    시간표 항목들(dict 또는 TimeTable 객체: day, start_time, end_time)의 합집합 마스크
+    요일/시각을 해석할 수 없는 항목은 건너뛴다.
+    """
+    mask = 0
+    for entry in entries:
+        if isinstance(entry, dict):
+            day, start, end = entry.get("day"), entry.get("start_time"), entry.get("end_time")
+        else:
+            day, start, end = entry.day, entry.start_time, entry.end_time
+        start_min = _parse_minutes(start or "")
+        end_min = _parse_minutes(end or "")
+        if start_min is None or end_min is None:
+            continue
+        mask |= range_mask(_DAY_INDEX.get(day), start_min, end_min)
+    return mask
+
+
+def schedule_mask(schedule):
+    """
+    구조화된 프로그램 일정(parse_run_period 결과 dict) -> 마스크
+    여러 날에 걸친 일정은 주간 마스크로 표현하지 않으므로 None
+    """
+    if not schedule or schedule["multi_day"]:
+        return None
+    return range_mask(schedule["weekday"], schedule["start_min"], schedule["end_min"])
+
+
+def mask_to_bytes(mask):
+    return mask.to_bytes(MASK_BYTES, "little")
+
+
+def mask_from_bytes(data):
+    if data is None:
+        return None
+    return int.from_bytes(data, "little")
+
+
+def overlaps(mask_a, mask_b):
+    return bool(mask_a & mask_b)
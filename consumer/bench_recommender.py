@@ -0,0 +1,95 @@
+"""
+추천 계산 벤치마크: generate_recommendations(학생별 루프) vs BatchRecommender(배치)
+사용법: python bench_recommender.py [--programs 1000] [--students 10000] [--loop-sample 500]
+학생별 루프는 --loop-sample명만 실행해 전체 학생 수로 환산하고, 같은 학생들로 결과가 동일한지 확인한다.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from common.timeslots import timetable_mask
+from domain import BatchRecommender, generate_recommendations, minutes_to_str, parse_program_session, session_mask
+
+DAYS = ["월", "화", "수", "목", "금"]
+TOPICS = ["진로", "봉사", "창업", "학습", "글로벌", None]
+
+
+def make_programs(count, now, rng):
+    programs = []
+    for i in range(count):
+        date = now.date() + timedelta(days=rng.randint(0, 60))
+        start = rng.randrange(9 * 60, 20 * 60, 10)
+        end = start + rng.choice([50, 60, 90, 120])
+        end_date = date + timedelta(days=1) if rng.random() < 0.1 else date
+        deadline = now + timedelta(days=rng.randint(-10, 40), hours=rng.randint(0, 23))
+        run_time_text = f"{date:%Y.%m.%d} {minutes_to_str(start)} ~ {end_date:%Y.%m.%d} {minutes_to_str(end)}"
+        session = parse_program_session(run_time_text)
+        # 카탈로그 스냅샷(ProgramSnapshot)처럼 일정/마스크를 미리 계산해 둔다
+        programs.append(
+            SimpleNamespace(
+                title=f"프로그램 {i}",
+                topic=rng.choice(TOPICS),
+                apply_end=deadline if rng.random() < 0.9 else None,
+                run_time_text=run_time_text,
+                session=session,
+                mask=session_mask(session),
+            )
+        )
+    return programs
+
+
+def make_timetable(rng):
+    classes = []
+    for _ in range(rng.randint(4, 10)):
+        start = rng.choice(range(9 * 60, 18 * 60, 30))
+        end = start + rng.choice([50, 75, 110, 170])
+        classes.append(
+            SimpleNamespace(
+                day=rng.choice(DAYS),
+                start_time=minutes_to_str(start),
+                end_time=minutes_to_str(end - 2),
+                subject_name="수업",
+            )
+        )
+    return classes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--programs", type=int, default=1000)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--loop-sample", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime(2025, 9, 1, 12, 0)
+    programs = make_programs(args.programs, now, rng)
+    timetables = [make_timetable(rng) for _ in range(args.students)]
+    masks = [timetable_mask(tt) for tt in timetables]
+    sample = min(args.loop_sample, args.students)
+
+    started = time.perf_counter()
+    loop_results = [
+        generate_recommendations(programs, timetables[i], now=now, user_mask=masks[i]) for i in range(sample)
+    ]
+    loop_sec = (time.perf_counter() - started) * args.students / sample
+
+    started = time.perf_counter()
+    recommender = BatchRecommender(programs)
+    build_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    batch_results = recommender.recommend(masks, now=now)
+    batch_sec = time.perf_counter() - started
+
+    assert batch_results[:sample] == loop_results, "배치 결과가 학생별 루프 결과와 다릅니다"
+    print(f"programs={args.programs} students={args.students}")
+    print(f"  loop  : {loop_sec:8.2f}s (학생 {sample}명 실측 후 환산)")
+    print(f"  batch : {batch_sec:8.2f}s (+ 카탈로그 배열 생성 {build_sec:.3f}s)")
+    print(f"  speedup x{loop_sec / (batch_sec + build_sec):.1f}")
+
+
+if __name__ == "__main__":
+    main()
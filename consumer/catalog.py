@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+
+from common.timeslots import mask_from_bytes
+from domain import parse_program_session, session_from_schedule, session_mask
+from repository import get_all_programs, get_programs_version
+
+# DB의 프로그램 버전(updated_at)을 다시 확인하는 최소 간격(초)
+CATALOG_CHECK_INTERVAL_SEC = int(os.getenv("CATALOG_CHECK_INTERVAL_SEC", "60"))
+
+
+class ProgramSnapshot:
+    """DB 세션과 분리된 프로그램 정보 + 일정(session: (요일, 시작 분, 종료 분) 또는 None)"""
+
+    __slots__ = ("id", "title", "topic", "apply_start", "apply_end", "run_time_text", "session", "mask")
+
+    def __init__(self, program):
+        self.id = program.id
+        self.title = program.title
+        self.topic = program.topic
+        self.apply_start = program.apply_start
+        self.apply_end = program.apply_end
+        self.run_time_text = program.run_time_text
+        # 프로듀서가 저장한 일정을 우선 사용하고, 없을 때(이전 데이터)만 문자열을 파싱
+        schedule = getattr(program, "schedule", None)
+        if schedule is not None:
+            self.session = session_from_schedule(schedule)
+        else:
+            self.session = parse_program_session(program.run_time_text)
+        # 주간 슬롯 마스크: 저장된 값이 있으면 사용, 없으면 session으로 계산
+        stored = mask_from_bytes(getattr(schedule, "session_mask", None))
+        self.mask = stored if stored is not None else session_mask(self.session)
+
+
+class ProgramCatalog:
+    """
+    추천 계산용 프로그램 목록 캐시.
+    - 프로듀서의 CRAWLING_COMPLETE 이벤트(wein_updates_done)를 받으면 invalidate() 후 다시 읽는다.
+    - 이벤트는 컨슈머 프로세스 중 하나에만 전달되므로, 나머지 프로세스를 위해
+      CATALOG_CHECK_INTERVAL_SEC마다 (최신 updated_at, 행 수)를 확인해 바뀌었을 때만 다시 읽는다.
+    스냅샷은 통째로 교체되므로 읽는 쪽은 잠금 없이 programs() 결과를 그대로 쓰면 된다.
+    """
+
+    def __init__(self, loader=get_all_programs, version_reader=get_programs_version, check_interval=None):
+        self._loader = loader
+        self._version_reader = version_reader
+        self.check_interval = CATALOG_CHECK_INTERVAL_SEC if check_interval is None else check_interval
+        self._lock = threading.Lock()
+        self._programs = ()
+        self._stale = True
+        self._checked_at = 0.0
+        self.version = None
+        self.generation = 0  # 스냅샷 교체 횟수
+
+    def invalidate(self):
+        self._stale = True
+
+    def _needs_check(self, now):
+        return self._stale or now - self._checked_at >= self.check_interval
+
+    def programs(self):
+        """현재 프로그램 스냅샷 (tuple of ProgramSnapshot)"""
+        if self._needs_check(time.monotonic()):
+            self._refresh()
+        return self._programs
+
+    def _refresh(self):
+        with self._lock:
+            now = time.monotonic()
+            if not self._needs_check(now):
+                return  # 다른 스레드가 먼저 갱신함
+            forced = self._stale
+            # 읽는 도중 들어온 invalidate()가 유실되지 않도록 먼저 내린다
+            self._stale = False
+            self._checked_at = now
+            version = self._version_reader()
+            if not forced and version == self.version:
+                return
+
+            snapshot = tuple(ProgramSnapshot(p) for p in self._loader())
+            self._programs = snapshot
+            self.version = version
+            self.generation += 1
+            print(f" [catalog] 프로그램 {len(snapshot)}건 로드 (generation={self.generation}, version={version})")
+
+
+program_catalog = ProgramCatalog()
@@ -1,5 +1,17 @@
-import re
+import os
 from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from common.schedule import WEEKDAYS, parse_run_period
+from common.timeslots import MASK_BITS, MASK_BYTES, mask_to_bytes, overlaps, range_mask, slot_range, timetable_mask
+
+# BatchRecommender가 한 번에 계산하는 학생 수 (충돌 행렬 메모리 = 학생 수 × 프로그램 수 바이트)
+RECOMMEND_CHUNK_SIZE = int(os.getenv("RECOMMEND_CHUNK_SIZE", "2048"))
+
+# 추천할 프로그램이 하나도 없을 때 저장하는 항목
+NO_RECOMMENDATION = {"title": "현재 신청 가능한 공강 프로그램이 없습니다.", "category": "-", "status": ""}
 
 # 시간대 보정과 종료 트림을 사용하지 않는다 (에브리타임 공유표는 이미 현지 시각)
 TIME_OFFSET_MIN = 0
@@ -22,8 +34,7 @@ def parse_time_str(time_str):
 
 def get_korean_weekday(date_obj):
     """날짜 객체 -> '월', '화'"""
-    days = ["월", "화", "수", "목", "금", "토", "일"]
-    return days[date_obj.weekday()]
+    return WEEKDAYS[date_obj.weekday()]
 
 
 def minutes_to_str(minutes: int) -> str:
@@ -48,59 +59,110 @@ def adjust_time_range(start_str: str, end_str: str):
     return minutes_to_str(start_adj), minutes_to_str(end_adj)
 
 
-def check_conflict(program, user_timetable):
-    """프로그램 일정과 사용자 시간표가 겹치는지 검사"""
-    if not program.run_time_text:
-        return False
+def session_from_schedule(schedule):
+    """
+    구조화된 일정(ProgramSchedule 또는 parse_run_period 결과 dict) -> (요일, 시작 분, 종료 분)
+    하루 안에 끝나지 않는 일정은 None
+    """
+    if schedule is None:
+        return None
+    if isinstance(schedule, dict):
+        schedule = SimpleNamespace(**schedule)
+    if schedule.multi_day:
+        return None
+    return WEEKDAYS[schedule.weekday], schedule.start_min, schedule.end_min
+
+
+def parse_program_session(run_time_text):
+    """
+    운영 기간 문자열 -> (요일, 시작 분, 종료 분)
+    예: '2025.09.01 14:00 ~ 2025.09.01 16:00' -> ('월', 840, 960)
+    하루 안에 끝나지 않거나 파싱할 수 없으면 None
+    저장된 일정(program.schedule)이 없는 이전 데이터용 폴백.
+    """
+    return session_from_schedule(parse_run_period(run_time_text))
+
+
+def program_session(program):
+    """
+    프로그램 일정 (요일, 시작 분, 종료 분) 또는 None
+    program.session(미리 파싱한 일정) -> program.schedule(DB에 저장된 일정) -> run_time_text 파싱 순으로 사용한다.
+    """
+    if hasattr(program, "session"):
+        return program.session
+    if getattr(program, "schedule", None) is not None:
+        return session_from_schedule(program.schedule)
+    return parse_program_session(program.run_time_text)
+
+
+def session_mask(session):
+    """(요일, 시작 분, 종료 분) -> 주간 슬롯 마스크, session이 None이면 None"""
+    if session is None:
+        return None
+    day, start_min, end_min = session
+    return range_mask(WEEKDAYS.index(day), start_min, end_min)
 
-    text = program.run_time_text
-    pattern = r"(\d{4}\.\d{2}\.\d{2})\s+(\d{1,2}:\d{2})"
-    matches = re.findall(pattern, text)
-    if len(matches) < 2:
-        return False
 
-    start_date_str, start_time_str = matches[0]
-    end_date_str, end_time_str = matches[1]
+def program_mask(program):
+    """프로그램 일정의 주간 슬롯 마스크 (일정이 없거나 여러 날이면 None)"""
+    if hasattr(program, "mask"):
+        return program.mask
+    return session_mask(program_session(program))
 
-    try:
-        start_dt = datetime.strptime(start_date_str, "%Y.%m.%d")
-        end_dt = datetime.strptime(end_date_str, "%Y.%m.%d")
-        if start_dt.date() != end_dt.date():
-            return False
-
-        target_day = get_korean_weekday(start_dt)
-        prog_start_min = parse_time_str(start_time_str)
-        prog_end_min = parse_time_str(end_time_str)
-        if prog_start_min is None or prog_end_min is None:
-            return False
-
-        for tt in user_timetable:
-            if tt.day == target_day:
-                class_start = parse_time_str(tt.start_time)
-                class_end = parse_time_str(tt.end_time)
-                if class_start and class_end:
-                    if is_time_overlap(
-                        prog_start_min, prog_end_min, class_start, class_end
-                    ):
-                        print(
-                            f" [Conflict] '{program.title}'({target_day} {start_time_str}) 겹침 -> 수업: {tt.subject_name}"
-                        )
-                        return True
-    except Exception as e:
-        print(f" [Error] 날짜 파싱 실패 ({text}): {e}")
+
+def check_conflict(program, user_timetable, user_mask=None):
+    """
+    프로그램 일정과 사용자 시간표가 겹치는지 검사
+    user_mask(시간표 비트마스크)가 주어지면 AND 한 번으로 판단하고,
+    없으면 시간표 항목을 하나씩 비교한다.
+    """
+    if user_mask is not None:
+        mask = program_mask(program)
+        return mask is not None and overlaps(mask, user_mask)
+
+    session = program_session(program)
+    if session is None:
         return False
 
+    target_day, prog_start_min, prog_end_min = session
+    for tt in user_timetable:
+        if tt.day == target_day:
+            class_start = parse_time_str(tt.start_time)
+            class_end = parse_time_str(tt.end_time)
+            if class_start and class_end:
+                if is_time_overlap(
+                    prog_start_min, prog_end_min, class_start, class_end
+                ):
+                    print(
+                        f" [Conflict] '{program.title}'({target_day} {minutes_to_str(prog_start_min)}) 겹침 -> 수업: {tt.subject_name}"
+                    )
+                    return True
+
     return False
 
 
-def generate_recommendations(programs, user_timetable, now=None):
-    """추천 결과 생성 (충돌 제거 + 마감 임박 정렬)"""
+def deadline_status(days_left):
+    """마감까지 남은 일수 -> 상태 문구"""
+    if days_left <= 3:
+        return f"마감임박 ⏰ (D-{days_left})"
+    if days_left <= 7:
+        return f"서두르세요 🏃 (D-{days_left})"
+    return f"접수중 (D-{days_left})"
+
+
+def generate_recommendations(programs, user_timetable, now=None, user_mask=None):
+    """
+    추천 결과 생성 (충돌 제거 + 마감 임박 정렬)
+    user_mask가 없으면 user_timetable로 한 번 만들어 모든 프로그램 검사에 재사용한다.
+    """
     recommendations = []
     now = now or datetime.now()
+    if user_mask is None:
+        user_mask = timetable_mask(user_timetable or [])
 
     candidates = []
     for prog in programs:
-        if check_conflict(prog, user_timetable):
+        if check_conflict(prog, user_timetable, user_mask):
             continue
 
         deadline = prog.apply_end
@@ -111,13 +173,7 @@ def generate_recommendations(programs, user_timetable, now=None):
             if deadline < now:
                 continue
 
-            days_left = (deadline - now).days
-            if days_left <= 3:
-                status_text = f"마감임박 ⏰ (D-{days_left})"
-            elif days_left <= 7:
-                status_text = f"서두르세요 🏃 (D-{days_left})"
-            else:
-                status_text = f"접수중 (D-{days_left})"
+            status_text = deadline_status((deadline - now).days)
 
         candidates.append(
             {
@@ -140,8 +196,100 @@ def generate_recommendations(programs, user_timetable, now=None):
         )
 
     if not recommendations:
-        recommendations.append(
-            {"title": "현재 신청 가능한 공강 프로그램이 없습니다.", "category": "-", "status": ""}
-        )
+        recommendations.append(dict(NO_RECOMMENDATION))
 
     return recommendations
+
+
+_NO_DEADLINE = datetime(9999, 12, 31)
+_EPOCH = datetime(1970, 1, 1)
+
+
+class BatchRecommender:
+    """
+    프로그램 카탈로그를 배열로 들고 여러 학생의 추천을 한 번에 계산 (generate_recommendations와 같은 결과)
+    - 프로그램: 슬롯 범위 [first, last), 마감 시각(epoch 초, 없으면 NaN), 분야 코드
+    - 학생: 시간표 비트마스크를 (학생 수, MASK_BITS) 점유 배열로 풀고 누적합을 구해
+      conflict[s, p] = prefix[s, last_p] - prefix[s, first_p] > 0 으로 모든 쌍을 한 번에 판정
+    마감/D-day는 학생과 무관하므로 프로그램별로 한 번만 계산하고,
+    마감순 정렬도 미리 해 두어 학생별로는 충돌하지 않은 항목만 골라낸다.
+    결과 dict는 같은 호출 안에서 학생 간에 공유되므로 수정하지 말 것.
+    """
+
+    def __init__(self, programs, chunk_size=None):
+        self.chunk_size = chunk_size or RECOMMEND_CHUNK_SIZE
+        # 마감순 안정 정렬 (generate_recommendations의 candidates.sort와 같은 순서)
+        programs = sorted(programs, key=lambda p: p.apply_end or _NO_DEADLINE)
+        self.size = len(programs)
+
+        self.titles = [p.title for p in programs]
+        self.categories = []
+        category_index = {}
+        codes = []
+        first = np.zeros(self.size, dtype=np.int32)
+        last = np.zeros(self.size, dtype=np.int32)
+        deadline = np.full(self.size, np.nan)
+        for i, prog in enumerate(programs):
+            category = prog.topic or "일반"
+            if category not in category_index:
+                category_index[category] = len(self.categories)
+                self.categories.append(category)
+            codes.append(category_index[category])
+
+            session = program_session(prog)
+            bits = slot_range(WEEKDAYS.index(session[0]), session[1], session[2]) if session else None
+            if bits:
+                first[i], last[i] = bits  # 일정이 없으면 [0, 0) → 충돌 없음
+            if prog.apply_end:
+                deadline[i] = (prog.apply_end - _EPOCH).total_seconds()
+
+        self.first = first
+        self.last = last
+        self.deadline = deadline
+        self.category_codes = np.array(codes, dtype=np.int32)
+
+    def _items(self, now):
+        """프로그램별 추천 항목(dict 또는 마감 지남 None)을 정렬 순서대로"""
+        now_sec = (now - _EPOCH).total_seconds()
+        has_deadline = ~np.isnan(self.deadline)
+        remaining = np.where(has_deadline, self.deadline - now_sec, 0.0)
+        expired = has_deadline & (remaining < 0)
+        days_left = np.floor_divide(remaining, 86400).astype(np.int64)
+
+        items = []
+        for i in range(self.size):
+            if expired[i]:
+                items.append(None)
+                continue
+            status = deadline_status(int(days_left[i])) if has_deadline[i] else "추천 (공강)"
+            items.append(
+                {
+                    "title": self.titles[i],
+                    "category": self.categories[self.category_codes[i]],
+                    "status": status,
+                }
+            )
+        return items, ~expired
+
+    def conflicts(self, user_masks):
+        """(학생 수, 프로그램 수) bool 충돌 행렬"""
+        packed = np.frombuffer(
+            b"".join(mask_to_bytes(m or 0) for m in user_masks), dtype=np.uint8
+        ).reshape(len(user_masks), MASK_BYTES)
+        occupied = np.unpackbits(packed, axis=1, bitorder="little")[:, :MASK_BITS]
+        prefix = np.zeros((len(user_masks), MASK_BITS + 1), dtype=np.int16)
+        np.cumsum(occupied, axis=1, out=prefix[:, 1:])
+        return prefix[:, self.last] > prefix[:, self.first]
+
+    def recommend(self, user_masks, now=None):
+        """학생별 시간표 마스크 리스트 -> 학생별 추천 결과 리스트 (result_json 형식)"""
+        now = now or datetime.now()
+        items, open_ = self._items(now)
+        results = []
+        for start in range(0, len(user_masks), self.chunk_size):
+            chunk = user_masks[start:start + self.chunk_size]
+            available = open_ & ~self.conflicts(chunk)
+            for row in available:
+                recs = [items[i] for i in np.flatnonzero(row).tolist()]
+                results.append(recs or [dict(NO_RECOMMENDATION)])
+        return results
@@ -1,16 +1,29 @@
-import json
 import os
+import threading
+import time
 from datetime import datetime
 
+import metrics
+from broker.codec import decode
+from catalog import program_catalog
+from common.concurrency import EVERYTIME_WORKERS
 from domain import adjust_time_range, generate_recommendations
 from messaging import publish
+from recompute import recompute_all
 from repository import (
-    get_all_programs,
+    get_timetable_mask,
     get_timetables,
+    mark_timetable_synced,
     save_recommendation,
     save_timetables,
+    touch_last_synced,
+)
+from schemas import (
+    CRAWL_DONE_SCHEMA,
+    EVERYTIME_SCHEMA,
+    PROGRAMS_UPDATED_SCHEMA,
+    validate_message,
 )
-from schemas import CRAWL_DONE_SCHEMA, EVERYTIME_SCHEMA, validate_message
 
 try:
     import everytime_crawler
@@ -20,10 +33,66 @@ except ImportError:
 EVERYTIME_URL_DEFAULT = os.getenv("EVERYTIME_URL")
 CRAWL_DONE_QUEUE = os.getenv("CRAWL_DONE_QUEUE", "crawl_done")
 
+# 동시에 띄울 수 있는 headless Chrome 수 (워커 수보다 작게 두면 메모리 사용량 상한이 됨)
+EVERYTIME_MAX_BROWSERS = int(os.getenv("EVERYTIME_MAX_BROWSERS", str(EVERYTIME_WORKERS)))
+_browser_slots = threading.BoundedSemaphore(max(1, EVERYTIME_MAX_BROWSERS))
+
+# 같은 학생/URL 크롤링이 성공한 뒤 이 시간(초) 안에 들어온 요청은 크롤링하지 않고 버림 (0이면 끄기)
+# (큐에 쌓인 중복 요청이 하나씩 차례로 처리되며 매번 크롤링하는 것을 막는다)
+EVERYTIME_DEDUP_SEC = float(os.getenv("EVERYTIME_DEDUP_SEC", "60"))
+
+# _claim_sync 결과
+SYNC_CLAIMED = "claimed"
+SYNC_INFLIGHT = "inflight"  # 같은 요청이 지금 처리 중
+SYNC_RECENT = "recent"      # EVERYTIME_DEDUP_SEC 안에 같은 요청이 크롤링에 성공함
+
+# 지금 처리 중인 (studentId, timetableUrl) / 마지막으로 크롤링에 성공해 끝난 시각(monotonic)
+_inflight_syncs = set()
+_synced_at = {}
+_syncs_lock = threading.Lock()
+
+
+def _claim_sync(key) -> str:
+    """처리 권한 획득. 같은 요청이 처리 중이거나 창 안에 이미 끝났으면 SYNC_INFLIGHT/SYNC_RECENT"""
+    now = time.monotonic()
+    with _syncs_lock:
+        if key in _inflight_syncs:
+            return SYNC_INFLIGHT
+        finished = _synced_at.get(key)
+        if finished is not None and now - finished < EVERYTIME_DEDUP_SEC:
+            return SYNC_RECENT
+        _inflight_syncs.add(key)
+        return SYNC_CLAIMED
+
+
+def _release_sync(key, succeeded: bool):
+    """처리가 끝나면 처리 중 표시 제거. 성공한 크롤링만 종료 시각을 남긴다 (실패하면 다음 요청은 바로 크롤링)"""
+    now = time.monotonic()
+    with _syncs_lock:
+        _inflight_syncs.discard(key)
+        if not succeeded:
+            return
+        if len(_synced_at) > 1024:
+            expired = [k for k, t in _synced_at.items() if now - t >= EVERYTIME_DEDUP_SEC]
+            for k in expired:
+                del _synced_at[k]
+        _synced_at[key] = now
+
+
+def _touch_last_synced(student_id):
+    """시간표 저장 없이 끝난 동기화도 게이트웨이의 대기 표시가 풀리도록 last_synced_at 갱신"""
+    try:
+        touch_last_synced(student_id)
+    except Exception as e:
+        print(f" [Warn] last_synced_at 갱신 실패 (게이트웨이는 TTL 후 재요청 허용): {e}")
+
 
 def handle_everytime(ch, method, properties, body):
+    sync_key = None
+    succeeded = False
     try:
-        msg = json.loads(body.decode("utf-8"))
+        # content_type 헤더에 맞춰 디코딩 (헤더 없으면 JSON)
+        msg = decode(body, properties)
         if not validate_message(msg, EVERYTIME_SCHEMA):
             raise ValueError("invalid payload")
 
@@ -31,9 +100,23 @@ def handle_everytime(ch, method, properties, body):
         timetable_url = msg.get("timetableUrl") or EVERYTIME_URL_DEFAULT
         print(f" [everytime] sync 요청 수신: {student_id}")
 
+        claim = _claim_sync((student_id, timetable_url))
+        if claim == SYNC_INFLIGHT:
+            # 처리 중인 쪽이 끝나면서 last_synced_at을 갱신한다
+            print(f" [everytime] 같은 요청 처리 중 -> 건너뜀: {student_id}")
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+        if claim == SYNC_RECENT:
+            print(f" [everytime] {EVERYTIME_DEDUP_SEC:g}초 내 중복 요청 -> 건너뜀: {student_id}")
+            _touch_last_synced(student_id)
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+        sync_key = (student_id, timetable_url)
+
         raw_tt = []
         if everytime_crawler:
-            raw_tt = everytime_crawler.crawl_shared_timetable(timetable_url)
+            with _browser_slots:
+                raw_tt = everytime_crawler.crawl_shared_timetable(timetable_url)
 
         timetable = []
         for item in raw_tt:
@@ -50,34 +133,95 @@ def handle_everytime(ch, method, properties, body):
                 }
             )
 
-        save_timetables(student_id, timetable)
+        changed = save_timetables(student_id, timetable)
+        if changed is False:
+            # 지난 동기화와 같은 시간표: 동기화 시각만 갱신하고 추천 재계산은 생략
+            metrics.incr("timetable_hash.hit")
+            print(f" [everytime] 시간표 변경 없음 -> 추천 재계산 생략: {student_id}")
+            succeeded = True
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+        metrics.incr("timetable_hash.miss")
         print(f" [everytime] 저장 완료: {len(timetable)}건")
 
-        publish(CRAWL_DONE_QUEUE, {"type": "crawl_done", "studentId": student_id})
+        # 추천 계산도 요청이 들어온 레인(대화형/배치)을 그대로 따른다
+        done = {"type": "crawl_done", "studentId": student_id}
+        lane = msg.get("lane")
+        if lane:
+            done["lane"] = lane
+        publish(CRAWL_DONE_QUEUE, done, lane=lane)
+        if changed:
+            # 재계산 요청이 나간 뒤에만 해시를 기록해야 발행 실패 시 다음 동기화가 건너뛰지 않는다
+            try:
+                mark_timetable_synced(student_id, timetable)
+            except Exception as e:
+                print(f" [Warn] 시간표 해시 기록 실패 (다음 동기화에서 재계산): {e}")
+        # 빈 크롤링(changed is None)은 성공으로 치지 않는다 (다음 요청은 창과 무관하게 다시 크롤링)
+        succeeded = changed is not None
         ch.basic_ack(delivery_tag=method.delivery_tag)
 
     except Exception as e:
         print(f" [Error] everytime handle: {e}")
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+    finally:
+        if sync_key:
+            _release_sync(sync_key, succeeded)
+            if not succeeded:
+                # 실패(DLQ)/빈 크롤링은 last_synced_at을 건드리지 않으므로 직접 갱신
+                _touch_last_synced(sync_key[0])
+
+
+def recommend_for_student(msg):
+    """crawl_done 메시지 하나 처리: 추천을 계산해 저장하고 결과를 반환 (잘못된 메시지/저장 실패는 예외)"""
+    if not validate_message(msg, CRAWL_DONE_SCHEMA):
+        raise ValueError("invalid payload")
+
+    student_id = msg.get("studentId")
+    print(f" [recommend] 추천 생성 시작: {student_id}")
+
+    # 프로그램 목록은 메모리 스냅샷 사용 (갱신 이벤트/버전 확인 때만 DB 조회)
+    programs = program_catalog.programs()
+    # 저장된 시간표 비트마스크가 있으면 시간표 행은 읽지 않는다
+    user_mask = get_timetable_mask(student_id)
+    user_timetable = get_timetables(student_id) if user_mask is None else []
+    recs = generate_recommendations(programs, user_timetable, now=datetime.now(), user_mask=user_mask)
+
+    save_recommendation(student_id, recs)
+    print(f" [recommend] 추천 완료: {len(recs)}건 저장")
+    return recs
 
 
 def handle_crawl_done(ch, method, properties, body):
     try:
-        msg = json.loads(body.decode("utf-8"))
-        if not validate_message(msg, CRAWL_DONE_SCHEMA):
-            raise ValueError("invalid payload")
+        # content_type 헤더에 맞춰 디코딩 (헤더 없으면 JSON)
+        recommend_for_student(decode(body, properties))
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    except Exception as e:
+        print(f" [Error] recommend handle: {e}")
+        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+
 
-        student_id = msg.get("studentId")
-        print(f" [recommend] 추천 생성 시작: {student_id}")
+def handle_crawl_done_async(payload, message):
+    """AsyncEventBroker.consume용 crawl_done 핸들러 (스레드 풀에서 실행, 예외면 nack -> DLQ)"""
+    recommend_for_student(payload)
 
-        programs = get_all_programs()
-        user_timetable = get_timetables(student_id)
-        recs = generate_recommendations(programs, user_timetable, now=datetime.now())
 
-        save_recommendation(student_id, recs)
-        print(f" [recommend] 추천 완료: {len(recs)}건 저장")
+def handle_programs_updated(ch, method, properties, body):
+    """프로듀서가 프로그램 목록을 새로 저장하면 카탈로그 스냅샷을 갱신하고 전체 추천을 다시 계산"""
+    try:
+        msg = decode(body, properties)
+        if not validate_message(msg, PROGRAMS_UPDATED_SCHEMA):
+            raise ValueError("invalid payload")
+
+        print(f" [catalog] 프로그램 갱신 이벤트 수신: {msg.get('count')}건")
+        program_catalog.invalidate()
+        programs = program_catalog.programs()
+
+        # 배치 사이 대기는 connection.sleep으로 (긴 작업 중에도 하트비트 응답)
+        recompute_all(programs, sleep=ch.connection.sleep, now=datetime.now())
         ch.basic_ack(delivery_tag=method.delivery_tag)
 
     except Exception as e:
-        print(f" [Error] recommend handle: {e}")
+        print(f" [Error] catalog handle: {e}")
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
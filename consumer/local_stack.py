@@ -0,0 +1,58 @@
+"""
+RabbitMQ 없이 게이트웨이와 컨슈머를 한 프로세스에서 실행 (BROKER_TRANSPORT=memory 전용).
+인메모리 전송은 같은 프로세스 안의 연결끼리만 메시지를 주고받으므로, 게이트웨이(Flask)와
+컨슈머 워커 스레드(runner.run)를 함께 띄운다. DB는 common.database 설정을 그대로 쓴다.
+
+    python consumer/local_stack.py
+"""
+import importlib.util
+import os
+import sys
+import threading
+
+CONSUMER_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(CONSUMER_DIR)
+# 게이트웨이 진입점 (api-gateway는 패키지 이름으로 import할 수 없어 파일 경로로 읽는다)
+GATEWAY_MAIN = os.getenv("GATEWAY_MAIN", os.path.join(REPO_ROOT, "api-gateway", "main.py"))
+GATEWAY_PORT = int(os.getenv("PORT", "5000"))
+
+
+def load_gateway(path=GATEWAY_MAIN):
+    """api-gateway/main.py를 모듈로 읽어 반환 (컨슈머의 main 모듈과 이름이 겹치지 않게 따로 등록)"""
+    spec = importlib.util.spec_from_file_location("api_gateway_main", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    # 컨테이너 이미지와 같은 import 경로: broker/common 패키지, 프로듀서의 에브리타임 크롤러
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.append(os.path.join(REPO_ROOT, "producer"))
+    os.environ.setdefault("BROKER_TRANSPORT", "memory")
+
+    from broker import transport
+    from handlers import handle_crawl_done, handle_crawl_done_async, handle_everytime, handle_programs_updated
+    from runner import run
+
+    if transport.transport_name() != transport.TRANSPORT_MEMORY:
+        print(f" [Warn] BROKER_TRANSPORT={transport.transport_name()}: 게이트웨이와 컨슈머를 따로 띄워도 됩니다.")
+
+    gateway = load_gateway()
+    gateway.init_db()
+
+    consumer = threading.Thread(
+        target=run,
+        args=(handle_everytime, handle_crawl_done, handle_programs_updated),
+        kwargs={"crawl_done_async_handler": handle_crawl_done_async},
+        name="consumer",
+        daemon=True,
+    )
+    consumer.start()
+    print(f" [*] 로컬 스택 시작 (게이트웨이 :{GATEWAY_PORT} + 컨슈머, 전송 {transport.transport_name()})")
+    # 리로더는 프로세스를 새로 띄우므로 끈다 (인메모리 큐가 갈라짐)
+    gateway.app.run(host="0.0.0.0", port=GATEWAY_PORT, use_reloader=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
-from handlers import handle_crawl_done, handle_everytime
+from broker.transport import require_shared_transport
+from handlers import handle_crawl_done, handle_crawl_done_async, handle_everytime, handle_programs_updated
 from runner import run
 
 
 def main():
+    # 게이트웨이와 다른 프로세스이므로 인메모리 전송으로는 요청을 받을 수 없다 (local_stack.py 사용)
+    require_shared_transport("consumer")
     print(" [*] Consumer 시작 (공강 시간 추천 모드)")
-    run(handle_everytime, handle_crawl_done)
+    run(handle_everytime, handle_crawl_done, handle_programs_updated, crawl_done_async_handler=handle_crawl_done_async)
 
 
 if __name__ == "__main__":
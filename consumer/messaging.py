@@ -1,29 +1,38 @@
-import json
+import asyncio
 import os
 import time
+from collections import deque
 from typing import Optional
 
-import pika
+from broker import transport
+from broker.event_broker import LANE_BULK, LANE_INTERACTIVE, get_publisher_pool, lane_queue
 
 RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "rabbitmq")
+# 양쪽 레인에 메시지가 있을 때 대화형 메시지를 연속으로 최대 몇 건 처리한 뒤 배치 메시지를 한 건 처리할지
+LANE_BULK_EVERY = int(os.getenv("LANE_BULK_EVERY", "4"))
+# 두 레인이 모두 비었을 때 I/O를 기다리는 시간(초)
+_LANE_IDLE_WAIT_SEC = 1
+
+
+def async_consumer_available() -> bool:
+    """aio-pika 소비(consume_lanes_async)를 쓸 수 있는지 (aio-pika 설치 + RabbitMQ 전송)"""
+    from broker import async_broker
+
+    return async_broker.aio_pika is not None and transport.transport_name() == transport.TRANSPORT_RABBITMQ
 
 
 def _connection():
-    return pika.BlockingConnection(pika.ConnectionParameters(host=RABBITMQ_HOST))
+    # BROKER_TRANSPORT 환경변수로 RabbitMQ / 인메모리 전송 선택
+    return transport.connect(RABBITMQ_HOST)
 
 
-def publish(queue_name: str, payload: dict):
-    conn = _connection()
-    channel = conn.channel()
-    dlq_name = f"{queue_name}.dlq"
-    _declare_with_dlq(channel, queue_name, dlq_name)
-    channel.basic_publish(
-        exchange="",
-        routing_key=queue_name,
-        body=json.dumps(payload, ensure_ascii=False),
-        properties=pika.BasicProperties(delivery_mode=2),
-    )
-    conn.close()
+def publish(queue_name: str, payload: dict, lane: Optional[str] = None):
+    """
+    프로세스 전역 발행 풀로 발행 (핸들러 스레드에서 동시에 호출해도 안전).
+    연결/큐 선언은 재사용되고 끊긴 연결은 자동으로 다시 맺는다.
+    lane=LANE_BULK이면 "<queue>.bulk" 레인으로 보낸다.
+    """
+    get_publisher_pool(RABBITMQ_HOST).publish(lane_queue(queue_name, lane), payload)
 
 
 def _declare_with_dlq(channel, queue_name: str, dlq_name: Optional[str] = None):
@@ -47,3 +56,89 @@ def consume(queue_name: str, callback, dlq_name: Optional[str] = None, prefetch:
         except Exception as e:
             print(f" [Retry] {queue_name} 연결 재시도: {e}")
             time.sleep(5)
+
+
+def _pick_lane(buffers, interactive_streak: int, bulk_every: int):
+    """처리할 레인 선택: 대화형 우선, 단 bulk_every건 연속 처리했고 배치가 기다리면 배치 한 건"""
+    if buffers[LANE_INTERACTIVE] and (not buffers[LANE_BULK] or interactive_streak < bulk_every):
+        return LANE_INTERACTIVE
+    if buffers[LANE_BULK]:
+        return LANE_BULK
+    return None
+
+
+def consume_lanes(queue_name: str, callback, dlq_name: Optional[str] = None, bulk_every: Optional[int] = None):
+    """
+    대화형 레인(queue_name)과 배치 레인(queue_name.bulk)을 한 채널에서 가중치를 두고 소비.
+    - 레인마다 prefetch=1로 받아 두기만 하고, 처리 순서는 _pick_lane이 정한다.
+    - 대화형 메시지가 계속 들어와도 bulk_every건마다 배치 메시지를 한 건 처리해 배치 레인이 굶지 않는다.
+    callback 시그니처와 ack/nack 책임은 consume과 같다.
+    """
+    bulk_every = max(1, bulk_every or LANE_BULK_EVERY)
+    bulk_queue = lane_queue(queue_name, LANE_BULK)
+    while True:
+        try:
+            conn = _connection()
+            channel = conn.channel()
+            _declare_with_dlq(channel, queue_name, dlq_name)
+            # 배치 레인은 발행 풀이 선언하는 옵션(<queue>.bulk.dlq)과 맞춘다
+            _declare_with_dlq(channel, bulk_queue, f"{bulk_queue}.dlq")
+            # prefetch는 소비자(레인)별로 적용
+            channel.basic_qos(prefetch_count=1)
+
+            buffers = {LANE_INTERACTIVE: deque(), LANE_BULK: deque()}
+            for lane, name in ((LANE_INTERACTIVE, queue_name), (LANE_BULK, bulk_queue)):
+                channel.basic_consume(
+                    queue=name,
+                    on_message_callback=lambda ch, method, props, body, lane=lane: buffers[lane].append(
+                        (method, props, body)
+                    ),
+                )
+
+            interactive_streak = 0
+            while True:
+                idle = not buffers[LANE_INTERACTIVE] and not buffers[LANE_BULK]
+                conn.process_data_events(time_limit=_LANE_IDLE_WAIT_SEC if idle else 0)
+                lane = _pick_lane(buffers, interactive_streak, bulk_every)
+                if lane is None:
+                    continue
+                interactive_streak = interactive_streak + 1 if lane == LANE_INTERACTIVE else 0
+                method, props, body = buffers[lane].popleft()
+                callback(channel, method, props, body)
+        except Exception as e:
+            print(f" [Retry] {queue_name} 연결 재시도: {e}")
+            time.sleep(5)
+
+
+async def consume_both_lanes(broker, queue_name: str, handler, concurrency: Optional[int] = None, bulk_every: Optional[int] = None):
+    """broker(AsyncEventBroker)로 두 레인을 동시에 소비하고, 끝나면(취소/오류) 연결을 닫는다"""
+    from broker.async_broker import CONSUME_CONCURRENCY
+
+    concurrency = max(1, concurrency or CONSUME_CONCURRENCY)
+    bulk_every = max(1, bulk_every or LANE_BULK_EVERY)
+    try:
+        await asyncio.gather(
+            broker.consume(queue_name, handler, concurrency=concurrency),
+            broker.consume(lane_queue(queue_name, LANE_BULK), handler, concurrency=max(1, concurrency // bulk_every)),
+        )
+    finally:
+        await broker.close()
+
+
+def consume_lanes_async(queue_name: str, handler, concurrency: Optional[int] = None, bulk_every: Optional[int] = None):
+    """
+    aio-pika(AsyncEventBroker)로 대화형 레인과 배치 레인(.bulk)을 동시에 소비 (이 스레드에서 이벤트 루프 실행).
+    - 대화형 레인은 concurrency개, 배치 레인은 concurrency // bulk_every개(최소 1)까지 핸들러를 동시에 실행
+    - handler(payload, message)는 스레드 풀에서 실행되며, 정상 반환이면 ack, 예외면 nack -> DLQ
+    큐/DLQ 선언 옵션은 consume_lanes와 같다.
+    """
+    from broker.async_broker import AsyncEventBroker
+
+    while True:
+        try:
+            asyncio.run(
+                consume_both_lanes(AsyncEventBroker(host=RABBITMQ_HOST), queue_name, handler, concurrency, bulk_every)
+            )
+        except Exception as e:
+            print(f" [Retry] {queue_name} 연결 재시도 (async): {e}")
+            time.sleep(5)
@@ -0,0 +1,47 @@
+import threading
+import time
+
+# 프로세스 내 간단한 카운터/게이지 (로그 출력 및 점검용)
+_lock = threading.Lock()
+_values = {}
+
+
+def incr(name: str, amount: int = 1):
+    with _lock:
+        _values[name] = _values.get(name, 0) + amount
+
+
+def set_value(name: str, value):
+    with _lock:
+        _values[name] = value
+
+
+def get(name: str, default=0):
+    with _lock:
+        return _values.get(name, default)
+
+
+def snapshot(prefix: str = "") -> dict:
+    with _lock:
+        return {k: v for k, v in _values.items() if k.startswith(prefix)}
+
+
+def log_snapshot(prefix: str = ""):
+    values = snapshot(prefix)
+    if values:
+        print(" [Metrics] " + ", ".join(f"{k}={v}" for k, v in sorted(values.items())))
+
+
+def start_reporter(interval_sec: float, prefix: str = ""):
+    """interval_sec마다 카운터/게이지를 로그로 출력하는 데몬 스레드 시작 (0 이하이면 시작하지 않음)"""
+    if interval_sec <= 0:
+        return None
+
+    def report():
+        while True:
+            time.sleep(interval_sec)
+            log_snapshot(prefix)
+
+    thread = threading.Thread(target=report, name="metrics-reporter", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,79 @@
+import os
+import time
+from datetime import datetime
+
+import metrics
+from common.timeslots import timetable_mask
+from domain import BatchRecommender
+from repository import (
+    get_student_ids_with_timetables,
+    get_timetable_masks_for_students,
+    get_timetables_for_students,
+    save_recommendations_bulk,
+)
+
+# 한 번에 읽고/저장할 학생 수, 배치 사이 쉬는 시간(초) — 대화형 동기화가 밀리지 않도록 조절
+RECOMPUTE_BATCH_SIZE = int(os.getenv("RECOMPUTE_BATCH_SIZE", "500"))
+RECOMPUTE_BATCH_PAUSE_SEC = float(os.getenv("RECOMPUTE_BATCH_PAUSE_SEC", "0.2"))
+
+
+def recompute_all(programs, batch_size=None, pause_sec=None, sleep=time.sleep, now=None):
+    """
+    시간표가 있는 모든 학생의 추천을 배치 단위로 다시 계산해 저장.
+    - 학번 keyset 페이지네이션으로 batch_size명씩 시간표 비트마스크를 한 번에 읽고
+    - 배치 전체를 BatchRecommender로 한 번에 계산한 뒤 한 트랜잭션으로 저장
+    - 배치 사이에 sleep(pause_sec) (pika 핸들러 안에서는 connection.sleep을 넘겨 하트비트 유지)
+    진행 상황은 metrics의 recompute.* 값과 로그로 남긴다.
+    """
+    batch_size = batch_size or RECOMPUTE_BATCH_SIZE
+    pause_sec = RECOMPUTE_BATCH_PAUSE_SEC if pause_sec is None else pause_sec
+    now = now or datetime.now()
+
+    started = time.monotonic()
+    # 카탈로그를 배열로 한 번만 만들어 모든 배치에서 재사용
+    recommender = BatchRecommender(programs)
+    processed = 0
+    batches = 0
+    metrics.set_value("recompute.running", 1)
+    metrics.set_value("recompute.processed", 0)
+    print(f" [recompute] 전체 추천 재계산 시작 (프로그램 {len(programs)}건, 배치 {batch_size}명)")
+
+    try:
+        last_student_id = None
+        while True:
+            student_ids = get_student_ids_with_timetables(last_student_id, batch_size)
+            if not student_ids:
+                break
+            last_student_id = student_ids[-1]
+
+            # 비트마스크가 저장되지 않은 (이전 데이터) 학생만 시간표 행을 읽는다
+            masks = get_timetable_masks_for_students(student_ids)
+            missing = [sid for sid in student_ids if sid not in masks]
+            timetables = get_timetables_for_students(missing) if missing else {}
+            user_masks = [
+                masks[sid] if sid in masks else timetable_mask(timetables.get(sid, []))
+                for sid in student_ids
+            ]
+            results = dict(zip(student_ids, recommender.recommend(user_masks, now=now)))
+            save_recommendations_bulk(results)
+
+            processed += len(student_ids)
+            batches += 1
+            elapsed = time.monotonic() - started
+            metrics.set_value("recompute.processed", processed)
+            metrics.set_value("recompute.batches", batches)
+            metrics.set_value("recompute.rate_per_sec", round(processed / elapsed, 1) if elapsed else 0.0)
+            print(f" [recompute] {processed}명 완료 ({batches}배치, {elapsed:.1f}초)")
+
+            if len(student_ids) < batch_size:
+                break
+            if pause_sec:
+                sleep(pause_sec)
+    finally:
+        elapsed = time.monotonic() - started
+        metrics.set_value("recompute.running", 0)
+        metrics.set_value("recompute.last_duration_sec", round(elapsed, 2))
+        metrics.incr("recompute.runs")
+
+    print(f" [recompute] 완료: {processed}명, {elapsed:.1f}초")
+    return {"processed": processed, "batches": batches, "elapsed_sec": round(elapsed, 2)}
@@ -5,9 +5,24 @@ from common.database import get_db
 
 
 def save_timetables(student_id: str, timetable: List[Dict]):
+    """
+    시간표를 저장하면 True, 내용이 같아 건너뛰면 False, 빈 시간표면 None
+    내용 해시는 crawl_done 발행 후 mark_timetable_synced로 기록한다 (발행 실패 시 다음 동기화에서 재계산)
+    """
     with get_db() as db:
         if timetable:
-            crud.save_timetables(db, student_id, timetable)
+            return crud.save_timetables(db, student_id, timetable, skip_if_unchanged=True, record_hash=False)
+    return None
+
+
+def mark_timetable_synced(student_id: str, timetable: List[Dict]):
+    with get_db() as db:
+        return crud.set_timetable_hash(db, student_id, timetable)
+
+
+def touch_last_synced(student_id: str):
+    with get_db() as db:
+        return crud.touch_last_synced(db, student_id)
 
 
 def get_timetables(student_id: str):
@@ -20,6 +35,36 @@ def get_all_programs():
         return crud.get_all_programs(db)
 
 
+def get_programs_version():
+    with get_db() as db:
+        return crud.get_programs_version(db)
+
+
 def save_recommendation(student_id: str, results: List[Dict]):
     with get_db() as db:
         crud.save_recommendation(db, student_id, results)
+
+
+def get_student_ids_with_timetables(after_student_id: str = None, limit: int = 500):
+    with get_db() as db:
+        return crud.get_student_ids_with_timetables(db, after_student_id, limit)
+
+
+def get_timetables_for_students(student_ids: List[str]):
+    with get_db() as db:
+        return crud.get_timetables_for_students(db, student_ids)
+
+
+def save_recommendations_bulk(results_by_student: Dict[str, List[Dict]]):
+    with get_db() as db:
+        return crud.save_recommendations_bulk(db, results_by_student)
+
+
+def get_timetable_mask(student_id: str):
+    with get_db() as db:
+        return crud.get_timetable_mask(db, student_id)
+
+
+def get_timetable_masks_for_students(student_ids: List[str]):
+    with get_db() as db:
+        return crud.get_timetable_masks_for_students(db, student_ids)
@@ -1,24 +1,65 @@
 import os
 import threading
 
-from messaging import consume
+import metrics
+from common.concurrency import EVERYTIME_WORKERS
+from messaging import async_consumer_available, consume, consume_lanes, consume_lanes_async
 
 EVERYTIME_QUEUE = os.getenv("EVERYTIME_QUEUE", "everytime_sync")
 CRAWL_DONE_QUEUE = os.getenv("CRAWL_DONE_QUEUE", "crawl_done")
+WEIN_DONE_QUEUE = os.getenv("WEIN_DONE_QUEUE", "wein_updates_done")
+# 에브리타임 동기화 워커 수는 common.concurrency.EVERYTIME_WORKERS (워커마다 연결/채널을 따로 두고 레인별 prefetch=1로 소비)
+# everytime_sync / crawl_done은 대화형 레인과 배치 레인(.bulk)을 함께 소비한다 (messaging.consume_lanes)
+# 처리 지표(시간표 해시 hit/miss, 전체 재계산 진행률 등) 로그 주기(초), 0이면 끄기
+METRICS_LOG_INTERVAL_SEC = float(os.getenv("METRICS_LOG_INTERVAL_SEC", "300"))
+# crawl_done 소비 방식: async(aio-pika, 여러 건을 동시에 처리) / pika(레인당 한 건씩)
+CRAWL_DONE_CONSUMER = os.getenv("CRAWL_DONE_CONSUMER", "async")
+# async 소비 시 대화형 레인에서 동시에 처리할 추천 계산 수
+CRAWL_DONE_CONCURRENCY = int(os.getenv("CRAWL_DONE_CONCURRENCY", "8"))
 
 
-def run(everytime_handler, crawl_done_handler):
-    t1 = threading.Thread(
-        target=consume,
-        args=(EVERYTIME_QUEUE, everytime_handler, f"{EVERYTIME_QUEUE}.dlq"),
-        daemon=True,
-    )
-    t2 = threading.Thread(
-        target=consume,
+def _crawl_done_thread(crawl_done_handler, crawl_done_async_handler):
+    if crawl_done_async_handler and CRAWL_DONE_CONSUMER == "async":
+        if async_consumer_available():
+            print(f" [*] crawl_done: aio-pika 소비 (동시 {CRAWL_DONE_CONCURRENCY})")
+            return threading.Thread(
+                target=consume_lanes_async,
+                args=(CRAWL_DONE_QUEUE, crawl_done_async_handler, CRAWL_DONE_CONCURRENCY),
+                name="crawl-done-async",
+                daemon=True,
+            )
+        print(" [*] crawl_done: aio-pika를 쓸 수 없어 pika로 소비 (aio-pika 미설치 또는 인메모리 전송)")
+    return threading.Thread(
+        target=consume_lanes,
         args=(CRAWL_DONE_QUEUE, crawl_done_handler, f"{CRAWL_DONE_QUEUE}.dlq"),
+        name="crawl-done-worker",
         daemon=True,
     )
-    t1.start()
-    t2.start()
-    t1.join()
-    t2.join()
+
+
+def run(everytime_handler, crawl_done_handler, programs_updated_handler=None, crawl_done_async_handler=None):
+    threads = [
+        threading.Thread(
+            target=consume_lanes,
+            args=(EVERYTIME_QUEUE, everytime_handler, f"{EVERYTIME_QUEUE}.dlq"),
+            name=f"everytime-worker-{i}",
+            daemon=True,
+        )
+        for i in range(EVERYTIME_WORKERS)
+    ]
+    threads.append(_crawl_done_thread(crawl_done_handler, crawl_done_async_handler))
+    if programs_updated_handler:
+        threads.append(
+            threading.Thread(
+                target=consume,
+                args=(WEIN_DONE_QUEUE, programs_updated_handler, f"{WEIN_DONE_QUEUE}.dlq"),
+                name="programs-updated-worker",
+                daemon=True,
+            )
+        )
+    print(f" [*] everytime 워커 {EVERYTIME_WORKERS}개 시작")
+    metrics.start_reporter(METRICS_LOG_INTERVAL_SEC)
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
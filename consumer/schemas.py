@@ -1,11 +1,16 @@
 EVERYTIME_SCHEMA = {
     "required": ["studentId"],
-    "optional": ["timetableUrl"],
+    "optional": ["timetableUrl", "lane"],
 }
 
 CRAWL_DONE_SCHEMA = {
     "required": ["studentId"],
-    "optional": [],
+    "optional": ["lane"],
+}
+
+PROGRAMS_UPDATED_SCHEMA = {
+    "required": ["event_type"],
+    "optional": ["timestamp", "count"],
 }
 
 
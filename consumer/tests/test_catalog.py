@@ -0,0 +1,72 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import ProgramCatalog  # noqa: E402
+
+
+def _program(i, run_time_text="2025.09.15 10:00 ~ 2025.09.15 12:00"):
+    return SimpleNamespace(
+        id=i, title=f"프로그램 {i}", topic=None, apply_start=None, apply_end=None, run_time_text=run_time_text
+    )
+
+
+class FakeDB:
+    def __init__(self, programs, version):
+        self.programs = programs
+        self.version = version
+        self.loads = 0
+        self.version_reads = 0
+
+    def load(self):
+        self.loads += 1
+        return list(self.programs)
+
+    def read_version(self):
+        self.version_reads += 1
+        return self.version
+
+
+def test_catalog_loads_once_and_reuses_snapshot_within_interval():
+    db = FakeDB([_program(1), _program(2)], version=("t1", 2))
+    catalog = ProgramCatalog(loader=db.load, version_reader=db.read_version, check_interval=3600)
+
+    first = catalog.programs()
+    second = catalog.programs()
+
+    assert second is first
+    assert db.loads == 1 and db.version_reads == 1
+    assert [p.id for p in first] == [1, 2]
+    assert first[0].session == ("월", 600, 720) and first[0].mask
+
+
+def test_catalog_reloads_only_when_version_changes():
+    db = FakeDB([_program(1)], version=("t1", 1))
+    catalog = ProgramCatalog(loader=db.load, version_reader=db.read_version, check_interval=0)
+    first = catalog.programs()
+
+    # 버전이 그대로면 확인만 하고 다시 읽지 않는다
+    assert catalog.programs() is first
+    assert db.loads == 1 and db.version_reads == 2
+
+    db.programs = [_program(1), _program(3)]
+    db.version = ("t2", 2)
+    refreshed = catalog.programs()
+    assert [p.id for p in refreshed] == [1, 3]
+    assert catalog.generation == 2
+
+
+def test_invalidate_forces_reload_even_with_same_version():
+    db = FakeDB([_program(1)], version=("t1", 1))
+    catalog = ProgramCatalog(loader=db.load, version_reader=db.read_version, check_interval=3600)
+    catalog.programs()
+
+    db.programs = [_program(4, run_time_text="운영 : 상시")]
+    catalog.invalidate()
+    refreshed = catalog.programs()
+
+    assert db.loads == 2
+    assert [p.id for p in refreshed] == [4]
+    assert refreshed[0].session is None and refreshed[0].mask is None
@@ -0,0 +1,79 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.timeslots import timetable_mask  # noqa: E402
+from domain import NO_RECOMMENDATION, BatchRecommender, generate_recommendations  # noqa: E402
+
+NOW = datetime(2025, 9, 10, 12, 0)
+DAYS = ["월", "화", "수", "목", "금"]
+
+
+def _random_programs(rng, count):
+    programs = []
+    for i in range(count):
+        day = rng.randrange(7)
+        start = rng.randrange(8 * 60, 20 * 60, 5) + rng.choice([0, 2])
+        session_date = datetime(2025, 9, 15) + timedelta(days=day)
+        end_date = session_date + timedelta(days=1) if rng.random() < 0.1 else session_date
+        run_time_text = (
+            f"{session_date:%Y.%m.%d} {start // 60:02d}:{start % 60:02d} ~ "
+            f"{end_date:%Y.%m.%d} {(start + 90) // 60:02d}:{(start + 90) % 60:02d}"
+        )
+        apply_end = None if rng.random() < 0.2 else NOW + timedelta(hours=rng.randrange(-72, 24 * 14))
+        programs.append(
+            SimpleNamespace(
+                id=i,
+                title=f"프로그램 {i}",
+                topic=rng.choice([None, "진로", "봉사", "글로벌"]),
+                apply_end=apply_end,
+                # 일정 없는 프로그램도 섞는다
+                run_time_text=run_time_text if rng.random() < 0.9 else "운영 : 상시",
+            )
+        )
+    return programs
+
+
+def _random_timetable(rng):
+    timetable = []
+    for _ in range(rng.randrange(0, 8)):
+        start = rng.randrange(9 * 60, 18 * 60, 15)
+        end = start + rng.choice([50, 75, 110])
+        timetable.append(
+            SimpleNamespace(
+                day=rng.choice(DAYS),
+                start_time=f"{start // 60:02d}:{start % 60:02d}",
+                end_time=f"{end // 60:02d}:{end % 60:02d}",
+                subject_name="수업",
+            )
+        )
+    return timetable
+
+
+def test_batch_recommender_matches_generate_recommendations():
+    rng = random.Random(20250910)
+    programs = _random_programs(rng, 120)
+    timetables = [_random_timetable(rng) for _ in range(300)]
+    masks = [timetable_mask(tt) for tt in timetables]
+    masks[0] = None  # 마스크가 없는 학생은 빈 시간표로 본다
+
+    # 청크 경계를 넘도록 작은 chunk_size 사용
+    batch = BatchRecommender(programs, chunk_size=64).recommend(masks, now=NOW)
+
+    assert len(batch) == len(timetables)
+    for tt, mask, got in zip(timetables, masks, batch):
+        expected = generate_recommendations(programs, tt, now=NOW, user_mask=mask if mask is not None else 0)
+        assert got == expected
+
+
+def test_batch_recommender_without_candidates_returns_placeholder():
+    expired = SimpleNamespace(
+        id=1, title="지난 프로그램", topic=None, apply_end=NOW - timedelta(days=1), run_time_text=""
+    )
+
+    assert BatchRecommender([expired]).recommend([0, 0], now=NOW) == [[NO_RECOMMENDATION], [NO_RECOMMENDATION]]
+    assert BatchRecommender([]).recommend([0], now=NOW) == [[NO_RECOMMENDATION]]
@@ -0,0 +1,149 @@
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import handlers  # noqa: E402
+import metrics  # noqa: E402
+
+RAW_TIMETABLE = [{"day": "월", "start": "09:00", "end": "10:15", "subject_name": "자료구조", "classroom": "101"}]
+
+
+class FakeChannel:
+    def __init__(self):
+        self.acked = []
+        self.nacked = []
+
+    def basic_ack(self, delivery_tag):
+        self.acked.append(delivery_tag)
+
+    def basic_nack(self, delivery_tag, requeue=True):
+        self.nacked.append(delivery_tag)
+
+
+@pytest.fixture
+def sync_env(monkeypatch):
+    env = {"changed": True, "published": [], "marked": [], "touched": [], "crawled": 0, "publish_error": None}
+
+    def publish(queue_name, payload, lane=None):
+        if env["publish_error"]:
+            raise env["publish_error"]
+        env["published"].append((queue_name, payload, lane))
+
+    def crawl(url):
+        env["crawled"] += 1
+        return list(RAW_TIMETABLE)
+
+    monkeypatch.setattr(handlers, "everytime_crawler", SimpleNamespace(crawl_shared_timetable=crawl))
+    monkeypatch.setattr(handlers, "save_timetables", lambda student_id, timetable: env["changed"])
+    monkeypatch.setattr(handlers, "mark_timetable_synced", lambda student_id, tt: env["marked"].append(student_id))
+    monkeypatch.setattr(handlers, "touch_last_synced", lambda student_id: env["touched"].append(student_id))
+    monkeypatch.setattr(handlers, "publish", publish)
+    monkeypatch.setattr(handlers, "_synced_at", {})
+    return env
+
+
+def _deliver(payload):
+    ch = FakeChannel()
+    handlers.handle_everytime(ch, SimpleNamespace(delivery_tag=1), None, json.dumps(payload).encode())
+    return ch
+
+
+def test_unchanged_timetable_skips_recompute_and_hash_write(sync_env):
+    sync_env["changed"] = False
+    hits = metrics.get("timetable_hash.hit")
+
+    ch = _deliver({"studentId": "111", "timetableUrl": "url"})
+
+    assert ch.acked == [1]
+    assert sync_env["published"] == [] and sync_env["marked"] == []
+    assert metrics.get("timetable_hash.hit") == hits + 1
+
+
+def test_changed_timetable_records_hash_after_crawl_done(sync_env):
+    ch = _deliver({"studentId": "111", "timetableUrl": "url", "lane": "bulk"})
+
+    assert ch.acked == [1]
+    done = {"type": "crawl_done", "studentId": "111", "lane": "bulk"}
+    assert sync_env["published"] == [(handlers.CRAWL_DONE_QUEUE, done, "bulk")]
+    assert sync_env["marked"] == ["111"]
+
+
+def test_publish_failure_leaves_hash_unrecorded_and_releases_claim(sync_env):
+    sync_env["publish_error"] = RuntimeError("broker down")
+
+    ch = _deliver({"studentId": "111", "timetableUrl": "url"})
+
+    assert ch.nacked == [1]
+    assert sync_env["marked"] == []
+    # 게이트웨이의 대기 표시가 풀리도록 동기화 시각은 갱신
+    assert sync_env["touched"] == ["111"]
+    # 처리 권한이 반납되어 같은 요청을 다시 처리할 수 있다 (실패는 중복 제거 창에 남지 않음)
+    sync_env["publish_error"] = None
+    assert _deliver({"studentId": "111", "timetableUrl": "url"}).acked == [1]
+    assert sync_env["marked"] == ["111"]
+    assert sync_env["crawled"] == 2
+
+
+def test_queued_duplicate_after_successful_crawl_is_skipped_within_window(sync_env):
+    first = _deliver({"studentId": "111", "timetableUrl": "url"})
+    second = _deliver({"studentId": "111", "timetableUrl": "url"})
+    other_url = _deliver({"studentId": "111", "timetableUrl": "other"})
+
+    assert first.acked == second.acked == other_url.acked == [1]
+    assert sync_env["crawled"] == 2
+    # 건너뛴 요청도 게이트웨이가 끝난 것으로 보도록 동기화 시각을 갱신
+    assert sync_env["touched"] == ["111"]
+
+
+def test_dedup_window_zero_crawls_every_request(sync_env, monkeypatch):
+    monkeypatch.setattr(handlers, "EVERYTIME_DEDUP_SEC", 0)
+
+    _deliver({"studentId": "111", "timetableUrl": "url"})
+    _deliver({"studentId": "111", "timetableUrl": "url"})
+
+    assert sync_env["crawled"] == 2
+
+
+def test_empty_crawl_touches_sync_time_and_is_not_deduplicated(sync_env):
+    sync_env["changed"] = None
+
+    assert _deliver({"studentId": "111", "timetableUrl": "url"}).acked == [1]
+    assert sync_env["touched"] == ["111"]
+    assert sync_env["marked"] == []
+
+    _deliver({"studentId": "111", "timetableUrl": "url"})
+    assert sync_env["crawled"] == 2
+
+
+def test_async_crawl_done_handler_raises_on_invalid_payload_for_dlq():
+    # AsyncEventBroker.consume는 핸들러 예외를 nack(requeue=False)로 처리한다
+    with pytest.raises(ValueError):
+        handlers.handle_crawl_done_async({"type": "crawl_done"}, None)
+
+
+def test_async_lanes_consume_both_queues_and_close_broker():
+    import asyncio
+
+    import messaging
+
+    class FakeAsyncBroker:
+        def __init__(self):
+            self.consumed = []
+            self.closed = False
+
+        async def consume(self, queue_name, handler, concurrency=None):
+            self.consumed.append((queue_name, concurrency))
+
+        async def close(self):
+            self.closed = True
+
+    broker = FakeAsyncBroker()
+    asyncio.run(messaging.consume_both_lanes(broker, "crawl_done", handlers.handle_crawl_done_async, 8, 4))
+
+    assert broker.consumed == [("crawl_done", 8), ("crawl_done.bulk", 2)]
+    assert broker.closed
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import local_stack  # noqa: E402
+from broker import codec, transport  # noqa: E402
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    monkeypatch.setenv("BROKER_TRANSPORT", "memory")
+    # 다른 테스트의 프로세스 전역 발행 풀과 섞이지 않도록 별도 호스트 키 사용
+    monkeypatch.setenv("RABBITMQ_HOST", "local-stack-test")
+    broker = transport.get_memory_broker()
+    broker.purge_all()
+    yield broker
+    broker.purge_all()
+
+
+def test_gateway_sync_reaches_consumer_queue_in_the_same_process(memory):
+    gateway = local_stack.load_gateway()
+
+    assert gateway.gateway_interface.trigger_sync("111", "url") == "accepted"
+
+    received = []
+    ch = transport.connect("unused").channel()
+
+    def on_message(channel, method, properties, body):
+        received.append(codec.decode(body, properties))
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        channel.stop_consuming()
+
+    ch.basic_consume(queue=gateway.SYNC_QUEUE, on_message_callback=on_message)
+    ch.start_consuming()
+
+    assert received == [{"type": "sync_everytime", "studentId": "111", "lane": "interactive", "timetableUrl": "url"}]
@@ -0,0 +1,112 @@
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recompute  # noqa: E402
+import repository  # noqa: E402
+from common import crud, models  # noqa: E402
+from common.database import Base  # noqa: E402
+from domain import generate_recommendations  # noqa: E402
+
+NOW = datetime(2025, 9, 10, 12, 0)
+PROGRAMS = [
+    SimpleNamespace(
+        id=1, title="월 오전 특강", topic="진로", apply_end=None,
+        run_time_text="2025.09.15 10:00 ~ 2025.09.15 12:00",
+    ),
+    SimpleNamespace(
+        id=2, title="화 오후 캠프", topic=None, apply_end=datetime(2025, 9, 12),
+        run_time_text="2025.09.16 14:00 ~ 2025.09.16 16:00",
+    ),
+]
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+
+    @contextmanager
+    def get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(repository, "get_db", get_db)
+    return factory
+
+
+def _timetable(day):
+    return [{"day": day, "start_time": "10:30", "end_time": "11:45", "subject_name": "수업", "classroom": ""}]
+
+
+def test_recompute_all_pages_through_students_by_student_id(session_factory, monkeypatch):
+    db = session_factory()
+    student_ids = [f"2025{i:05d}" for i in range(7)]
+    for i, sid in enumerate(reversed(student_ids)):
+        db.add(models.User(student_id=sid, name="학생", password_hash="x"))
+        db.commit()
+        crud.save_timetables(db, sid, _timetable("월" if i % 2 else "화"))
+    db.add(models.User(student_id="20240000", name="시간표 없음", password_hash="x"))
+    # 마스크가 저장되지 않은 이전 데이터는 시간표 행으로 계산
+    db.query(models.UserTimetableMask).filter_by(student_id=student_ids[3]).delete()
+    db.commit()
+
+    pages = []
+    read_page = recompute.get_student_ids_with_timetables
+
+    def tracking(after, limit):
+        ids = read_page(after, limit)
+        pages.append((after, ids))
+        return ids
+
+    monkeypatch.setattr(recompute, "get_student_ids_with_timetables", tracking)
+    sleeps = []
+
+    summary = recompute.recompute_all(PROGRAMS, batch_size=3, pause_sec=0.5, sleep=sleeps.append, now=NOW)
+
+    assert summary["processed"] == 7 and summary["batches"] == 3
+    assert pages == [
+        (None, student_ids[0:3]),
+        (student_ids[2], student_ids[3:6]),
+        (student_ids[5], student_ids[6:7]),
+    ]
+    assert sleeps == [0.5, 0.5]  # 마지막(덜 찬) 배치 뒤에는 쉬지 않는다
+
+    for sid in student_ids:
+        timetable = crud.get_timetables(db, sid)
+        expected = generate_recommendations(PROGRAMS, timetable, now=NOW)
+        assert crud.get_recommendation(db, sid).result_json == expected
+    assert crud.get_recommendation(db, "20240000") is None
+    db.close()
+
+
+def test_recompute_all_stops_when_last_page_is_exactly_full(session_factory, monkeypatch):
+    db = session_factory()
+    for sid in ("a", "b"):
+        db.add(models.User(student_id=sid, name="학생", password_hash="x"))
+        db.commit()
+        crud.save_timetables(db, sid, _timetable("수"))
+    db.close()
+
+    calls = []
+    read_page = recompute.get_student_ids_with_timetables
+    monkeypatch.setattr(
+        recompute, "get_student_ids_with_timetables", lambda after, limit: calls.append(after) or read_page(after, limit)
+    )
+
+    summary = recompute.recompute_all(PROGRAMS, batch_size=2, pause_sec=0, now=NOW)
+
+    assert summary["processed"] == 2
+    assert calls == [None, "b"]  # 꽉 찬 페이지 다음에는 빈 페이지를 한 번 더 확인
@@ -0,0 +1,155 @@
+"""
+headless Chrome 프로필 벤치마크: 기본 옵션 vs lean 프로필(browser_options)
+저장된 위인전 목록 페이지(tests/fixtures/wein_list_page.html)를 로컬 스텁 서버로 띄우고,
+썸네일/폰트/외부 스크립트 요청에는 --asset-delay-ms만큼 늦게 --asset-kb 크기의 응답을 준다.
+프로필마다 드라이버를 띄워 페이지 로드(driver.get, load 이벤트까지) 시간과 프로세스 트리 RSS를 잰다.
+  wein: 스타일시트까지 차단하는 위인전 프로필 / everytime: CSS·폰트는 받고 창 크기·배율을 고정한 에브리타임 프로필
+chromium/chromedriver가 필요하다 (producer 이미지 안에서 실행).
+사용법: python bench_browser_options.py [--profile wein|everytime|all] [--loads 10] [--asset-delay-ms 80] [--asset-kb 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from browser_options import CHROME_BINARY, CHROMEDRIVER_PATH, create_lean_driver
+from browser_pool import _driver_pid, process_tree_rss_mb
+from everytime_crawler import CHROME_DEVICE_SCALE_FACTOR, CHROME_WINDOW_SIZE, EVERYTIME_BLOCKED_PATTERNS
+from wein_crawler import WEIN_BLOCKED_PATTERNS
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "fixtures", "wein_list_page.html")
+# 실제 페이지처럼 웹폰트/외부 분석 스크립트를 참조하도록 fixture에 덧붙인다
+_EXTRA_HEAD = (
+    '<link rel="stylesheet" href="/css/font.css">'
+    '<script async src="/gtag/js?id=G-TEST&host=googletagmanager.com"></script>'
+)
+_FONT_CSS = b"@font-face{font-family:NanumSquare;src:url(/font/NanumSquare.woff2) format('woff2')}body{font-family:NanumSquare}"
+
+
+def _handler(page, asset_delay, asset_body):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/list":
+                body, ctype = page, "text/html; charset=utf-8"
+            elif path == "/css/font.css":
+                body, ctype = _FONT_CSS, "text/css"
+            elif path.endswith(".css"):
+                body, ctype = b"ul.ul_box li{display:inline-block;width:280px}", "text/css"
+            elif path.endswith("global.js"):
+                body, ctype = b"var global={page:function(n){return n;}};", "application/javascript"
+            else:
+                # 썸네일/폰트/분석 스크립트: 느리고 무거운 응답
+                time.sleep(asset_delay)
+                body, ctype = asset_body, "application/octet-stream"
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+
+
+def _default_driver(*extra_args):
+    """lean 프로필 적용 전 크롤러가 쓰던 옵션"""
+    options = Options()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    for arg in extra_args:
+        options.add_argument(arg)
+    options.binary_location = CHROME_BINARY
+    return webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=options)
+
+
+# 프로필 이름 -> (기존 옵션 드라이버, lean 프로필 드라이버)
+PROFILES = {
+    "wein": (
+        lambda: _default_driver("--headless=new", "--window-size=1920,1080"),
+        lambda: create_lean_driver(blocked_patterns=WEIN_BLOCKED_PATTERNS, window_size="1920,1080"),
+    ),
+    "everytime": (
+        lambda: _default_driver(
+            "--headless",
+            f"--force-device-scale-factor={CHROME_DEVICE_SCALE_FACTOR}",
+            f"--window-size={CHROME_WINDOW_SIZE}",
+            f"--user-agent={_USER_AGENT}",
+        ),
+        lambda: create_lean_driver(
+            blocked_patterns=EVERYTIME_BLOCKED_PATTERNS,
+            headless="--headless",
+            window_size=CHROME_WINDOW_SIZE,
+            device_scale_factor=CHROME_DEVICE_SCALE_FACTOR,
+            user_agent=_USER_AGENT,
+        ),
+    ),
+}
+
+
+def _measure(factory, url, loads):
+    driver = factory()
+    try:
+        times = []
+        for _ in range(loads):
+            driver.get("about:blank")
+            started = time.perf_counter()
+            driver.get(url)
+            times.append(time.perf_counter() - started)
+        pid = _driver_pid(driver)
+        rss = process_tree_rss_mb(pid) if pid else 0
+    finally:
+        driver.quit()
+    return times, rss
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=sorted(PROFILES) + ["all"], default="all")
+    parser.add_argument("--loads", type=int, default=10)
+    parser.add_argument("--asset-delay-ms", type=float, default=80)
+    parser.add_argument("--asset-kb", type=int, default=200)
+    args = parser.parse_args()
+
+    missing = [path for path in (CHROME_BINARY, CHROMEDRIVER_PATH) if not os.path.exists(path)]
+    if missing:
+        print(f"chromium/chromedriver가 없습니다: {', '.join(missing)} (CHROME_BINARY/CHROMEDRIVER_PATH 확인)")
+        sys.exit(2)
+
+    with open(FIXTURE, encoding="utf-8") as f:
+        page = f.read().replace("<head>", "<head>" + _EXTRA_HEAD, 1).encode("utf-8")
+    handler = _handler(page, args.asset_delay_ms / 1000, b"\0" * (args.asset_kb * 1024))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/list"
+
+    try:
+        print(f"loads={args.loads} asset-delay={args.asset_delay_ms:.0f}ms asset={args.asset_kb}KB")
+        profiles = sorted(PROFILES) if args.profile == "all" else [args.profile]
+        for profile in profiles:
+            for name, factory in zip(("default", "lean"), PROFILES[profile]):
+                times, rss = _measure(factory, url, args.loads)
+                print(
+                    f"  {profile:9s} {name:7s}: load median {statistics.median(times) * 1000:7.1f}ms"
+                    f" (max {max(times) * 1000:7.1f}ms), RSS {rss:6.0f}MB"
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+위인전 목록 페이지 카드 추출 벤치마크 (저장된 페이지 fixture 사용)
+  per-card : 기존 방식. 카드마다 find_element 4회(+ outerHTML) 후 카드 HTML을 따로 파싱
+  one-pass : page_source 한 번을 받아 카드 목록만 파싱 (extract_cards_from_html)
+WebDriver 호출은 chromedriver HTTP 왕복이므로 --rtt-ms로 왕복 비용을 더해 예상 시간을 함께 출력한다.
+사용법: python bench_card_extraction.py [--pages 30] [--rtt-ms 2]
+"""
+import argparse
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from wein_crawler import HTML_PARSER, extract_cards_from_html, parse_card_html_fallback
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "fixtures", "wein_list_page.html")
+# 기존 extract_card_fields: title / date01 / date02 / status span (+ 누락 시 outerHTML)
+_CALLS_PER_CARD = 4
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=30, help="10페이지 × 3분류 = 30")
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="chromedriver 호출 1회 왕복 시간(ms)")
+    args = parser.parse_args()
+
+    with open(FIXTURE, encoding="utf-8") as f:
+        page = f.read()
+    # 기존 방식은 카드별 outerHTML을 받아 파싱했으므로 카드 HTML을 미리 잘라 둔다
+    card_htmls = [str(li) for li in BeautifulSoup(page, HTML_PARSER).select("ul.ul_box > li")]
+    cards_per_page = len(card_htmls)
+
+    started = time.perf_counter()
+    for _ in range(args.pages):
+        per_card = [parse_card_html_fallback(html) for html in card_htmls]
+    per_card_sec = time.perf_counter() - started
+    per_card_calls = args.pages * (1 + cards_per_page * _CALLS_PER_CARD)
+
+    started = time.perf_counter()
+    for _ in range(args.pages):
+        one_pass = extract_cards_from_html(page)
+    one_pass_sec = time.perf_counter() - started
+    one_pass_calls = args.pages
+
+    assert one_pass == per_card, "한 번 파싱한 결과가 카드별 파싱 결과와 다릅니다"
+    rtt = args.rtt_ms / 1000
+    print(f"pages={args.pages} cards/page={cards_per_page} parser={HTML_PARSER}")
+    print(f"  per-card : parse {per_card_sec:6.3f}s, WebDriver 호출 {per_card_calls:5d}회 → 예상 {per_card_sec + per_card_calls * rtt:6.2f}s")
+    print(f"  one-pass : parse {one_pass_sec:6.3f}s, WebDriver 호출 {one_pass_calls:5d}회 → 예상 {one_pass_sec + one_pass_calls * rtt:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+가벼운 headless Chrome 프로필
+크롤러는 DOM(텍스트/좌표)만 필요하므로 이미지·폰트·미디어·외부 분석 스크립트를 받지 않도록 한다.
+- 실행 인자: 확장/백그라운드 네트워킹/컴포넌트 업데이트 등 크롤링과 무관한 기능을 끈다.
+- 요청 차단: 드라이버 생성 직후 CDP Network.setBlockedURLs로 URL 패턴을 차단한다.
+  (드라이버 세션 동안 유지되므로 BrowserPool이 about:blank로 되돌려도 다시 설정할 필요가 없다)
+레이아웃(좌표)에 의존하는 크롤러는 창 크기/배율을 지정하고 CSS·폰트는 차단 대상에서 뺀다.
+"""
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+CHROME_BINARY = os.getenv("CHROME_BINARY", "/usr/bin/chromium")
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver")
+# 0이면 리소스 차단 없이 기존처럼 모두 받는다 (문제 확인용)
+BROWSER_BLOCK_RESOURCES = os.getenv("BROWSER_BLOCK_RESOURCES", "1") != "0"
+
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.bmp", "*.ico", "*.svg"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg", "*.wav"]
+STYLESHEET_PATTERNS = ["*.css"]
+# 분석/광고/SNS 위젯 등 외부 호스트
+THIRD_PARTY_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*analytics.naver.com*",
+    "*wcs.naver.net*",
+    "*kakao.com/sdk*",
+    "*hotjar.com*",
+]
+DEFAULT_BLOCKED_PATTERNS = IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + THIRD_PARTY_PATTERNS
+
+_LEAN_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--mute-audio",
+]
+
+# 이미지/알림 등 콘텐츠 설정 (2 = 차단)
+_LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+}
+
+
+def lean_chrome_options(
+    window_size=None, device_scale_factor=None, user_agent=None, headless="--headless=new", extra_args=(), block_images=None
+):
+    """
+    가벼운 프로필의 Options.
+    window_size("1920,1080")/device_scale_factor는 레이아웃에 의존하는 크롤러만 지정한다.
+    block_images=None이면 BROWSER_BLOCK_RESOURCES를 따른다.
+    """
+    options = Options()
+    options.add_argument(headless)
+    for arg in _LEAN_ARGS:
+        options.add_argument(arg)
+    if window_size:
+        options.add_argument(f"--window-size={window_size}")
+    if device_scale_factor:
+        options.add_argument(f"--force-device-scale-factor={device_scale_factor}")
+    if user_agent:
+        options.add_argument(f"--user-agent={user_agent}")
+    for arg in extra_args:
+        options.add_argument(arg)
+    if BROWSER_BLOCK_RESOURCES if block_images is None else block_images:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", dict(_LEAN_PREFS))
+    options.binary_location = CHROME_BINARY
+    return options
+
+
+def apply_request_blocking(driver, patterns=None):
+    """CDP로 URL 패턴 차단 설정. 지원하지 않는 드라이버면 False (차단 없이 계속 사용)"""
+    patterns = DEFAULT_BLOCKED_PATTERNS if patterns is None else patterns
+    if not patterns:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        return True
+    except Exception as e:
+        print(f" [Browser] 요청 차단 설정 실패, 차단 없이 진행: {e}")
+        return False
+
+
+def create_lean_driver(blocked_patterns=None, **option_kwargs):
+    """
+    lean_chrome_options로 드라이버를 띄우고 요청 차단을 건다.
+    blocked_patterns=None이면 DEFAULT_BLOCKED_PATTERNS, BROWSER_BLOCK_RESOURCES=0이면 차단하지 않는다.
+    """
+    driver = webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=lean_chrome_options(**option_kwargs))
+    if BROWSER_BLOCK_RESOURCES:
+        apply_request_blocking(driver, blocked_patterns)
+    return driver
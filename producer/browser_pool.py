@@ -0,0 +1,242 @@
+"""
+headless Chrome 드라이버 풀
+메시지마다 Chromium + chromedriver를 새로 띄우지 않고 미리 띄운 드라이버를 빌려 쓴다.
+- lease() 컨텍스트로 빌리고, 반납 시 쿠키/스토리지를 지우고 about:blank로 되돌린다.
+- 빌려줄 때 상태를 확인(health check)해 응답하지 않는 드라이버는 버리고 새로 만든다.
+- BROWSER_MAX_JOBS건을 처리했거나 프로세스 트리 RSS가 BROWSER_MAX_RSS_MB를 넘으면 교체한다.
+- 풀을 만들기 전에 이전 실행이 남긴 고아 chromedriver(init에 입양된 프로세스)를 정리한다.
+  실행 중에는 정리하지 않는다 (다른 스레드가 만들거나 확인 중인 드라이버를 죽이지 않도록).
+"""
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from common.concurrency import EVERYTIME_WORKERS
+
+# 유지할 최대 드라이버 수 (동시에 빌려줄 수 있는 수와 같음, 기본은 동시 브라우저 상한 -> 동기화 워커 수)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", os.getenv("EVERYTIME_MAX_BROWSERS", str(EVERYTIME_WORKERS))))
+# 드라이버 하나로 처리할 최대 작업 수 / 프로세스 트리 메모리 상한(MB)
+BROWSER_MAX_JOBS = int(os.getenv("BROWSER_MAX_JOBS", "50"))
+BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "800"))
+# 풀이 모두 사용 중일 때 기다리는 최대 시간(초)
+BROWSER_LEASE_TIMEOUT_SEC = float(os.getenv("BROWSER_LEASE_TIMEOUT_SEC", "120"))
+
+_PROC = "/proc"
+
+
+def _read_proc(pid, name):
+    try:
+        with open(os.path.join(_PROC, str(pid), name), encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _children(pid):
+    """/proc/<pid>/task/*/children 기준 자식 pid 목록"""
+    children = []
+    task_dir = os.path.join(_PROC, str(pid), "task")
+    try:
+        tids = os.listdir(task_dir)
+    except OSError:
+        return children
+    for tid in tids:
+        children += [int(c) for c in _read_proc(f"{pid}/task/{tid}", "children").split()]
+    return children
+
+
+def process_tree_rss_mb(pid):
+    """pid와 모든 자손 프로세스의 RSS 합계(MB). /proc가 없으면 0"""
+    total_kb = 0
+    stack = [pid]
+    seen = set()
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        for line in _read_proc(current, "status").splitlines():
+            if line.startswith("VmRSS:"):
+                total_kb += int(line.split()[1])
+                break
+        stack += _children(current)
+    return total_kb / 1024
+
+
+def _driver_pid(driver):
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+def kill_orphan_chromedrivers(keep_pids=()):
+    """
+    부모가 init(1)인 chromedriver 프로세스를 종료 (풀을 만들기 전에 한 번 호출).
+    컨테이너에서 현재 프로세스가 PID 1이면 자기 드라이버도 ppid가 1이므로, 살아 있는 드라이버가 없을 때만 호출하거나
+    keep_pids로 제외해야 한다.
+    반환: 종료한 pid 목록
+    """
+    if not os.path.isdir(_PROC):
+        return []
+    me = os.getpid()
+    keep = set(keep_pids)
+    killed = []
+    for entry in os.listdir(_PROC):
+        if not entry.isdigit():
+            continue
+        pid = int(entry)
+        if pid in keep or _read_proc(pid, "comm").strip() != "chromedriver":
+            continue
+        stat = _read_proc(pid, "stat")
+        try:
+            # "pid (comm) state ppid ..." — comm에 공백이 있을 수 있어 마지막 ')' 뒤에서 자른다
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (IndexError, ValueError):
+            continue
+        if ppid != 1:
+            continue
+        try:
+            # 자식 브라우저까지 정리되도록 프로세스 그룹이 따로면 그룹째 종료
+            pgid = os.getpgid(pid)
+            if pgid != os.getpgid(0):
+                os.killpg(pgid, signal.SIGKILL)
+            else:
+                os.kill(pid, signal.SIGKILL)
+            killed.append(pid)
+        except OSError:
+            continue
+        if me == 1:
+            try:
+                os.waitpid(pid, os.WNOHANG)  # 좀비로 남지 않도록 회수
+            except ChildProcessError:
+                pass
+    if killed:
+        print(f" [BrowserPool] 고아 chromedriver {len(killed)}개 종료: {killed}")
+    return killed
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "jobs", "created_at")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.jobs = 0
+        self.created_at = time.monotonic()
+
+
+class BrowserPool:
+    """
+    factory()로 만든 WebDriver를 최대 size개까지 재사용하는 풀 (스레드 안전).
+    사용 예:
+        with pool.lease() as driver:
+            driver.get(url)
+    """
+
+    def __init__(self, factory, size=None, max_jobs=None, max_rss_mb=None, rss_reader=process_tree_rss_mb):
+        self._factory = factory
+        self.size = max(1, size or BROWSER_POOL_SIZE)
+        self.max_jobs = max_jobs or BROWSER_MAX_JOBS
+        self.max_rss_mb = BROWSER_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self._rss_reader = rss_reader
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._closed = False
+
+    @staticmethod
+    def _is_healthy(pooled):
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            print(f" [BrowserPool] 드라이버 종료 실패: {e}")
+
+    def _discard(self, pooled, reason):
+        print(f" [BrowserPool] 드라이버 교체 ({reason}, 처리 {pooled.jobs}건)")
+        self._quit(pooled)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                return _PooledDriver(self._factory())
+            if self._is_healthy(pooled):
+                return pooled
+            self._discard(pooled, "health check 실패")
+
+    @staticmethod
+    def _reset(pooled):
+        """다음 작업에 상태가 넘어가지 않도록 정리. 실패하면 False"""
+        driver = pooled.driver
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # 스토리지는 해당 origin 페이지에 있을 때 지워야 한다 (about:blank에서는 접근 불가)
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            print(f" [BrowserPool] 드라이버 초기화 실패: {e}")
+            return False
+
+    def _checkin(self, pooled):
+        pooled.jobs += 1
+
+        reason = None
+        if self._closed:
+            reason = "풀 종료"
+        elif pooled.jobs >= self.max_jobs:
+            reason = f"최대 작업 수 {self.max_jobs}건 도달"
+        else:
+            pid = _driver_pid(pooled.driver)
+            rss = self._rss_reader(pid) if pid and self.max_rss_mb else 0
+            if rss > self.max_rss_mb:
+                reason = f"메모리 {rss:.0f}MB > {self.max_rss_mb}MB"
+            elif not self._reset(pooled):
+                reason = "초기화 실패"
+
+        if reason:
+            self._discard(pooled, reason)
+        else:
+            with self._lock:
+                self._idle.append(pooled)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """드라이버 하나를 빌려준다. 모두 사용 중이면 timeout초까지 기다린 뒤 RuntimeError"""
+        timeout = BROWSER_LEASE_TIMEOUT_SEC if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise RuntimeError(f"브라우저 풀 대기 시간 초과 ({timeout}초)")
+        try:
+            pooled = self._checkout()
+            try:
+                yield pooled.driver
+            finally:
+                self._checkin(pooled)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """유휴 드라이버를 모두 종료 (빌려 간 드라이버는 반납 시 종료)"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._quit(pooled)
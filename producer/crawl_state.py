@@ -0,0 +1,58 @@
+"""
+위인전 증분 크롤링 상태 (JSON 파일)
+분류별로 지난 사이클에 수집한 카드 목록(목록 순서 그대로, 상태 무관)과 마지막 전체 크롤링 시각을 저장한다.
+  {"일반비교과": {"cards": [{title, apply_period, run_period, site_status}, ...], "full_crawled_at": 1700000000.0}}
+파일이 없거나 깨져 있으면 빈 상태로 시작한다 (= 전체 크롤링).
+"""
+import hashlib
+import json
+import os
+import time
+
+WEIN_CRAWL_STATE_PATH = os.getenv("WEIN_CRAWL_STATE_PATH", "wein_crawl_state.json")
+# 삭제/마감된 프로그램을 반영하기 위해 분류별로 이 주기마다 끝 페이지까지 전체 크롤링 (기본 6시간)
+WEIN_FULL_CRAWL_INTERVAL_SEC = int(os.getenv("WEIN_FULL_CRAWL_INTERVAL_SEC", str(6 * 3600)))
+
+_CARD_FIELDS = ("title", "apply_period", "run_period", "site_status")
+
+
+def card_fingerprint(card):
+    """카드 내용(제목/기간/상태) 해시. 상태가 바뀐 카드는 새 카드로 본다"""
+    raw = "\x1f".join(card.get(k) or "" for k in _CARD_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def load_state(path=None):
+    path = path or WEIN_CRAWL_STATE_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f" [CrawlState] 상태 파일을 읽지 못해 전체 크롤링합니다 ({path}): {e}")
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(state, path=None):
+    """임시 파일에 쓴 뒤 교체 (쓰는 도중 종료돼도 이전 상태가 남도록)"""
+    path = path or WEIN_CRAWL_STATE_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f" [CrawlState] 상태 파일 저장 실패 ({path}): {e}")
+
+
+def needs_full_crawl(category_state, now=None):
+    """저장된 카드가 없거나 마지막 전체 크롤링 후 WEIN_FULL_CRAWL_INTERVAL_SEC가 지났으면 True"""
+    if not category_state or not category_state.get("cards"):
+        return True
+    now = time.time() if now is None else now
+    return now - category_state.get("full_crawled_at", 0) >= WEIN_FULL_CRAWL_INTERVAL_SEC
@@ -1,6 +1,8 @@
 import re
 from datetime import datetime, timedelta, timezone
 
+from common.schedule import parse_run_period
+
 try:
     import wein_crawler as crawler
 except ImportError:
@@ -37,17 +39,21 @@ def fetch_programs(user_id: str, user_pw: str):
     mapped = []
     for item in raw_results:
         start_dt, end_dt = _parse_date_range(item.get("apply_period", ""))
+        run_period = item.get("run_period")
         mapped.append(
             {
                 "title": item.get("title"),
                 "topic": item.get("category"),
                 "apply_start": start_dt,
                 "apply_end": end_dt,
-                "run_time_text": item.get("run_period"),
-                "location": "",
-                "target_audience": "",
-                "mileage": 0,
-                "detail_url": "",
+                "run_time_text": run_period,
+                # 운영 일정은 수집 시점에 한 번만 파싱 (컨슈머는 저장된 정수 값을 그대로 사용)
+                "schedule": parse_run_period(run_period),
+                # 상세 페이지 보강(wein_detail) 결과, 조회하지 못했으면 기본값
+                "location": item.get("location", ""),
+                "target_audience": item.get("target_audience", ""),
+                "mileage": item.get("mileage", 0),
+                "detail_url": item.get("detail_url", ""),
             }
         )
     return mapped
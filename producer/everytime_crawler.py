@@ -1,15 +1,17 @@
 import os
 import re
 import math
+import threading
 from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 
+from browser_options import IMAGE_PATTERNS, MEDIA_PATTERNS, THIRD_PARTY_PATTERNS, create_lean_driver
+from browser_pool import BrowserPool, kill_orphan_chromedrivers
+from everytime_http import EverytimeFetchError, fetch_shared_timetable
+
 # 요일 리스트 (td 인덱스랑 매핑)
 DAYS = ["월", "화", "수", "목", "금", "토", "일"]
 
@@ -302,138 +304,177 @@ def px_to_time_and_slots(top_px, height_px, base_hour, base_top, px_per_hour):
 #          [
 #             { "day": "월", "day_index": 0,
 #               "start": "09:00", "end": "10:30",
-#               "start_slot": 0, "end_slot": 3 },
+#               "start_slot": 0, "end_slot": 3,
+#               "subject_name": "자료구조", "classroom": "공학관 101" },
 #             ...
 #          ]
 # ----------------------------------------------------------------------
 # 공통 헤드리스 옵션을 환경변수로 고정
 CHROME_WINDOW_SIZE = os.getenv("CHROME_WINDOW_SIZE", "1920,1080")
 CHROME_DEVICE_SCALE_FACTOR = os.getenv("CHROME_DEVICE_SCALE_FACTOR", "1")
+# http: 시간표 XML을 직접 조회하고 실패 시 Selenium으로 대체 / selenium: 항상 브라우저 렌더링
+EVERYTIME_FETCH_MODE = os.getenv("EVERYTIME_FETCH_MODE", "http")
+# 시간 매핑이 렌더링된 좌표에 의존하므로 CSS/폰트는 받고 이미지·미디어·외부 스크립트만 차단
+EVERYTIME_BLOCKED_PATTERNS = IMAGE_PATTERNS + MEDIA_PATTERNS + THIRD_PARTY_PATTERNS
+
+
+def subject_details(div):
+    """
+    과목 블록(div.subject) -> (과목명, 강의실)
+    <div class="subject"><h3>자료구조</h3><p><em>교수</em><span>공학관 101</span></p></div>
+    HTTP 조회 결과(everytime_http)와 같은 값을 채워 시간표 해시가 경로에 따라 달라지지 않게 한다.
+    """
+    name_el = div.select_one("h3")
+    place_el = div.select_one("p span")
+    name = name_el.get_text(" ", strip=True) if name_el else ""
+    place = place_el.get_text(" ", strip=True) if place_el else ""
+    return name, place
+
+
+def _create_driver():
+    return create_lean_driver(
+        blocked_patterns=EVERYTIME_BLOCKED_PATTERNS,
+        headless="--headless",
+        window_size=CHROME_WINDOW_SIZE,
+        device_scale_factor=CHROME_DEVICE_SCALE_FACTOR,
+        user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
+    )
+
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """프로세스 전역 드라이버 풀 (처음 호출 시 생성하며 이전 실행이 남긴 chromedriver를 정리)"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            kill_orphan_chromedrivers()
+            _browser_pool = BrowserPool(_create_driver)
+        return _browser_pool
 
 
 def crawl_shared_timetable(url: str):
     if url.startswith("everytime.kr"):
         url = "https://" + url
 
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument(f"--force-device-scale-factor={CHROME_DEVICE_SCALE_FACTOR}")
-    options.add_argument(f"--window-size={CHROME_WINDOW_SIZE}")
-    options.add_argument(
-        "--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
-    )
-    options.binary_location = "/usr/bin/chromium"
+    if EVERYTIME_FETCH_MODE == "http":
+        try:
+            timetable = fetch_shared_timetable(url)
+            print(f"[INFO] HTTP 조회 성공: {len(timetable)}건")
+            return timetable
+        except EverytimeFetchError as e:
+            print(f"[WARN] HTTP 조회 실패 -> Selenium으로 대체: {e}")
 
-    driver = webdriver.Chrome(
-        service=Service("/usr/bin/chromedriver"),
-        options=options,
-    )
+    # 매번 브라우저를 띄우지 않고 풀에서 초기화된 드라이버를 빌려 쓴다
+    with get_browser_pool().lease() as driver:
+        return _crawl_with_driver(driver, url)
 
-    try:
-        print(f"[INFO] 요청 URL: {url}")
-        driver.get(url)
 
-        # 시간표 테이블이 로드될 때까지 대기 (최대 20초)
+def _crawl_with_driver(driver, url: str):
+    print(f"[INFO] 요청 URL: {url}")
+    driver.get(url)
+
+    # 시간표 테이블이 로드될 때까지 대기 (최대 20초)
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table.tablebody"))
+        )
+    except TimeoutException:
+        print("[WARN] 시간표 테이블(table.tablebody)을 찾지 못했습니다.")
+        print(f"[DEBUG] page title: {driver.title}")
         try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "table.tablebody"))
-            )
-        except TimeoutException:
-            print("[WARN] 시간표 테이블(table.tablebody)을 찾지 못했습니다.")
-            print(f"[DEBUG] page title: {driver.title}")
-            try:
-                snippet = driver.page_source[:1000]
-                print(f"[DEBUG] page source snippet: {snippet}")
-            except Exception:
-                pass
-            return []
-
-        html = driver.page_source
-        soup = BeautifulSoup(html, "html.parser")
-
-        # 실좌표 메트릭 수집 (table height, div.time 위치, 과목 위치)
-        layout_metrics = collect_layout_metrics(driver)
-
-        # 1) 과목 블록 먼저 찾기
-        subject_divs = soup.select("div.subject")
-        if not subject_divs:
-            print("[WARN] 과목 블록(div.subject)을 찾지 못했습니다.")
-            return []
-
-        # 2) 왼쪽 시간축 + 과목 top으로 px → 시간 매핑 계산
-        base_hour = base_top = px_per_hour = None
-
-        if layout_metrics:
-            base_hour, base_top, px_per_hour = compute_time_mapping_from_metrics(layout_metrics)
-
-        if px_per_hour is None:
-            base_hour, base_top, px_per_hour = compute_time_mapping(soup, subject_divs)
-
-        print(f"[DEBUG] base_hour={base_hour}, base_top={base_top}, px_per_hour={px_per_hour}")
-
-
-        # 2) 요일 기준 td 리스트
-        td_list = soup.select("table.tablebody tbody tr td")
-
-        # 3) 과목 블록들
-        subject_divs = soup.select("div.subject")
-        if not subject_divs:
-            print("[WARN] 과목 블록(div.subject)을 찾지 못했습니다.")
-            return []
-
-        timetable = []
-        metrics_subjects = layout_metrics.get("subjects") if layout_metrics else []
-        metrics_idx = 0
-
-        for div in subject_divs:
-            # (1) 요일 계산: metrics dayIndex 우선 → soup fallback
-            day_idx = None
-            if metrics_subjects and metrics_idx < len(metrics_subjects):
-                m = metrics_subjects[metrics_idx]
-                if m.get("dayIndex", -1) >= 0:
-                    day_idx = m["dayIndex"]
-
-            if day_idx is None:
-                parent_td = div.find_parent("td")
-                day_idx = td_list.index(parent_td)
-
-            day = DAYS[day_idx]
-
-            # (2) 시간 계산
-            style = div.get("style", "")
-            top_px = parse_style_value(style, "top")
-            height_px = parse_style_value(style, "height")
-
-            if metrics_subjects and metrics_idx < len(metrics_subjects):
-                m = metrics_subjects[metrics_idx]
-                top_px = m.get("top", top_px)
-                height_px = m.get("height", height_px)
-                metrics_idx += 1
-
-            start_time, end_time, start_slot, end_slot = px_to_time_and_slots(
-                top_px, height_px, base_hour, base_top, px_per_hour
-            )
-
-            timetable.append({
-                "day": day,               # 요일 한글 ('월' 등)
-                "day_index": day_idx,     # 0=월,1=화,...
-                "start": start_time,      # "09:00"
-                "end": end_time,          # "10:30"
-                "start_slot": start_slot, # base_hour 기준 30분 단위 슬롯
-                "end_slot": end_slot,
-            })
-
-        print("=== 최종 시간표 ===")
-        for t in timetable:
-            print(t)
-
-        return timetable
-
-    finally:
-        driver.quit()
+            snippet = driver.page_source[:1000]
+            print(f"[DEBUG] page source snippet: {snippet}")
+        except Exception:
+            pass
+        return []
+
+    html = driver.page_source
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 실좌표 메트릭 수집 (table height, div.time 위치, 과목 위치)
+    layout_metrics = collect_layout_metrics(driver)
+
+    # 1) 과목 블록 먼저 찾기
+    subject_divs = soup.select("div.subject")
+    if not subject_divs:
+        print("[WARN] 과목 블록(div.subject)을 찾지 못했습니다.")
+        return []
+
+    # 2) 왼쪽 시간축 + 과목 top으로 px → 시간 매핑 계산
+    base_hour = base_top = px_per_hour = None
+
+    if layout_metrics:
+        base_hour, base_top, px_per_hour = compute_time_mapping_from_metrics(layout_metrics)
+
+    if px_per_hour is None:
+        base_hour, base_top, px_per_hour = compute_time_mapping(soup, subject_divs)
+
+    print(f"[DEBUG] base_hour={base_hour}, base_top={base_top}, px_per_hour={px_per_hour}")
+
+
+    # 2) 요일 기준 td 리스트
+    td_list = soup.select("table.tablebody tbody tr td")
+
+    # 3) 과목 블록들
+    subject_divs = soup.select("div.subject")
+    if not subject_divs:
+        print("[WARN] 과목 블록(div.subject)을 찾지 못했습니다.")
+        return []
+
+    timetable = []
+    metrics_subjects = layout_metrics.get("subjects") if layout_metrics else []
+    metrics_idx = 0
+
+    for div in subject_divs:
+        # (1) 요일 계산: metrics dayIndex 우선 → soup fallback
+        day_idx = None
+        if metrics_subjects and metrics_idx < len(metrics_subjects):
+            m = metrics_subjects[metrics_idx]
+            if m.get("dayIndex", -1) >= 0:
+                day_idx = m["dayIndex"]
+
+        if day_idx is None:
+            parent_td = div.find_parent("td")
+            day_idx = td_list.index(parent_td)
+
+        day = DAYS[day_idx]
+
+        # (2) 시간 계산
+        style = div.get("style", "")
+        top_px = parse_style_value(style, "top")
+        height_px = parse_style_value(style, "height")
+
+        if metrics_subjects and metrics_idx < len(metrics_subjects):
+            m = metrics_subjects[metrics_idx]
+            top_px = m.get("top", top_px)
+            height_px = m.get("height", height_px)
+            metrics_idx += 1
+
+        start_time, end_time, start_slot, end_slot = px_to_time_and_slots(
+            top_px, height_px, base_hour, base_top, px_per_hour
+        )
+
+        subject_name, classroom = subject_details(div)
+
+        timetable.append({
+            "day": day,               # 요일 한글 ('월' 등)
+            "day_index": day_idx,     # 0=월,1=화,...
+            "start": start_time,      # "09:00"
+            "end": end_time,          # "10:30"
+            "start_slot": start_slot, # base_hour 기준 30분 단위 슬롯
+            "end_slot": end_slot,
+            "subject_name": subject_name,
+            "classroom": classroom,
+        })
+
+    print("=== 최종 시간표 ===")
+    for t in timetable:
+        print(t)
+
+    return timetable
 
 
 if __name__ == "__main__":
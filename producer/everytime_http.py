@@ -0,0 +1,143 @@
+"""
+에브리타임 공유 시간표 HTTP 조회 (브라우저 없이)
+공유 페이지(https://everytime.kr/@<identifier>)가 내부적으로 불러오는 XML 문서를 직접 요청해 파싱한다.
+  POST {EVERYTIME_API_BASE}/find/timetable/table/friend  (identifier=<id>&friendInfo=true)
+  <response><table ...><subject>
+      <name value="자료구조"/>
+      <time value="..."><data day="0" starttime="108" endtime="126" place="공학관 101"/></time>
+  </subject>...</table></response>
+day는 0=월, starttime/endtime은 00:00부터의 5분 단위 값이다.
+"""
+import os
+import threading
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.concurrency import EVERYTIME_WORKERS
+
+EVERYTIME_API_BASE = os.getenv("EVERYTIME_API_BASE", "https://api.everytime.kr")
+EVERYTIME_HTTP_TIMEOUT_SEC = float(os.getenv("EVERYTIME_HTTP_TIMEOUT_SEC", "10"))
+# 세션이 유지할 keep-alive 연결 수 (동기화 워커 수 이상)
+EVERYTIME_HTTP_POOL_SIZE = int(os.getenv("EVERYTIME_HTTP_POOL_SIZE", str(EVERYTIME_WORKERS)))
+
+DAYS = ["월", "화", "수", "목", "금", "토", "일"]
+# starttime/endtime 단위(분)
+_TIME_UNIT_MIN = 5
+
+_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class EverytimeFetchError(Exception):
+    """HTTP 조회/파싱 실패 (호출 측은 Selenium 경로로 대체)"""
+
+
+def _get_session():
+    """프로세스 전역 requests 세션 (연결 재사용)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, EVERYTIME_HTTP_POOL_SIZE))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(
+                {
+                    "User-Agent": _USER_AGENT,
+                    "Origin": "https://everytime.kr",
+                    "Referer": "https://everytime.kr/",
+                }
+            )
+            _session = session
+        return _session
+
+
+def identifier_from_url(url: str) -> str:
+    """'https://everytime.kr/@AbCd123' -> 'AbCd123'"""
+    if "://" not in url:
+        url = "https://" + url
+    path = urlparse(url).path
+    for part in path.split("/"):
+        if part.startswith("@") and len(part) > 1:
+            return part[1:]
+    raise EverytimeFetchError(f"공유 시간표 URL이 아닙니다: {url}")
+
+
+def _minutes_to_str(minutes: int) -> str:
+    h, m = divmod(minutes, 60)
+    return f"{h:02d}:{m:02d}"
+
+
+def parse_timetable_xml(xml_text):
+    """
+    friend 시간표 XML -> crawl_shared_timetable과 같은 형식의 리스트
+    (start_slot/end_slot은 가장 이른 수업 시각(정시) 기준 30분 단위)
+    subject_name/classroom도 함께 채운다.
+    """
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError as e:
+        raise EverytimeFetchError(f"XML 파싱 실패: {e}")
+
+    table = root if root.tag == "table" else root.find("table")
+    if table is None:
+        raise EverytimeFetchError("응답에 table 요소가 없습니다 (비공개 시간표 또는 잘못된 URL)")
+
+    sessions = []
+    for subject in table.iter("subject"):
+        name_el = subject.find("name")
+        name = name_el.get("value", "") if name_el is not None else ""
+        for data in subject.iter("data"):
+            try:
+                day_idx = int(data.get("day"))
+                start_min = int(data.get("starttime")) * _TIME_UNIT_MIN
+                end_min = int(data.get("endtime")) * _TIME_UNIT_MIN
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= day_idx < len(DAYS) or end_min <= start_min:
+                continue
+            sessions.append((day_idx, start_min, end_min, name, data.get("place", "")))
+
+    if not sessions:
+        return []
+
+    base_min = min(s[1] for s in sessions) // 60 * 60
+    timetable = []
+    for day_idx, start_min, end_min, name, place in sorted(sessions):
+        timetable.append(
+            {
+                "day": DAYS[day_idx],
+                "day_index": day_idx,
+                "start": _minutes_to_str(start_min),
+                "end": _minutes_to_str(end_min),
+                "start_slot": round((start_min - base_min) / 30),
+                "end_slot": round((end_min - base_min) / 30),
+                "subject_name": name,
+                "classroom": place,
+            }
+        )
+    return timetable
+
+
+def fetch_shared_timetable(url: str, api_base=None, timeout=None):
+    """공유 URL의 시간표를 HTTP로 조회. 실패 시 EverytimeFetchError"""
+    identifier = identifier_from_url(url)
+    endpoint = f"{(api_base or EVERYTIME_API_BASE).rstrip('/')}/find/timetable/table/friend"
+    try:
+        resp = _get_session().post(
+            endpoint,
+            data={"identifier": identifier, "friendInfo": "true"},
+            timeout=timeout or EVERYTIME_HTTP_TIMEOUT_SEC,
+        )
+    except requests.RequestException as e:
+        raise EverytimeFetchError(f"요청 실패: {e}")
+    if resp.status_code != 200:
+        raise EverytimeFetchError(f"HTTP {resp.status_code}")
+    return parse_timetable_xml(resp.content)
@@ -0,0 +1,94 @@
+"""
+크롤러 페이지 대기 헬퍼
+고정 sleep 대신 완료 조건(문서 readyState, 첫 카드 변경, URL 변경)을 짧은 간격으로 확인하고,
+단계(step)별로 실제 대기 시간과 타임아웃 횟수를 집계한다.
+"""
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_INTERVAL_SEC = 0.1
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def _record(step, elapsed, timed_out):
+    with _lock:
+        stat = _stats.setdefault(step, {"count": 0, "total_sec": 0.0, "max_sec": 0.0, "timeouts": 0})
+        stat["count"] += 1
+        stat["total_sec"] += elapsed
+        stat["max_sec"] = max(stat["max_sec"], elapsed)
+        if timed_out:
+            stat["timeouts"] += 1
+
+
+def wait_until(driver, condition, timeout, step):
+    """
+    condition(driver)이 참 값을 돌려줄 때까지 대기하고 그 값을 반환.
+    timeout초 안에 만족하지 않으면 TimeoutException (대기 시간은 step 이름으로 집계)
+    """
+    started = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL_SEC).until(condition)
+    except TimeoutException:
+        _record(step, time.monotonic() - started, True)
+        raise
+    _record(step, time.monotonic() - started, False)
+    return result
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def wait_for_ready(driver, timeout, step="ready"):
+    """문서 로딩 완료(readyState == complete)까지 대기"""
+    return wait_until(driver, document_ready, timeout, step)
+
+
+def first_element_text(driver, selector):
+    """selector에 맞는 첫 요소의 텍스트 (없으면 None). stale element가 생기지 않도록 JS로 읽는다"""
+    return driver.execute_script(
+        "var el = document.querySelector(arguments[0]); return el ? el.textContent : null;", selector
+    )
+
+
+def wait_for_first_change(driver, selector, previous, timeout, step="first_change"):
+    """
+    selector 첫 요소의 텍스트가 previous와 달라질 때까지 대기 (페이지 전환 완료 판단).
+    전환 중 요소가 잠시 사라지는 경우(None)는 완료로 보지 않는다.
+    """
+
+    def changed(d):
+        current = first_element_text(d, selector)
+        return current is not None and current != previous
+
+    return wait_until(driver, changed, timeout, step)
+
+
+def wait_for_url_change(driver, fragment, timeout, step="url_change"):
+    """현재 URL에 fragment가 더 이상 없을 때까지 대기 (예: 로그인 후 login.do를 벗어남)"""
+    return wait_until(driver, lambda d: fragment not in d.current_url, timeout, step)
+
+
+def wait_stats():
+    """{step: {count, total_sec, max_sec, timeouts}} 사본"""
+    with _lock:
+        return {step: dict(stat) for step, stat in _stats.items()}
+
+
+def reset_wait_stats():
+    with _lock:
+        _stats.clear()
+
+
+def log_wait_stats(tag):
+    for step, stat in sorted(wait_stats().items()):
+        avg = stat["total_sec"] / stat["count"] if stat["count"] else 0
+        print(
+            f" [{tag}] 대기 {step}: {stat['count']}회, 합계 {stat['total_sec']:.1f}s,"
+            f" 평균 {avg:.2f}s, 최대 {stat['max_sec']:.2f}s, 타임아웃 {stat['timeouts']}회"
+        )
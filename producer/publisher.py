@@ -2,7 +2,7 @@ import os
 import time
 from typing import Optional
 
-from broker.event_broker import EventBroker
+from broker.event_broker import get_publisher_pool
 
 
 class Publisher:
@@ -15,8 +15,4 @@ class Publisher:
             "timestamp": time.time(),
             "count": count,
         }
-        broker = EventBroker(queue_name=self.queue_name)
-        try:
-            broker.publish(payload)
-        finally:
-            broker.close()
+        get_publisher_pool().publish(self.queue_name, payload)
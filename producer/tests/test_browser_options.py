@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import browser_options  # noqa: E402
+
+
+class CdpDriver:
+    def __init__(self, fail=False):
+        self.commands = []
+        self.fail = fail
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self.fail:
+            raise RuntimeError("cdp unsupported")
+        self.commands.append((cmd, params))
+
+
+def test_lean_options_keep_layout_overrides_and_block_requests_over_cdp():
+    options = browser_options.lean_chrome_options(window_size="1920,1080", device_scale_factor="1", block_images=True)
+    assert "--window-size=1920,1080" in options.arguments
+    assert "--force-device-scale-factor=1" in options.arguments
+    assert "--disable-extensions" in options.arguments and "--disable-background-networking" in options.arguments
+    assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+
+    driver = CdpDriver()
+    assert browser_options.apply_request_blocking(driver, ["*.png", "*.woff2"])
+    assert driver.commands[-1] == ("Network.setBlockedURLs", {"urls": ["*.png", "*.woff2"]})
+    # CDP를 지원하지 않아도 드라이버는 그대로 사용
+    assert not browser_options.apply_request_blocking(CdpDriver(fail=True))
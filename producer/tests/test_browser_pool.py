@@ -0,0 +1,128 @@
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import browser_pool  # noqa: E402
+from browser_pool import BrowserPool  # noqa: E402
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.healthy = True
+        self.cookies_cleared = 0
+        self.visited = []
+        self.window_handles = ["main"]
+        self.switch_to = self
+        self.service = types.SimpleNamespace(process=types.SimpleNamespace(pid=4242))
+
+    def window(self, handle):
+        pass
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("dead")
+        return 1
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _pool(**kwargs):
+    created = []
+
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+
+    kwargs.setdefault("rss_reader", lambda pid: 0)
+    return BrowserPool(factory, **kwargs), created
+
+
+def test_lease_reuses_and_resets_driver():
+    pool, created = _pool(size=1, max_jobs=10)
+    with pool.lease() as first:
+        first.get("https://everytime.kr/@x")
+    with pool.lease() as second:
+        pass
+
+    assert first is second and len(created) == 1
+    assert first.cookies_cleared == 2
+    assert first.visited[-1] == "about:blank"
+
+
+def test_driver_is_recycled_after_max_jobs():
+    pool, created = _pool(size=1, max_jobs=2)
+    for _ in range(3):
+        with pool.lease():
+            pass
+
+    assert len(created) == 2
+    assert created[0].quit_called and not created[1].quit_called
+
+
+def test_unhealthy_or_oversized_driver_is_replaced():
+    pool, created = _pool(size=1, max_jobs=10)
+    with pool.lease() as driver:
+        pass
+    driver.healthy = False
+    with pool.lease() as replacement:
+        pass
+    assert replacement is not driver and driver.quit_called
+
+    big, _ = _pool(size=1, max_jobs=10, max_rss_mb=100, rss_reader=lambda pid: 500)
+    with big.lease() as bloated:
+        pass
+    assert bloated.quit_called
+
+
+def test_lease_times_out_when_pool_is_exhausted():
+    pool, _ = _pool(size=1)
+    with pool.lease():
+        with pytest.raises(RuntimeError):
+            with pool.lease(timeout=0.01):
+                pass
+
+
+def test_discard_replaces_driver_without_orphan_sweep(monkeypatch):
+    sweeps = []
+    monkeypatch.setattr(browser_pool, "kill_orphan_chromedrivers", lambda *a, **k: sweeps.append(a))
+    pool, created = _pool(size=2, max_jobs=10)
+    with pool.lease() as first:
+        pass
+    first.healthy = False
+
+    def dead(script):
+        raise RuntimeError("dead")
+
+    first.execute_script = dead
+    with pool.lease() as second:
+        assert second is not first and first.quit_called
+    # 실행 중 교체는 고아 정리를 부르지 않는다 (다른 스레드의 드라이버를 죽이지 않도록)
+    assert sweeps == []
+    assert len(created) == 2
+
+
+def test_orphan_sweep_only_targets_init_children(monkeypatch, tmp_path):
+    for pid, comm, ppid in ((10, "chromedriver", 1), (11, "chromedriver", 500), (12, "chromedriver", 1), (13, "chromium", 1)):
+        proc = tmp_path / str(pid)
+        proc.mkdir()
+        (proc / "comm").write_text(comm + "\n")
+        (proc / "stat").write_text(f"{pid} ({comm}) S {ppid} {pid} {pid}\n")
+    killed = []
+    monkeypatch.setattr(browser_pool, "_PROC", str(tmp_path))
+    monkeypatch.setattr(browser_pool.os, "getpgid", lambda pid: 0)
+    monkeypatch.setattr(browser_pool.os, "kill", lambda pid, sig: killed.append(pid))
+
+    assert browser_pool.kill_orphan_chromedrivers(keep_pids=[12]) == [10]
+    assert killed == [10]
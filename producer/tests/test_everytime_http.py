@@ -0,0 +1,117 @@
+import contextlib
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import everytime_crawler  # noqa: E402
+import everytime_http  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "everytime_friend_table.xml")
+
+
+@pytest.fixture
+def stub_server():
+    """recorded XML을 돌려주는 로컬 everytime API 스텁"""
+    with open(FIXTURE, "rb") as f:
+        body = f.read()
+    state = {"status": 200, "requests": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            state["requests"].append((self.path, parse_qs(self.rfile.read(length).decode())))
+            self.send_response(state["status"])
+            self.send_header("Content-Type", "text/xml; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(body if state["status"] == 200 else b"")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["base"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+
+
+def test_fetch_shared_timetable_parses_recorded_xml(stub_server):
+    timetable = everytime_http.fetch_shared_timetable("everytime.kr/@AbCd123", api_base=stub_server["base"])
+
+    path, form = stub_server["requests"][0]
+    assert path == "/find/timetable/table/friend"
+    assert form["identifier"] == ["AbCd123"]
+    assert timetable == [
+        {"day": "월", "day_index": 0, "start": "10:00", "end": "11:30", "start_slot": 2, "end_slot": 5,
+         "subject_name": "자료구조", "classroom": "공학관 301"},
+        {"day": "화", "day_index": 1, "start": "09:00", "end": "10:30", "start_slot": 0, "end_slot": 3,
+         "subject_name": "글쓰기", "classroom": "인문관 105"},
+        {"day": "수", "day_index": 2, "start": "10:00", "end": "11:30", "start_slot": 2, "end_slot": 5,
+         "subject_name": "자료구조", "classroom": "공학관 301"},
+    ]
+
+
+def test_crawl_falls_back_to_selenium_when_http_fails(stub_server, monkeypatch):
+    stub_server["status"] = 500
+    monkeypatch.setattr(everytime_http, "EVERYTIME_API_BASE", stub_server["base"])
+    monkeypatch.setattr(everytime_crawler, "EVERYTIME_FETCH_MODE", "http")
+
+    class FakePool:
+        def lease(self):
+            return contextlib.nullcontext("driver")
+
+    monkeypatch.setattr(everytime_crawler, "get_browser_pool", lambda: FakePool())
+    monkeypatch.setattr(everytime_crawler, "_crawl_with_driver", lambda driver, url: [{"day": "월", "via": driver}])
+
+    assert everytime_crawler.crawl_shared_timetable("everytime.kr/@AbCd123") == [{"day": "월", "via": "driver"}]
+
+
+def test_identifier_from_url_rejects_non_share_urls():
+    assert everytime_http.identifier_from_url("https://everytime.kr/@xyz?ref=1") == "xyz"
+    with pytest.raises(everytime_http.EverytimeFetchError):
+        everytime_http.identifier_from_url("https://everytime.kr/timetable")
+
+
+RENDERED_TABLE = """
+<table class="tablebody"><tbody><tr>
+  <th><div class="times">
+    <div class="time" style="top: 0px;">오전 9시</div><div class="time" style="top: 60px;">오전 10시</div>
+    <div class="time" style="top: 120px;">오전 11시</div><div class="time" style="top: 180px;">오후 12시</div>
+  </div></th>
+  <td><div class="cols"><div class="subject color1" style="top: 60px; height: 90px;">
+    <ul class="status"></ul><h3>자료구조</h3><p><em>김교수</em><span>공학관 301</span></p>
+  </div></div></td>
+  <td><div class="cols"><div class="subject color2" style="top: 0px; height: 90px;">
+    <h3>글쓰기</h3><p><em>이교수</em><span>인문관 105</span></p>
+  </div></div></td>
+</tr></tbody></table>
+"""
+
+
+class RenderedDriver:
+    title = "everytime"
+    page_source = RENDERED_TABLE
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, selector):
+        return object()
+
+    def execute_script(self, script, *args):
+        raise RuntimeError("no layout")  # 좌표 메트릭 없이 style 값으로 계산
+
+
+def test_selenium_path_fills_subject_and_classroom_like_http():
+    timetable = everytime_crawler._crawl_with_driver(RenderedDriver(), "https://everytime.kr/@AbCd123")
+
+    assert [(t["day"], t["start"], t["end"], t["subject_name"], t["classroom"]) for t in timetable] == [
+        ("월", "10:00", "11:30", "자료구조", "공학관 301"),
+        ("화", "09:00", "10:30", "글쓰기", "인문관 105"),
+    ]
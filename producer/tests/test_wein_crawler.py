@@ -0,0 +1,205 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crawl_state  # noqa: E402
+import page_waits  # noqa: E402
+import wein_crawler  # noqa: E402
+import wein_session  # noqa: E402
+
+
+class FakeDriver:
+    def __init__(self):
+        self.cookies = []
+        self.quit_called = False
+
+    def get(self, url):
+        pass
+
+    def get_cookies(self):
+        return [{"name": "JSESSIONID", "value": "abc", "domain": "wein.konkuk.ac.kr", "sameSite": "Lax"}]
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_categories_are_crawled_in_parallel_and_only_failures_are_retried(monkeypatch, tmp_path):
+    drivers = []
+    calls = []
+    lock = threading.Lock()
+    fail_once = {"취창업비교과"}
+
+    def create_driver():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    def crawl_category(driver, list_url, name, max_pages=10, page_state=None, incremental=False):
+        with lock:
+            calls.append(name)
+            if name in fail_once:
+                fail_once.discard(name)
+                raise RuntimeError("timeout")
+        return [{"category": name, "title": f"{name}-1"}]
+
+    monkeypatch.setattr(wein_crawler, "_create_driver", create_driver)
+    monkeypatch.setattr(wein_crawler, "_login", lambda driver, user_id, user_pw: None)
+    monkeypatch.setattr(wein_crawler, "crawl_category", crawl_category)
+    monkeypatch.setattr(wein_crawler, "RETRY_DELAY_SEC", 0)
+    monkeypatch.setattr(wein_crawler, "WEIN_PARALLELISM", 3)
+    monkeypatch.setattr(crawl_state, "WEIN_CRAWL_STATE_PATH", str(tmp_path / "state.json"))
+
+    results = wein_crawler.crawl_weinzon("id", "pw")
+
+    assert [r["category"] for r in results] == ["일반비교과", "취창업비교과", "단과대비교과"]
+    assert sorted(calls) == sorted(["일반비교과", "취창업비교과", "단과대비교과", "취창업비교과"])
+    # 세션 쿠키가 복사되고 모든 드라이버가 종료됨
+    cloned = [d for d in drivers if d.cookies]
+    assert cloned and all(c["name"] == "JSESSIONID" and "sameSite" not in c for d in cloned for c in d.cookies)
+    assert all(d.quit_called for d in drivers)
+
+
+def test_extract_cards_from_html_parses_saved_page_in_one_pass():
+    fixture = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "wein_list_page.html")
+    with open(fixture, encoding="utf-8") as f:
+        cards = wein_crawler.extract_cards_from_html(f.read())
+
+    assert len(cards) == 12
+    assert cards[0]["title"] == "[진로] 나를 찾는 진로 탐색 캠프"
+    assert cards[0]["apply_period"].startswith("신청 : 2025.09.")
+    assert "~" in cards[0]["run_period"]
+    assert [c["site_status"] for c in cards[:5]] == ["신청", "신청", "대기신청", "신청마감", "신청완료"]
+
+
+def _list_page(cards, page_count=1):
+    items = "".join(
+        f'<li><div class="title"><a>{title}</a></div><span class="date01">신청 : 2025.09.01 ~ 2025.09.10</span>'
+        f'<span class="date02">2025.09.15 10:00 ~ 2025.09.15 12:00</span><div class="bottom"><a><span>{status}</span></a></div></li>'
+        for title, status in cards
+    )
+    links = "".join(f'<a href="#" onclick="global.page({n});">{n}</a>' for n in range(1, page_count + 1))
+    return f'<ul class="ul_box">{items}</ul><div class="paging">{links}</div>'
+
+
+class PagedDriver:
+    """global.page(n) 호출에 맞춰 page_source를 바꾸는 목록 페이지 드라이버"""
+
+    current_url = "https://wein.konkuk.ac.kr/list"
+
+    def __init__(self, pages, page_count=None):
+        self.pages = pages
+        self.page_count = page_count or len(pages)
+        self.page = 1
+        self.visited = []
+
+    def get(self, url):
+        self.page = 1
+        self.visited.append(1)
+
+    def execute_script(self, script, *args):
+        if "readyState" in script:
+            return "complete"
+        if "querySelector" in script:
+            cards = self.pages[self.page - 1]
+            return cards[0][0] if cards else None
+        page = args[0]
+        if page > len(self.pages):
+            return None  # 없는 페이지: 목록이 바뀌지 않음
+        self.page = page
+        self.visited.append(page)
+
+    def find_element(self, by, selector):
+        return object()
+
+    @property
+    def page_source(self):
+        return _list_page(self.pages[self.page - 1], self.page_count)
+
+
+def test_incremental_crawl_stops_at_known_page_and_reuses_stored_tail(monkeypatch):
+    page_waits.reset_wait_stats()
+    monkeypatch.setattr(wein_crawler, "WEIN_PAGE_TIMEOUT_SEC", 0.3)
+    first = [[("A", "신청"), ("B", "신청마감")], [("C", "신청"), ("D", "대기신청")], [("E", "신청")]]
+    page_state = {}
+    first_driver = PagedDriver(first)
+    full = wein_crawler.crawl_category(first_driver, "url", "일반비교과", 10, page_state=page_state)
+    assert first_driver.visited == [1, 2, 3]  # 페이지 링크 기준 마지막 페이지까지만 이동
+    assert [r["title"] for r in full] == ["A", "C", "D", "E"]
+    assert len(page_state["cards"]) == 5 and "full_crawled_at" in page_state
+    crawled_at = page_state["full_crawled_at"]
+
+    # 새 카드 N이 앞에 추가되어 뒤 카드가 한 칸씩 밀림: 2페이지(B, C)는 모두 아는 카드이므로 멈춘다
+    second = [[("N", "신청"), ("A", "신청")], [("B", "신청마감"), ("C", "신청")], [("D", "대기신청"), ("E", "신청")]]
+    driver = PagedDriver(second)
+    results = wein_crawler.crawl_category(driver, "url", "일반비교과", 10, page_state=page_state, incremental=True)
+
+    assert driver.visited == [1, 2]
+    page_change = page_waits.wait_stats()["wein.page_change"]
+    assert page_change["count"] == 3 and page_change["timeouts"] == 0  # 없는 페이지로는 이동하지 않음
+    assert [r["title"] for r in results] == ["N", "A", "C", "D", "E"]
+    assert [c["title"] for c in page_state["cards"]] == ["N", "A", "B", "C", "D", "E"]
+    assert page_state["full_crawled_at"] == crawled_at  # 증분 크롤링은 전체 크롤링 시각을 갱신하지 않음
+
+
+def test_page_change_timeout_stops_category_with_collected_cards(monkeypatch):
+    page_waits.reset_wait_stats()
+    monkeypatch.setattr(wein_crawler, "WEIN_PAGE_TIMEOUT_SEC", 0.3)
+    # 링크는 3페이지까지 있지만 3페이지로 이동하지 못함 -> 오류로 보고 2페이지까지만 수집
+    driver = PagedDriver([[("A", "신청")], [("B", "신청")]], page_count=3)
+
+    results = wein_crawler.crawl_category(driver, "url", "일반비교과", 10)
+
+    assert [r["title"] for r in results] == ["A", "B"]
+    assert page_waits.wait_stats()["wein.page_change"]["timeouts"] == 1
+
+
+def test_saved_session_skips_login_and_is_dropped_when_crawl_fails(monkeypatch, tmp_path):
+    saved = [{"name": "JSESSIONID", "value": "saved", "domain": "wein.konkuk.ac.kr"}]
+    session = {"cookies": saved}
+    logins = []
+    attempts = []
+
+    def crawl_category(driver, list_url, name, max_pages=10, page_state=None, incremental=False):
+        attempts.append(driver.cookies)
+        if len(attempts) == 1:
+            raise RuntimeError("session expired")
+        return [{"category": name, "title": f"{name}-1"}]
+
+    monkeypatch.setattr(wein_crawler, "_create_driver", FakeDriver)
+    monkeypatch.setattr(wein_crawler, "_login", lambda driver, user_id, user_pw: logins.append(driver))
+    monkeypatch.setattr(wein_crawler, "crawl_category", crawl_category)
+    monkeypatch.setattr(wein_crawler, "load_session", lambda: session.get("cookies"))
+    monkeypatch.setattr(wein_crawler, "probe_session", lambda cookies: True)
+    monkeypatch.setattr(wein_crawler, "clear_session", lambda: session.pop("cookies", None))
+    monkeypatch.setattr(wein_crawler, "save_session", lambda cookies: session.update(cookies=cookies))
+    monkeypatch.setattr(wein_crawler, "RETRY_DELAY_SEC", 0)
+    monkeypatch.setattr(wein_crawler, "WEIN_PARALLELISM", 1)
+    monkeypatch.setattr(crawl_state, "WEIN_CRAWL_STATE_PATH", str(tmp_path / "state.json"))
+
+    results = wein_crawler.crawl_weinzon("id", "pw")
+
+    assert len(results) == 3
+    # 첫 시도는 저장된 쿠키만 넣고 로그인하지 않음, 실패 후에는 세션을 버리고 로그인
+    assert attempts[0] == saved
+    assert len(logins) == 1
+    assert session["cookies"][0]["value"] == "abc"
+
+
+def test_session_is_stored_encrypted(monkeypatch, tmp_path):
+    fernet = pytest.importorskip("cryptography.fernet")
+    path = tmp_path / "session.bin"
+    monkeypatch.setattr(wein_session, "WEIN_SESSION_PATH", str(path))
+    monkeypatch.setattr(wein_session, "WEIN_SESSION_KEY", fernet.Fernet.generate_key().decode())
+
+    assert wein_session.save_session([{"name": "JSESSIONID", "value": "secret", "sameSite": "Lax"}])
+    assert b"secret" not in path.read_bytes()
+    assert wein_session.load_session() == [{"name": "JSESSIONID", "value": "secret"}]
+
+    monkeypatch.setattr(wein_session, "WEIN_SESSION_KEY", fernet.Fernet.generate_key().decode())
+    assert wein_session.load_session() is None and not path.exists()
@@ -0,0 +1,195 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wein_crawler  # noqa: E402
+import wein_detail  # noqa: E402
+import wein_http_crawler  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def stub_server():
+    """저장된 목록 응답(1페이지 전체 HTML, 2페이지 조각)을 페이지 번호에 맞춰 돌려주는 스텁"""
+    pages = {"1": _read("wein_list_page.html"), "2": _read("wein_list_page2.html")}
+    state = {"requests": [], "logged_in": True}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode())
+            with lock:
+                state["requests"].append((self.path, form, self.headers.get("Cookie")))
+            if not state["logged_in"]:
+                self.send_response(302)
+                self.send_header("Location", "/common/user/login.do")
+                self.end_headers()
+                return
+            body = pages.get(form.get(wein_http_crawler.WEIN_PAGE_PARAM, ["1"])[0], b"")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            body = b'<form><input class="input_id"></form>'
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["origin"] = f"http://127.0.0.1:{server.server_port}/"
+    yield state
+    server.shutdown()
+
+
+def test_http_crawler_fetches_all_pages_with_session_cookies(stub_server):
+    session = wein_http_crawler.create_session([{"name": "JSESSIONID", "value": "abc"}], workers=2)
+
+    results, cards = wein_http_crawler.crawl_category_http(
+        session, wein_crawler.GENL_URL, "일반비교과", max_pages=10, origin=stub_server["origin"]
+    )
+
+    requested = sorted(form[wein_http_crawler.WEIN_PAGE_PARAM][0] for _, form, _ in stub_server["requests"])
+    assert requested == ["1", "2"]  # 페이지 링크 기준 마지막 페이지까지만 요청
+    assert {path for path, _, _ in stub_server["requests"]} == {
+        "/ptfol/imng/comprSbjtMngt/icmpNsbjtApl/genl/findTotPcondList.do"
+    }
+    assert all(cookie == "JSESSIONID=abc" for _, _, cookie in stub_server["requests"])
+    assert len(cards) == 14 and cards[-1]["title"] == "[글로벌] 외국인 유학생 버디 프로그램"
+    assert len(results) == 9
+    assert results[-1] == {
+        "category": "일반비교과",
+        "title": "[봉사] 지역아동센터 학습 멘토링",
+        "apply_period": "신청 : 2025.09.20 ~ 2025.09.24",
+        "run_period": "운영 : 2025.09.30 16:00 ~ 2025.09.30 18:00",
+        "site_status": "신청",
+        "program_id": "20250012",
+    }
+
+
+def test_expired_session_raises_fetch_error(stub_server):
+    stub_server["logged_in"] = False
+    session = wein_http_crawler.create_session([{"name": "JSESSIONID", "value": "old"}])
+
+    with pytest.raises(wein_http_crawler.WeinFetchError):
+        wein_http_crawler.crawl_category_http(
+            session, wein_crawler.GENL_URL, "일반비교과", origin=stub_server["origin"]
+        )
+
+
+def test_detail_enrichment_fills_program_columns_and_caches_by_program(monkeypatch, tmp_path):
+    body = _read("wein_detail_page.html")
+    requested = []
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                requested.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(wein_detail, "WEIN_DETAIL_URL", f"http://127.0.0.1:{server.server_port}/detail?id={{program_id}}")
+    monkeypatch.setattr(wein_detail, "WEIN_DETAIL_CACHE_PATH", str(tmp_path / "detail_cache.json"))
+
+    def items():
+        return [
+            {"category": "일반비교과", "title": "캠프", "run_period": "운영 : 2025.09.11", "program_id": "20250000"},
+            {"category": "취창업비교과", "title": "캠프", "run_period": "운영 : 2025.09.11", "program_id": "20250000"},
+            {"category": "일반비교과", "title": "특강", "run_period": "운영 : 2025.09.12", "program_id": "20250001"},
+            {"category": "일반비교과", "title": "번호 없음", "run_period": "", "program_id": ""},
+        ]
+
+    try:
+        enriched = wein_detail.enrich_programs(items(), cookies=[{"name": "JSESSIONID", "value": "abc"}], workers=2)
+        assert sorted(requested) == ["/detail?id=20250000", "/detail?id=20250001"]  # 같은 프로그램은 한 번만
+        assert enriched[0]["location"] == "새천년관 B101호"
+        assert enriched[0]["target_audience"] == "학부 재학생 (1~2학년 우선)"
+        assert enriched[0]["mileage"] == 20
+        assert enriched[0]["detail_url"].endswith("/detail?id=20250000")
+        assert enriched[3]["location"] == "" and enriched[3]["mileage"] == 0
+
+        # 내용이 그대로인 프로그램은 캐시에서 채우고 다시 조회하지 않음
+        again = wein_detail.enrich_programs(items(), cookies=[])
+        assert len(requested) == 2
+        assert again[2]["mileage"] == 20
+    finally:
+        server.shutdown()
+
+
+def test_detail_page_without_fields_is_not_cached(monkeypatch, tmp_path):
+    body = b"<html><body><p>maintenance</p></body></html>"
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(wein_detail, "WEIN_DETAIL_URL", f"http://127.0.0.1:{server.server_port}/detail?id={{program_id}}")
+    monkeypatch.setattr(wein_detail, "WEIN_DETAIL_CACHE_PATH", str(tmp_path / "detail_cache.json"))
+
+    def items():
+        return [{"category": "일반비교과", "title": "캠프", "run_period": "운영 : 2025.09.11", "program_id": "20250000"}]
+
+    try:
+        enriched = wein_detail.enrich_programs(items(), cookies=[], workers=1)
+        assert enriched[0]["location"] == "" and enriched[0]["mileage"] == 0
+        assert wein_detail.load_cache() == {}
+
+        # 빈 결과는 캐시되지 않았으므로 다음 사이클에 다시 조회
+        wein_detail.enrich_programs(items(), cookies=[], workers=1)
+        assert len(requested) == 2
+    finally:
+        server.shutdown()
+
+
+def test_detail_enrichment_is_off_by_default(monkeypatch):
+    called = []
+    monkeypatch.setattr(wein_detail, "enrich_programs", lambda results, cookies=None: called.append(results))
+    results = [{"title": "캠프", "program_id": "20250000"}]
+
+    assert wein_crawler._enrich_with_details(results, []) is results
+    assert called == []
+
+    monkeypatch.setattr(wein_crawler, "WEIN_DETAIL_ENRICH", True)
+    wein_crawler._enrich_with_details(results, [])
+    assert called == [results]
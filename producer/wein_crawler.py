@@ -1,13 +1,24 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from browser_options import DEFAULT_BLOCKED_PATTERNS, STYLESHEET_PATTERNS, create_lean_driver
+from crawl_state import card_fingerprint, load_state, needs_full_crawl, save_state
+from page_waits import (
+    first_element_text,
+    log_wait_stats,
+    reset_wait_stats,
+    wait_for_first_change,
+    wait_for_ready,
+    wait_for_url_change,
+    wait_until,
+)
+from wein_session import clean_cookie, clear_session, load_session, probe_session, save_session
 
 # 로그인 페이지
 LOGIN_URL = "https://wein.konkuk.ac.kr/common/user/login.do"
@@ -17,69 +28,91 @@ GENL_URL = "https://wein.konkuk.ac.kr/redirect?url=/ptfol/imng/comprSbjtMngt/icm
 EMPLYM_URL = "https://wein.konkuk.ac.kr/redirect?url=/ptfol/imng/comprSbjtMngt/icmpNsbjtApl/emplym/findTotPcondList.do"
 GRUPDPT_URL = "https://wein.konkuk.ac.kr/redirect?url=/ptfol/imng/comprSbjtMngt/icmpNsbjtApl/grupDpt/findTotPcondList.do"
 
+WEIN_ORIGIN = "https://wein.konkuk.ac.kr/"
+
+# (목록 URL, 분류 이름) — 결과는 이 순서대로 합친다
+CATEGORIES = [
+    (GENL_URL, "일반비교과"),
+    (EMPLYM_URL, "취창업비교과"),
+    (GRUPDPT_URL, "단과대비교과"),
+]
+
 MAX_PAGES = 10
+# 동시에 크롤링할 분류 수 (1이면 로그인한 드라이버 하나로 순차 크롤링)
+WEIN_PARALLELISM = int(os.getenv("WEIN_PARALLELISM", str(len(CATEGORIES))))
 # 크롤링 전체 재시도 횟수/딜레이
 RETRY_ATTEMPTS = 3
 RETRY_DELAY_SEC = 3
+# selenium: 브라우저로 global.page(n) 호출 / http: 목록 요청을 직접 보내고 실패 시 selenium으로 대체
+WEIN_FETCH_MODE = os.getenv("WEIN_FETCH_MODE", "selenium")
+# 1이면 목록 수집 후 상세 페이지로 장소/대상/마일리지를 보강 (wein_detail, 기본 꺼짐)
+WEIN_DETAIL_ENRICH = os.getenv("WEIN_DETAIL_ENRICH", "0") == "1"
+# 단계별 대기 상한(초): 페이지 로딩/카드 표시/페이지 전환, 로그인 후 이동
+WEIN_PAGE_TIMEOUT_SEC = float(os.getenv("WEIN_PAGE_TIMEOUT_SEC", "10"))
+WEIN_LOGIN_TIMEOUT_SEC = float(os.getenv("WEIN_LOGIN_TIMEOUT_SEC", "10"))
+
+# 목록은 page_source 파싱과 JS 호출(global.page)만 쓰므로 스타일시트까지 차단
+WEIN_BLOCKED_PATTERNS = DEFAULT_BLOCKED_PATTERNS + STYLESHEET_PATTERNS
+
+CARD_SELECTOR = "div.tab_wrap div.ul_list_wrap ul.ul_box > li"
+
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:  # lxml이 없으면 내장 파서 사용 (결과는 같고 속도만 느림)
+    HTML_PARSER = "html.parser"
+
+# 카드 목록(ul.ul_box)만 파싱해 헤더/푸터 등 나머지 페이지는 트리로 만들지 않는다
+_CARD_LIST_STRAINER = SoupStrainer("ul", class_="ul_box")
+_APPLY_CLASS = re.compile("date01")
+_RUN_CLASS = re.compile("date02")
+_BTN_CLASS = re.compile("btn")
+_PERIOD_PATTERN = re.compile(r"\d{4}\.\d{2}\.\d{2}\s*~\s*\d{4}\.\d{2}\.\d{2}")
+_WHITESPACE = re.compile(r"\s+")
+# 제목 링크의 상세 보기 호출: onclick="global.detail('20250000');"
+_DETAIL_ID_PATTERN = re.compile(r"global\.detail\(\s*'?([\w-]+)'?")
+# 페이지 이동 링크: onclick="global.page(3);"
+_PAGE_LINK = re.compile(r"global\.page\(\s*'?(\d+)'?\s*\)")
+
+
+def _status_from_text(raw_text):
+    """버튼 문구 -> 신청완료 / 대기신청 / 신청마감 / 신청 / ''"""
+    norm = _WHITESPACE.sub("", raw_text)
+    if "신청완료" in norm: return "신청완료"
+    if "대기신청" in norm or ("대기" in norm and "신청" in norm): return "대기신청"
+    if "신청마감" in norm or "마감" in norm: return "신청마감"
+    if "신청" in norm or "접수" in norm: return "신청"
+    return ""
+
+
+def _parse_card(card):
+    """
+    카드(li) BeautifulSoup 요소 -> dict(title, apply_period, run_period, site_status, program_id)
+    기본 셀렉터를 먼저 보고, 없으면 느슨한 셀렉터/정규식으로 보완한다.
+    program_id는 상세 페이지 조회용 사이트 내부 번호 (없으면 "")
+    """
+    title_el = card.select_one("div.text_box div.title a") or card.select_one("div.title a")
+    title = title_el.get_text().strip() if title_el else ""
+    detail_id = _DETAIL_ID_PATTERN.search(" ".join(title_el.get(k, "") for k in ("onclick", "href"))) if title_el else None
 
-def extract_status_from_card(card):
-    try:
-        raw_text = ""
-        try:
-            btn_span = card.find_element(By.CSS_SELECTOR, "div.bottom a span")
-            raw_text = btn_span.text.strip()
-        except:
-            try:
-                bottom = card.find_element(By.CSS_SELECTOR, "div.bottom")
-                raw_text = bottom.text.strip()
-            except:
-                return ""
+    apply_el = card.select_one("span.date01") or card.find("span", class_=_APPLY_CLASS)
+    apply_period = apply_el.get_text().strip() if apply_el else ""
 
-        norm = re.sub(r"\s+", "", raw_text)
-        if "신청완료" in norm: return "신청완료"
-        if "대기신청" in norm or ("대기" in norm and "신청" in norm): return "대기신청"
-        if "신청마감" in norm or "마감" in norm: return "신청마감"
-        if "신청" in norm or "접수" in norm: return "신청"
-        return ""
-    except:
-        return ""
+    run_el = card.select_one("span.date02") or card.find("span", class_=_RUN_CLASS)
+    run_period = run_el.get_text().strip() if run_el else ""
 
+    status_el = (
+        card.select_one("div.bottom a span")
+        or card.select_one("div.bottom")
+        or card.select_one("div.btn_wrap")
+        or card.find("a", class_=_BTN_CLASS)
+    )
+    site_status = _status_from_text(status_el.get_text()) if status_el else ""
 
-def parse_card_html_fallback(html: str):
-    """
-    HTML 문자열을 받아 여러 셀렉터/정규식으로 정보 추출 (fallback 파서)
-    반환: dict(title, apply_period, run_period, site_status)
-    """
-    soup = BeautifulSoup(html, "html.parser")
-
-    # fallback 1: 기존 구조 유사
-    title_el = soup.select_one("div.text_box div.title a") or soup.select_one("div.title a")
-    title = title_el.text.strip() if title_el else ""
-
-    apply_el = soup.select_one("span.date01") or soup.find("span", class_=re.compile("date01"))
-    apply_period = apply_el.text.strip() if apply_el else ""
-
-    run_el = soup.select_one("span.date02") or soup.find("span", class_=re.compile("date02"))
-    run_period = run_el.text.strip() if run_el else ""
-
-    bottom_el = soup.select_one("div.bottom") or soup.select_one("div.btn_wrap") or soup.find("a", class_=re.compile("btn"))
-    status_text = bottom_el.text.strip() if bottom_el else ""
-    norm = re.sub(r"\s+", "", status_text)
-    if "신청완료" in norm:
-        site_status = "신청완료"
-    elif "대기신청" in norm or ("대기" in norm and "신청" in norm):
-        site_status = "대기신청"
-    elif "신청마감" in norm or "마감" in norm:
-        site_status = "신청마감"
-    elif "신청" in norm or "접수" in norm:
-        site_status = "신청"
-    else:
-        site_status = ""
-
-    # fallback 2: 정규식으로 날짜만이라도 뽑기
+    # 정규식으로 날짜만이라도 뽑기
     if not apply_period:
-        text_all = soup.get_text(" ", strip=True)
-        m = re.search(r"\d{4}\.\d{2}\.\d{2}\s*~\s*\d{4}\.\d{2}\.\d{2}", text_all)
+        m = _PERIOD_PATTERN.search(card.get_text(" ", strip=True))
         if m:
             apply_period = m.group(0)
 
@@ -88,70 +121,58 @@ def parse_card_html_fallback(html: str):
         "apply_period": apply_period,
         "run_period": run_period,
         "site_status": site_status,
+        "program_id": detail_id.group(1) if detail_id else "",
     }
 
 
-def extract_card_fields(card):
+def parse_card_html_fallback(html: str):
     """
-    기본 셀렉터 시도 후 실패/누락 시 fallback 파서 사용.
+    카드 하나의 HTML 문자열을 받아 여러 셀렉터/정규식으로 정보 추출
+    반환: dict(title, apply_period, run_period, site_status, program_id)
     """
-    title = ""
-    apply_period = ""
-    run_period = ""
-    site_status = ""
+    return _parse_card(BeautifulSoup(html, HTML_PARSER))
 
-    # 기본 시도 (selenium)
-    try:
-        title_el = card.find_element(By.CSS_SELECTOR, "div.text_box div.title a")
-        title = title_el.text.strip()
-    except Exception:
-        pass
 
-    try:
-        date_apply_el = card.find_element(By.CSS_SELECTOR, "p.date span.date01")
-        apply_period = date_apply_el.text.strip()
-    except Exception:
-        pass
+def extract_cards_from_html(html: str):
+    """
+    목록 페이지 HTML(page_source) 한 번으로 모든 카드 정보를 추출.
+    카드마다 WebDriver에 find_element를 보내지 않으므로 페이지당 chromedriver 왕복은 한 번이다.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_CARD_LIST_STRAINER)
+    return [_parse_card(li) for li in soup.select("ul.ul_box > li")]
 
-    try:
-        date_run_el = card.find_element(By.CSS_SELECTOR, "p.date span.date02")
-        run_period = date_run_el.text.strip()
-    except Exception:
-        pass
 
-    site_status = extract_status_from_card(card)
+def last_page_number(html):
+    """페이지 링크(global.page(n)) 중 가장 큰 번호, 링크가 없으면 1"""
+    return max((int(n) for n in _PAGE_LINK.findall(html)), default=1)
 
-    # fallback 사용: 누락된 필드가 있으면 HTML 파서로 보완
-    if not (title and apply_period and run_period and site_status):
-        try:
-            html = card.get_attribute("outerHTML")
-            parsed = parse_card_html_fallback(html)
-            title = title or parsed.get("title", "")
-            apply_period = apply_period or parsed.get("apply_period", "")
-            run_period = run_period or parsed.get("run_period", "")
-            site_status = site_status or parsed.get("site_status", "")
-        except Exception:
-            pass
-
-    return title, apply_period, run_period, site_status
-def crawl_category(driver, list_url, category_name, max_pages=10):
+
+def crawl_category(driver, list_url, category_name, max_pages=10, page_state=None, incremental=False):
     """
     이미 로그인된 driver를 받아서,
     해당 비교과 목록 페이지를 1페이지 ~ max_pages 페이지까지 크롤링한다.
-    리턴: [{category, title, apply_period, run_period, site_status}, ...]
+    (1페이지의 페이지 링크로 마지막 페이지를 확인해 그 뒤로는 이동하지 않는다)
+    page_state(분류별 crawl_state dict)가 있으면 이번에 본 카드 목록을 저장하고,
+    incremental이면 지난 사이클에 저장한 카드만으로 이루어진 페이지에서 멈춘 뒤 나머지는 저장된 목록으로 채운다.
+    (새 카드는 목록 앞쪽에 추가되므로 뒤 페이지가 밀리더라도 카드 단위로 비교한다)
+    리턴: [{category, title, apply_period, run_period, site_status, program_id}, ...]
     """
-    results = []
+    previous = (page_state or {}).get("cards") if incremental else None
+    known = {card_fingerprint(c): i for i, c in enumerate(previous)} if previous else {}
+    seen = []
+    stopped_early = False
 
     print("\n==============================")
-    print(f"[{category_name}] 크롤링 시작")
+    print(f"[{category_name}] 크롤링 시작{' (증분)' if known else ''}")
     print(f"목록 URL: {list_url}")
     print("==============================")
 
-    # 1페이지 진입
+    # 1페이지 진입 (redirect 페이지를 거치므로 문서 로딩 완료까지 확인)
     driver.get(list_url)
-    time.sleep(2)
+    wait_for_ready(driver, WEIN_PAGE_TIMEOUT_SEC, step="wein.list_ready")
     print(" → 1페이지 접속 완료, 현재 URL:", driver.current_url)
 
+    last_page = max_pages
     for page in range(1, max_pages + 1):
         print(f"\n--- {category_name} : {page} 페이지 ---")
 
@@ -159,108 +180,281 @@ def crawl_category(driver, list_url, category_name, max_pages=10):
             #  로컬에서 잘 되는 방식 그대로 사용: global.page(page)
             try:
                 print(f"  → {page}페이지로 이동 (global.page 사용)")
+                first_card = first_element_text(driver, CARD_SELECTOR)
                 driver.execute_script("return global.page(arguments[0]);", page)
-                time.sleep(2)  # 페이지 전환 대기
+                # 첫 카드가 바뀌면 페이지 전환 완료 (타임아웃은 전환 실패)
+                wait_for_first_change(driver, CARD_SELECTOR, first_card, WEIN_PAGE_TIMEOUT_SEC, step="wein.page_change")
             except Exception as e:
                 print(f" → {page} 페이지로 이동 실패. 여기까지 크롤링하고 이 분류는 종료. ({e})")
                 break
 
         # 카드(li)가 로딩될 때까지 대기
         try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "div.tab_wrap div.ul_list_wrap ul.ul_box li")
-                )
+            wait_until(
+                driver,
+                EC.presence_of_element_located((By.CSS_SELECTOR, CARD_SELECTOR)),
+                WEIN_PAGE_TIMEOUT_SEC,
+                step="wein.cards",
             )
         except Exception as e:
             print(" → 카드 로딩 대기 중 에러, 이 분류는 여기까지.:", e)
             break
 
-        cards = driver.find_elements(
-            By.CSS_SELECTOR,
-            "div.tab_wrap div.ul_list_wrap ul.ul_box > li"
-        )
+        # 페이지 소스를 한 번만 받아 카드 전체를 프로세스 안에서 파싱
+        html = driver.page_source
+        cards = extract_cards_from_html(html)
         print(f" → 카드 {len(cards)}개 발견")
+        seen += cards
+        if page == 1:
+            last_page = min(max_pages, last_page_number(html))
+            print(f" → 마지막 페이지: {last_page}")
+
+        # 페이지의 카드가 모두 지난 사이클에 본 그대로면 이후 페이지는 저장된 목록과 같다고 본다
+        fingerprints = [card_fingerprint(c) for c in cards]
+        if known and fingerprints and all(fp in known for fp in fingerprints):
+            tail = previous[known[fingerprints[-1]] + 1:]
+            print(f" → 지난 사이클과 같은 페이지, 이후 {len(tail)}개는 저장된 목록 사용")
+            seen += tail
+            stopped_early = True
+            break
 
-        for idx, card in enumerate(cards, start=1):
-            title, apply_period, run_period, status = extract_card_fields(card)
-
-            # "신청" / "대기신청"만 수집
-            if status not in ("신청", "대기신청"):
-                continue
-
-            results.append(
-                {
-                    "category": category_name,
-                    "title": title,
-                    "apply_period": apply_period,
-                    "run_period": run_period,
-                    "site_status": status,
-                }
-            )
+        if page >= last_page:
+            break
+
+    results = [
+        {"category": category_name, **card}
+        for card in seen
+        # "신청" / "대기신청"만 수집
+        if card["site_status"] in ("신청", "대기신청")
+    ]
+
+    if page_state is not None:
+        page_state["cards"] = seen
+        if not stopped_early:
+            page_state["full_crawled_at"] = time.time()
 
     print(f"\n[{category_name}] 크롤링 종료. 총 {len(results)}개 수집.")
     return results
 
 
 
-def crawl_weinzon(user_id, user_pw):
+def _create_driver():
+    # [중요] Docker 환경설정 (chromium 경로는 browser_options의 CHROME_BINARY/CHROMEDRIVER_PATH)
+    return create_lean_driver(blocked_patterns=WEIN_BLOCKED_PATTERNS, window_size="1920,1080")
+
+
+def _login(driver, user_id, user_pw):
+    print(" [Login] 로그인 페이지 접속...")
+    driver.get(LOGIN_URL)
+
+    # [수정] 입력창이 뜰 때까지 최대 WEIN_LOGIN_TIMEOUT_SEC초 대기 (안전장치)
+    id_input = wait_until(
+        driver,
+        EC.presence_of_element_located((By.CSS_SELECTOR, "input.input_id")),
+        WEIN_LOGIN_TIMEOUT_SEC,
+        step="wein.login_form",
+    )
+    pw_input = driver.find_element(By.CSS_SELECTOR, "input.input_pw")
+    login_btn = driver.find_element(By.CSS_SELECTOR, "#loginBtn")
+
+    print(" [Login] 아이디/비번 입력 중...")
+    id_input.clear()
+    id_input.send_keys(str(user_id))
+    pw_input.clear()
+    pw_input.send_keys(str(user_pw))
+
+    login_btn.click()
+
+    # 로그인 성공 체크: 로그인 처리 후 login.do를 벗어나야 성공
+    try:
+        wait_for_url_change(driver, "login.do", WEIN_LOGIN_TIMEOUT_SEC, step="wein.login")
+    except TimeoutException:
+        raise RuntimeError("로그인 실패 (아이디/비번 확인 필요)")
+
+
+def _driver_with_session(cookies):
+    """로그인한 드라이버의 쿠키를 복사해 같은 세션을 쓰는 새 드라이버 생성"""
+    driver = _create_driver()
+    try:
+        # 쿠키는 해당 도메인 페이지에 있을 때만 추가할 수 있다
+        driver.get(WEIN_ORIGIN)
+        for cookie in cookies:
+            driver.add_cookie(clean_cookie(cookie))
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def _start_session(user_id, user_pw):
     """
-    로그인부터 수집까지 실패 시 재시도하며, 파싱 실패는 fallback 파서로 보완.
+    로그인된 드라이버와 저장된 세션 재사용 여부를 반환.
+    저장된 세션이 probe 요청으로 유효하면 쿠키만 넣고, 아니면 로그인 폼으로 로그인한 뒤 세션을 저장한다.
     """
-    for attempt in range(1, RETRY_ATTEMPTS + 1):
-        driver = None
-        try:
-            # [중요] Docker 환경설정
-            options = Options()
-            options.add_argument("--headless=new")  # [수정] 최신 헤드리스 모드 사용
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
+    cookies = load_session()
+    if cookies and probe_session(cookies):
+        print(" [Session] 저장된 로그인 세션 재사용")
+        return _driver_with_session(cookies), True
 
-            # Docker 내부 경로 지정
-            options.binary_location = "/usr/bin/chromium"
-            service = Service("/usr/bin/chromedriver")
+    driver = _create_driver()
+    try:
+        _login(driver, user_id, user_pw)
+    except Exception:
+        driver.quit()
+        raise
+    save_session(driver.get_cookies())
+    return driver, False
 
-            # 드라이버 실행
-            driver = webdriver.Chrome(service=service, options=options)
 
-            all_results = []
-            print(" [Login] 로그인 페이지 접속...")
-            driver.get(LOGIN_URL)
+def _crawl_one(driver, cookies, list_url, category_name, page_state=None, incremental=False):
+    """분류 하나를 크롤링. driver가 없으면 세션을 복사한 드라이버를 새로 띄우고 끝나면 종료"""
+    own_driver = driver is None
+    if own_driver:
+        driver = _driver_with_session(cookies)
+    try:
+        return crawl_category(driver, list_url, category_name, MAX_PAGES, page_state=page_state, incremental=incremental)
+    finally:
+        if own_driver:
+            driver.quit()
 
-            # [수정] 입력창이 뜰 때까지 최대 10초 대기 (안전장치)
-            wait = WebDriverWait(driver, 10)
-            id_input = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input.input_id")))
-            pw_input = driver.find_element(By.CSS_SELECTOR, "input.input_pw")
-            login_btn = driver.find_element(By.CSS_SELECTOR, "#loginBtn")
 
-            print(" [Login] 아이디/비번 입력 중...")
-            id_input.clear()
-            id_input.send_keys(str(user_id))
-            pw_input.clear()
-            pw_input.send_keys(str(user_pw))
+def _crawl_categories(driver, categories, parallelism, states=None):
+    """
+    분류별로 크롤링하고 ({분류 이름: 결과}, [실패한 분류 이름]) 반환.
+    parallelism > 1이면 첫 분류는 로그인한 driver로, 나머지는 쿠키를 복사한 드라이버로 동시에 진행한다.
+    한 분류의 실패는 다른 분류에 영향을 주지 않는다.
+    states({분류 이름: (page_state, incremental)})가 있으면 분류별 증분 크롤링 상태를 넘긴다.
+    """
+    states = states or {}
+    done, failed = {}, []
+    if parallelism <= 1 or len(categories) <= 1:
+        for list_url, name in categories:
+            page_state, incremental = states.get(name, (None, False))
+            try:
+                done[name] = crawl_category(
+                    driver, list_url, name, MAX_PAGES, page_state=page_state, incremental=incremental
+                )
+            except Exception as e:
+                print(f" [Error] [{name}] 크롤링 실패: {e}")
+                failed.append(name)
+        return done, failed
+
+    cookies = driver.get_cookies()
+    with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="wein-category") as executor:
+        futures = [
+            (
+                name,
+                executor.submit(
+                    _crawl_one, driver if i == 0 else None, cookies, list_url, name, *states.get(name, (None, False))
+                ),
+            )
+            for i, (list_url, name) in enumerate(categories)
+        ]
+        for name, future in futures:
+            try:
+                done[name] = future.result()
+            except Exception as e:
+                print(f" [Error] [{name}] 크롤링 실패: {e}")
+                failed.append(name)
+    return done, failed
 
-            login_btn.click()
-            time.sleep(2)  # 로그인 처리 대기
 
-            # 로그인 성공 체크
-            if "login.do" in driver.current_url:
-                raise RuntimeError("로그인 실패 (아이디/비번 확인 필요)")
+def _crawl_weinzon_http(user_id, user_pw, states):
+    """
+    브라우저 없이 분류별 목록을 HTTP로 수집 (wein_http_crawler).
+    저장된 세션이 없거나 만료됐으면 브라우저로 한 번 로그인해 쿠키만 가져온다. 실패하면 None
+    """
+    import wein_http_crawler
+
+    try:
+        cookies = load_session()
+        if not (cookies and probe_session(cookies)):
+            driver = _create_driver()
+            try:
+                _login(driver, user_id, user_pw)
+                cookies = driver.get_cookies()
+            finally:
+                driver.quit()
+            save_session(cookies)
+
+        session = wein_http_crawler.create_session(cookies)
+        all_results = []
+        for list_url, name in CATEGORIES:
+            results, cards = wein_http_crawler.crawl_category_http(session, list_url, name, MAX_PAGES)
+            page_state = states[name][0]
+            page_state["cards"] = cards
+            page_state["full_crawled_at"] = time.time()
+            all_results += results
+    except Exception as e:
+        print(f" [WARN] HTTP 크롤링 실패 -> Selenium으로 대체: {e}")
+        return None
+    return _enrich_with_details(all_results, cookies)
+
+
+def _enrich_with_details(results, cookies):
+    """상세 페이지로 장소/대상/마일리지 보강 (wein_detail, WEIN_DETAIL_ENRICH일 때만). 실패해도 목록 결과는 그대로 반환"""
+    if not WEIN_DETAIL_ENRICH:
+        return results
+    import wein_detail
+
+    try:
+        return wein_detail.enrich_programs(results, cookies=cookies)
+    except Exception as e:
+        print(f" [Detail] 상세 보강 실패, 목록 정보만 저장합니다: {e}")
+        return results
+
 
-            print(" [Login] 성공! 크롤링 시작...")
+def crawl_weinzon(user_id, user_pw):
+    """
+    로그인부터 수집까지 실패 시 재시도하며, 파싱 실패는 fallback 파서로 보완.
+    분류는 WEIN_PARALLELISM개까지 동시에 크롤링하고, 재시도 시에는 실패한 분류만 다시 수집한다.
+    (일부 분류만 저장하면 save_programs가 나머지 분류를 지우므로 모든 분류가 성공해야 결과를 반환)
+    지난 사이클의 카드 목록(crawl_state)이 있으면 이미 본 페이지에서 멈추는 증분 크롤링을 하고,
+    분류별로 WEIN_FULL_CRAWL_INTERVAL_SEC마다 한 번은 끝 페이지까지 전체 크롤링해 삭제된 프로그램을 반영한다.
+    """
+    state = load_state()
+    # 분류별 상태는 성공한 크롤링만 갱신하도록 사본에 기록하고, 모든 분류가 성공했을 때 저장한다
+    states = {
+        name: (dict(state.get(name) or {}), not needs_full_crawl(state.get(name)))
+        for _, name in CATEGORIES
+    }
+    if WEIN_FETCH_MODE == "http":
+        results = _crawl_weinzon_http(user_id, user_pw, states)
+        if results is not None:
+            save_state({name: page_state for name, (page_state, _) in states.items()})
+            return results
+
+    completed = {}
+    reset_wait_stats()
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        driver = None
+        reused = False
+        try:
+            driver, reused = _start_session(user_id, user_pw)
 
-            all_results += crawl_category(driver, GENL_URL, "일반비교과", MAX_PAGES)
-            all_results += crawl_category(driver, EMPLYM_URL, "취창업비교과", MAX_PAGES)
-            all_results += crawl_category(driver, GRUPDPT_URL, "단과대비교과", MAX_PAGES)
+            pending = [(url, name) for url, name in CATEGORIES if name not in completed]
+            print(f" [Login] 성공! 크롤링 시작... (분류 {len(pending)}개, 동시 {WEIN_PARALLELISM})")
+            done, failed = _crawl_categories(driver, pending, WEIN_PARALLELISM, states)
+            completed.update(done)
+            if failed:
+                raise RuntimeError(f"분류 크롤링 실패: {', '.join(failed)}")
 
+            all_results = []
+            for _, name in CATEGORIES:
+                all_results += completed[name]
+            all_results = _enrich_with_details(all_results, driver.get_cookies())
+            save_state({name: page_state for name, (page_state, _) in states.items()})
+            log_wait_stats("Wein")
             return all_results
 
         except Exception as e:
             print(f" [Error] 크롤링 실패 ({attempt}/{RETRY_ATTEMPTS}): {e}")
+            if reused:
+                # probe는 통과했지만 크롤링 중 세션이 끊겼을 수 있으므로 다음 시도는 로그인부터
+                clear_session()
             if attempt >= RETRY_ATTEMPTS:
                 print(" [Error] 재시도 한계를 초과했습니다. 빈 결과 반환.")
+                log_wait_stats("Wein")
                 return []
             delay = RETRY_DELAY_SEC * attempt
             print(f" [Retry] {delay}초 후 재시도...")
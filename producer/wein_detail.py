@@ -0,0 +1,176 @@
+"""
+위인전 프로그램 상세 페이지 보강
+목록 크롤링 후 상세 페이지에서 장소/신청 대상/마일리지를 읽어 location, target_audience, mileage, detail_url을 채운다.
+- 로그인 쿠키를 실은 requests 세션 하나를 WEIN_DETAIL_WORKERS개 워커가 공유해 동시에 조회한다.
+- 결과는 프로그램 키(사이트 프로그램 번호)별로 캐시 파일에 저장하고,
+  카드 내용(제목/기간)이 그대로이고 WEIN_DETAIL_CACHE_TTL_SEC가 지나지 않았으면 다시 조회하지 않는다.
+- 조회에 실패하거나 항목을 하나도 읽지 못하면(페이지 구조 변경 등) 캐시하지 않고
+  이전 캐시 값(없으면 "" / 0)을 쓴 뒤 다음 사이클에 다시 조회한다.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+
+from wein_crawler import WEIN_ORIGIN, HTML_PARSER
+from wein_http_crawler import create_session
+
+# {program_id} 자리에 목록 카드의 global.detail('<id>') 값이 들어간다
+WEIN_DETAIL_URL = os.getenv(
+    "WEIN_DETAIL_URL",
+    WEIN_ORIGIN + "ptfol/imng/comprSbjtMngt/icmpNsbjtApl/findIcmpNsbjtAplInfo.do?encSddpbSeq={program_id}",
+)
+WEIN_DETAIL_WORKERS = int(os.getenv("WEIN_DETAIL_WORKERS", "4"))
+WEIN_DETAIL_TIMEOUT_SEC = float(os.getenv("WEIN_DETAIL_TIMEOUT_SEC", "10"))
+WEIN_DETAIL_CACHE_PATH = os.getenv("WEIN_DETAIL_CACHE_PATH", "wein_detail_cache.json")
+# 내용이 그대로여도 이 주기마다 다시 조회 (장소 변경 등 반영, 기본 1일)
+WEIN_DETAIL_CACHE_TTL_SEC = int(os.getenv("WEIN_DETAIL_CACHE_TTL_SEC", str(24 * 3600)))
+
+DETAIL_FIELDS = ("location", "target_audience", "mileage", "detail_url")
+# Program 컬럼 길이 (common/models.py)
+_LOCATION_MAX = 100
+_TARGET_MAX = 200
+_NUMBER = re.compile(r"\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def program_key(item):
+    """사이트 프로그램 번호, 없으면 분류/제목/운영기간 해시"""
+    if item.get("program_id"):
+        return item["program_id"]
+    raw = "\x1f".join(item.get(k) or "" for k in ("category", "title", "run_period"))
+    return "h:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _content_hash(item):
+    raw = "\x1f".join(item.get(k) or "" for k in ("title", "apply_period", "run_period"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def detail_url(program_id):
+    return WEIN_DETAIL_URL.format(program_id=program_id)
+
+
+def parse_detail_html(html):
+    """
+    상세 페이지 HTML -> dict(location, target_audience, mileage)
+    th/td, dt/dd 쌍의 항목 이름으로 값을 찾는다 (장소 / 대상 / 마일리지)
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    fields = {"location": "", "target_audience": "", "mileage": 0}
+    for label_el in soup.find_all(["th", "dt"]):
+        value_el = label_el.find_next_sibling(["td", "dd"])
+        if value_el is None:
+            continue
+        label = _WHITESPACE.sub("", label_el.get_text())
+        value = _WHITESPACE.sub(" ", value_el.get_text()).strip()
+        if "장소" in label and not fields["location"]:
+            fields["location"] = value[:_LOCATION_MAX]
+        elif "대상" in label and not fields["target_audience"]:
+            fields["target_audience"] = value[:_TARGET_MAX]
+        elif "마일리지" in label and not fields["mileage"]:
+            m = _NUMBER.search(value)
+            fields["mileage"] = int(m.group(0)) if m else 0
+    return fields
+
+
+def _has_details(fields):
+    return bool(fields["location"] or fields["target_audience"] or fields["mileage"])
+
+
+def fetch_detail(session, program_id, timeout=None):
+    """상세 페이지 조회 -> DETAIL_FIELDS dict. 로그인 페이지로 보내지면 RuntimeError"""
+    url = detail_url(program_id)
+    resp = session.get(url, timeout=timeout or WEIN_DETAIL_TIMEOUT_SEC)
+    resp.raise_for_status()
+    if "login.do" in resp.url:
+        raise RuntimeError("세션 만료 (로그인 페이지로 이동)")
+    return {**parse_detail_html(resp.text), "detail_url": url}
+
+
+def load_cache(path=None):
+    try:
+        with open(path or WEIN_DETAIL_CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(cache, path=None):
+    path = path or WEIN_DETAIL_CACHE_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f" [Detail] 캐시 저장 실패 ({path}): {e}")
+
+
+def enrich_programs(items, cookies=None, session=None, workers=None, now=None):
+    """
+    목록 크롤링 결과(items)에 DETAIL_FIELDS를 채워 같은 리스트를 반환.
+    캐시에 없거나 바뀐 프로그램만 상세 페이지를 조회한다 (program_id가 없는 카드는 조회하지 않음).
+    """
+    now = time.time() if now is None else now
+    cache = load_cache()
+    fresh = {}
+    pending = {}
+    for item in items:
+        key = program_key(item)
+        entry = cache.get(key)
+        if key in fresh or key in pending:
+            continue  # 여러 분류에 같은 프로그램이 있으면 한 번만 조회
+        if (
+            entry
+            and entry.get("content") == _content_hash(item)
+            and now - entry.get("fetched_at", 0) < WEIN_DETAIL_CACHE_TTL_SEC
+        ):
+            fresh[key] = entry
+        elif item.get("program_id"):
+            pending[key] = item
+
+    cached = len(fresh)
+    if pending:
+        session = session or create_session(cookies or [], workers or WEIN_DETAIL_WORKERS)
+
+        def fetch(pair):
+            key, item = pair
+            try:
+                return key, item, fetch_detail(session, item["program_id"])
+            except (requests.RequestException, RuntimeError) as e:
+                print(f" [Detail] 상세 조회 실패 ({item.get('title')}): {e}")
+                return key, item, None
+
+        with ThreadPoolExecutor(max_workers=workers or WEIN_DETAIL_WORKERS, thread_name_prefix="wein-detail") as executor:
+            for key, item, fields in executor.map(fetch, pending.items()):
+                if fields is not None and not _has_details(fields):
+                    print(f" [Detail] 상세 항목을 찾지 못함 ({item.get('title')}), 캐시하지 않음")
+                    fields = None
+                if fields is not None:
+                    fresh[key] = {**fields, "content": _content_hash(item), "fetched_at": now}
+                elif key in cache:
+                    # 실패하면 이전 값을 유지하고 (fetched_at 그대로) 다음 사이클에 다시 조회
+                    fresh[key] = cache[key]
+
+    for item in items:
+        entry = fresh.get(program_key(item)) or {}
+        item["location"] = entry.get("location", "")
+        item["target_audience"] = entry.get("target_audience", "")
+        item["mileage"] = entry.get("mileage", 0)
+        item["detail_url"] = entry.get("detail_url", "")
+
+    print(f" [Detail] 상세 {len(items)}건 중 조회 {len(pending)}건, 캐시 사용 {cached}건")
+    if pending or len(fresh) != len(cache):
+        # 이번 목록에 없는 프로그램은 캐시에서 뺀다
+        save_cache(fresh)
+    return items
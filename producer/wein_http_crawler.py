@@ -0,0 +1,100 @@
+"""
+위인전 목록 HTTP 크롤러 (브라우저 없이)
+global.page(n)이 내부적으로 제출하는 목록 요청을 직접 보낸다.
+  POST {WEIN_ORIGIN}/ptfol/.../findTotPcondList.do  ({WEIN_PAGE_PARAM}=<n>)
+로그인된 쿠키(wein_session)를 실은 requests 세션 하나로 1페이지를 받아 마지막 페이지 번호를 확인하고,
+나머지 페이지는 연결 풀을 공유하는 워커들이 동시에 받는다.
+응답(전체 페이지 또는 ul.ul_box 조각, JSON이면 "html" 필드)은 extract_cards_from_html로 파싱한다.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from wein_crawler import WEIN_ORIGIN, extract_cards_from_html, last_page_number
+
+# 목록 요청의 페이지 번호 파라미터 이름
+WEIN_PAGE_PARAM = os.getenv("WEIN_PAGE_PARAM", "pageIndex")
+WEIN_HTTP_WORKERS = int(os.getenv("WEIN_HTTP_WORKERS", "4"))
+WEIN_HTTP_TIMEOUT_SEC = float(os.getenv("WEIN_HTTP_TIMEOUT_SEC", "10"))
+
+_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+)
+
+
+class WeinFetchError(Exception):
+    """HTTP 조회 실패/세션 만료 (호출 측은 Selenium 경로로 대체)"""
+
+
+def list_endpoint(list_url, origin=None):
+    """'.../redirect?url=/ptfol/.../findTotPcondList.do' -> '{origin}/ptfol/.../findTotPcondList.do'"""
+    parsed = urlparse(list_url)
+    target = parse_qs(parsed.query).get("url", [parsed.path])[0]
+    return urljoin(origin or WEIN_ORIGIN, target)
+
+
+def create_session(cookies, workers=None):
+    """로그인 쿠키를 실은 세션 (워커 수만큼 keep-alive 연결 유지)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, workers or WEIN_HTTP_WORKERS))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": _USER_AGENT, "Referer": WEIN_ORIGIN})
+    for cookie in cookies:
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+    return session
+
+
+def fetch_list_page(session, endpoint, page, timeout=None):
+    """목록 한 페이지의 HTML. 로그인 페이지로 보내지면 세션 만료로 보고 WeinFetchError"""
+    try:
+        resp = session.post(endpoint, data={WEIN_PAGE_PARAM: page}, timeout=timeout or WEIN_HTTP_TIMEOUT_SEC)
+    except requests.RequestException as e:
+        raise WeinFetchError(f"{page}페이지 요청 실패: {e}")
+    if resp.status_code != 200:
+        raise WeinFetchError(f"{page}페이지 HTTP {resp.status_code}")
+    if "login.do" in resp.url:
+        raise WeinFetchError("세션 만료 (로그인 페이지로 이동)")
+    if "json" in resp.headers.get("Content-Type", ""):
+        try:
+            return resp.json().get("html", "")
+        except ValueError as e:
+            raise WeinFetchError(f"{page}페이지 JSON 파싱 실패: {e}")
+    return resp.text
+
+
+def crawl_category_http(session, list_url, category_name, max_pages=10, workers=None, origin=None):
+    """
+    분류 하나의 1 ~ max_pages 페이지 카드를 HTTP로 수집.
+    리턴: (수집 결과 [{category, title, apply_period, run_period, site_status, program_id}, ...], 페이지 순서대로의 전체 카드)
+    """
+    endpoint = list_endpoint(list_url, origin)
+    first_html = fetch_list_page(session, endpoint, 1)
+    last_page = min(max_pages, last_page_number(first_html))
+    print(f" [WeinHTTP] [{category_name}] {last_page}페이지 수집 (동시 {workers or WEIN_HTTP_WORKERS})")
+
+    pages = [first_html]
+    if last_page > 1:
+        with ThreadPoolExecutor(max_workers=workers or WEIN_HTTP_WORKERS, thread_name_prefix="wein-page") as executor:
+            pages += list(executor.map(lambda n: fetch_list_page(session, endpoint, n), range(2, last_page + 1)))
+
+    cards = []
+    for page, html in enumerate(pages, start=1):
+        page_cards = extract_cards_from_html(html)
+        if not page_cards:
+            if page == 1 and "input_id" in html:
+                raise WeinFetchError("세션 만료 (로그인 폼 응답)")
+            break
+        cards += page_cards
+
+    results = [
+        {"category": category_name, **card}
+        for card in cards
+        # "신청" / "대기신청"만 수집
+        if card["site_status"] in ("신청", "대기신청")
+    ]
+    print(f" [WeinHTTP] [{category_name}] 카드 {len(cards)}개, 수집 {len(results)}개")
+    return results, cards
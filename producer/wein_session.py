@@ -0,0 +1,105 @@
+"""
+위인전 로그인 세션(쿠키) 저장/재사용
+사이클마다 로그인 폼을 다시 거치지 않도록 로그인 후 쿠키를 암호화해 파일로 저장하고,
+다음 사이클에 가벼운 HTTP 요청(probe)으로 아직 유효한지 확인한 뒤 재사용한다.
+- 암호화: cryptography의 Fernet, 키는 WEIN_SESSION_KEY (Fernet.generate_key() 값)
+- 키가 없거나 cryptography가 설치되지 않았으면 저장하지 않는다 (평문 쿠키는 디스크에 남기지 않음)
+"""
+import json
+import os
+
+import requests
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # 선택 의존성: 없으면 세션 저장 없이 매번 로그인
+    Fernet = None
+    InvalidToken = Exception
+
+WEIN_SESSION_PATH = os.getenv("WEIN_SESSION_PATH", "wein_session.bin")
+WEIN_SESSION_KEY = os.getenv("WEIN_SESSION_KEY", "")
+# 로그인해야 보이는 가벼운 페이지 (세션이 만료되면 login.do로 보낸다)
+WEIN_SESSION_PROBE_URL = os.getenv(
+    "WEIN_SESSION_PROBE_URL",
+    "https://wein.konkuk.ac.kr/ptfol/imng/comprSbjtMngt/icmpNsbjtApl/genl/findTotPcondList.do",
+)
+WEIN_SESSION_PROBE_TIMEOUT_SEC = float(os.getenv("WEIN_SESSION_PROBE_TIMEOUT_SEC", "5"))
+
+_COOKIE_FIELDS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry")
+
+
+def _cipher():
+    if Fernet is None or not WEIN_SESSION_KEY:
+        return None
+    try:
+        return Fernet(WEIN_SESSION_KEY.encode())
+    except (ValueError, TypeError) as e:
+        print(f" [Session] WEIN_SESSION_KEY가 올바른 Fernet 키가 아니어서 세션을 저장하지 않습니다: {e}")
+        return None
+
+
+def clean_cookie(cookie):
+    """WebDriver add_cookie가 받는 필드만 남긴다 (sameSite 등 제외)"""
+    return {k: cookie[k] for k in _COOKIE_FIELDS if k in cookie}
+
+
+def save_session(cookies):
+    """쿠키를 암호화해 저장. 저장하지 못하면 False"""
+    cipher = _cipher()
+    if cipher is None or not cookies:
+        return False
+    token = cipher.encrypt(json.dumps([clean_cookie(c) for c in cookies]).encode("utf-8"))
+    tmp_path = f"{WEIN_SESSION_PATH}.tmp"
+    try:
+        directory = os.path.dirname(WEIN_SESSION_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 쿠키는 암호화돼 있어도 소유자만 읽을 수 있게 만든다
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(token)
+        os.replace(tmp_path, WEIN_SESSION_PATH)
+    except OSError as e:
+        print(f" [Session] 세션 저장 실패 ({WEIN_SESSION_PATH}): {e}")
+        return False
+    return True
+
+
+def load_session():
+    """저장된 쿠키 목록. 없거나 복호화할 수 없으면 None"""
+    cipher = _cipher()
+    if cipher is None:
+        return None
+    try:
+        with open(WEIN_SESSION_PATH, "rb") as f:
+            token = f.read()
+    except OSError:
+        return None
+    try:
+        return json.loads(cipher.decrypt(token).decode("utf-8"))
+    except (InvalidToken, ValueError) as e:
+        print(f" [Session] 저장된 세션을 읽을 수 없어 폐기합니다: {e}")
+        clear_session()
+        return None
+
+
+def clear_session():
+    try:
+        os.remove(WEIN_SESSION_PATH)
+    except OSError:
+        pass
+
+
+def probe_session(cookies, url=None, timeout=None):
+    """쿠키로 로그인 전용 페이지를 요청해 로그인 페이지로 보내지지 않으면 유효한 세션"""
+    jar = requests.cookies.RequestsCookieJar()
+    for cookie in cookies:
+        jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+    try:
+        resp = requests.get(
+            url or WEIN_SESSION_PROBE_URL, cookies=jar, timeout=timeout or WEIN_SESSION_PROBE_TIMEOUT_SEC
+        )
+    except requests.RequestException as e:
+        print(f" [Session] 세션 확인 요청 실패: {e}")
+        return False
+    return resp.status_code == 200 and "login.do" not in resp.url and "input_id" not in resp.text